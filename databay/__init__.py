@@ -13,6 +13,7 @@ from databay.outlet import Outlet
 from databay.inlet import Inlet
 from databay.link import Link
 from databay.link import Update
+from databay.link import OverrunPolicy
 from databay.base_planner import BasePlanner
 # from databay import inlets
 # from databay import outlets
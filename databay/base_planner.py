@@ -3,16 +3,25 @@
 
     :ref:`Extending BasePlanner <extending_base_planner>` to learn how to extend this class correctly.
 """
+import asyncio
 import atexit
+import contextlib
+import functools
 import logging
+import random
+import threading
 from abc import ABC, abstractmethod
 from typing import List, Union
 
 from databay.errors import MissingLinkError
 from databay.link import Link
+from databay.support.admission import AdmissionController
 
 _LOGGER = logging.getLogger('databay.BasePlanner')
 
+# fractional parts of its multiples are spread evenly over [0, 1) for any number of multiples
+_GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
 
 class BasePlanner(ABC):
     """
@@ -21,7 +30,7 @@ class BasePlanner(ABC):
 
 
 
-    def __init__(self, links: Union[Link, List[Link]] = None, ignore_exceptions: bool = False, immediate_transfer: bool = True, shutdown_at_exit : bool = False):
+    def __init__(self, links: Union[Link, List[Link]] = None, ignore_exceptions: bool = False, immediate_transfer: bool = True, shutdown_at_exit : bool = False, persistent_event_loops: bool = False, phase_spread: bool = False, jitter: float = 0, max_transfers: int = None):
         """
         :type links: :any:`Link` or list[:any:`Link`]
         :param links: Links that should be added and scheduled.
@@ -37,7 +46,34 @@ class BasePlanner(ABC):
         :type shutdown_at_exit: bool
         :param shutdown_at_exit: Whether this planner should attempt to gracefully shutdown if the app exists unexpectedly.
             |default| :code:`False`
+
+        :type persistent_event_loops: bool
+        :param persistent_event_loops: Whether each thread executing transfers should own a long-lived event loop that is reused by all transfers running on that thread, instead of creating and closing a new event loop on every transfer. Event loops are closed when this planner shuts down.
+            |default| :code:`False`
+
+        :type phase_spread: bool
+        :param phase_spread: Whether the first scheduled runs of links sharing the same interval should be spread evenly across that interval, instead of all links running at the same instant. Offsets are assigned in the order links are added, keeping links evenly spread however many links are added.
+            |default| :code:`False`
+
+        :type jitter: float
+        :param jitter: Maximum random delay in seconds added to each scheduled run of a link. The delay doesn't accumulate - the following runs are still scheduled according to the link's interval.
+            |default| :code:`0`
+
+        :type max_transfers: int
+        :param max_transfers: Maximum number of transfers allowed to execute concurrently across all links of this planner, as measured by their :any:`Link.weight`. When reached, further transfers wait and are started in order of their link's :any:`Link.priority`. See :any:`AdmissionController` for more.
+            |default| :code:`None` (Unlimited)
         """
+        self._admission = AdmissionController(max_transfers) if max_transfers is not None else None
+        self.phase_spread = phase_spread
+        self.jitter = jitter
+        self._phase_indices = {}
+        self._phase_lock = threading.Lock()
+
+        self.persistent_event_loops = persistent_event_loops
+        self._thread_local = threading.local()
+        self._event_loops = []
+        self._event_loops_lock = threading.Lock()
+
         self._links = []
         if links is not None:
             self.add_links(links)
@@ -48,6 +84,15 @@ class BasePlanner(ABC):
         atexit.register(self._at_exit_callback)
 
 
+    @property
+    def admission(self) -> AdmissionController:
+        """
+        Controller limiting the number of concurrently executing transfers, exposing metrics of how long transfers waited to be admitted. :code:`None` if :code:`max_transfers` wasn't provided.
+
+        :rtype: :any:`AdmissionController`
+        """
+        return self._admission
+
     @property
     def links(self):
         """
@@ -132,14 +177,7 @@ class BasePlanner(ABC):
         See :ref:`Start and Shutdown <start_shutdown>` to learn more about starting and shutdown.
         """
         _LOGGER.info('Starting %s' % str(self))
-        for link in self.links:
-            try:
-                link.on_start()
-            except Exception as e:
-                try:
-                    raise RuntimeError(f'on_start link exception: "{e}" for link: {link}') from e
-                except Exception as ee:
-                    self._on_exception(ee, link)
+        self._start_links()
 
         if self.immediate_transfer:
             for link in self.links:
@@ -147,7 +185,7 @@ class BasePlanner(ABC):
                     continue
 
                 try:
-                    link.transfer()
+                    self._transfer(link)
                 except Exception as e:
                     self._on_exception(e, link)
 
@@ -156,6 +194,19 @@ class BasePlanner(ABC):
 
         self._start_planner()
 
+    def _start_links(self):
+        """
+        Call :any:`Link.on_start` on all links, handling their exceptions with :code:`_on_exception`.
+        """
+        for link in self.links:
+            try:
+                link.on_start()
+            except Exception as e:
+                try:
+                    raise RuntimeError(f'on_start link exception: "{e}" for link: {link}') from e
+                except Exception as ee:
+                    self._on_exception(ee, link)
+
     def shutdown(self, wait: bool = True):
         """
         Shutdown this planner. Links will stop being scheduled after calling this method. Remaining link jobs may still execute after calling this method depending on the concrete planner implementation.
@@ -168,6 +219,7 @@ class BasePlanner(ABC):
         self._shutdown_planner(wait)
         for link in self.links:
             link.on_shutdown()
+        self._close_event_loops()
 
     @abstractmethod
     def _start_planner(self):
@@ -234,10 +286,113 @@ class BasePlanner(ABC):
         """
         for link in self.links:
             try:
-                link.transfer()
+                self._transfer(link)
             except Exception as e:
                 self._on_exception(e, link)
 
+    def _start_offset(self, link: Link) -> float:
+        """
+        Get the delay in seconds before the first scheduled run of the link provided. This is equal to the link's interval unless :code:`phase_spread` is enabled, in which case the delay is a fraction of the interval, different for each link sharing the same interval. Implementations should call this method when scheduling a link.
+
+        :type link: :any:`Link`
+        :param link: Link being scheduled.
+
+        :returns: Delay of the first run in seconds.
+        :rtype: float
+        """
+        interval = link.interval.total_seconds()
+        if not self.phase_spread or interval <= 0:
+            return interval
+
+        with self._phase_lock:
+            index = self._phase_indices.get(interval, 0)
+            self._phase_indices[interval] = index + 1
+
+        # first link gets the full interval, the same as without spreading
+        return (1 - (index * _GOLDEN_RATIO_CONJUGATE) % 1) * interval
+
+    def _get_jitter(self) -> float:
+        """
+        Get a random delay in seconds to be added to a scheduled run, between 0 and :code:`jitter`. Implementations should add it to each run without changing the times the following runs are scheduled at.
+
+        :returns: Random delay in seconds.
+        :rtype: float
+        """
+        return random.uniform(0, self.jitter) if self.jitter else 0
+
+    def _transfer(self, link: Link):
+        """
+        Execute one transfer of the link provided. Implementations should schedule this method rather than calling :any:`Link.transfer` directly, as it runs the transfer on this thread's persistent event loop if :code:`persistent_event_loops` is enabled.
+
+        :type link: :any:`Link`
+        :param link: Link to execute the transfer of.
+        """
+        interval = link.interval
+        kwargs = {}
+        if self._admission is not None:
+            # the slot is taken only once the overrun policy of the link let the transfer start
+            kwargs['slot'] = functools.partial(self._transfer_slot, link)
+        if self.persistent_event_loops:
+            kwargs['event_loop'] = self._get_event_loop()
+        link.transfer(**kwargs)
+
+        if link.interval != interval and link.job is not None:
+            self._reschedule(link)
+
+    @contextlib.contextmanager
+    def _transfer_slot(self, link: Link):
+        """
+        Context manager taking up the admission slots of a transfer of the link provided for as long as it executes.
+
+        :type link: :any:`Link`
+        :param link: Link executing the transfer.
+        """
+        self._admission.acquire(link.priority, link.weight)
+        try:
+            yield
+        finally:
+            self._admission.release(link.weight)
+
+    def _reschedule(self, link: Link):
+        """
+        Update the schedule of a link whose interval changed, for instance when using adaptive intervals. Implementations that don't read :any:`Link.interval` whenever scheduling the next transfer should override this method.
+
+        :type link: :any:`Link`
+        :param link: Link whose interval changed.
+        """
+        pass
+
+    def _get_event_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the persistent event loop owned by the current thread, creating one if it doesn't exist yet or was already closed.
+
+        :returns: Event loop of the current thread.
+        :rtype: :any:`asyncio.AbstractEventLoop`
+        """
+        loop = getattr(self._thread_local, 'event_loop', None)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            self._thread_local.event_loop = loop
+            with self._event_loops_lock:
+                self._event_loops.append(loop)
+        return loop
+
+    def _close_event_loops(self):
+        """
+        Close all persistent event loops created by this planner. Loops that are still running a transfer are left open and will be reused if the planner is started again.
+        """
+        with self._event_loops_lock:
+            loops = [loop for loop in self._event_loops if not loop.is_running()]
+            self._event_loops = [loop for loop in self._event_loops if loop not in loops]
+
+        for loop in loops:
+            if loop.is_closed():
+                continue
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
 
     def __repr__(self):
         return f"BasePlanner(links={len(self.links)}, shutdown_at_exit={self.shutdown_at_exit})"
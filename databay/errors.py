@@ -12,3 +12,13 @@ class ImplementationError(RuntimeError):
 class InvalidNodeError(RuntimeError):
     """ Raised when invalid node (inlet or outlet) is provided."""
     pass
+
+
+class TransferTimeoutError(TimeoutError):
+    """ Raised when pulling, pushing or a whole transfer exceeds its timeout."""
+    pass
+
+
+class CircuitOpenError(RuntimeError):
+    """ Raised when a call to an inlet or outlet is rejected by its open circuit breaker."""
+    pass
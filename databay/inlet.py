@@ -6,29 +6,61 @@
 """
 
 import asyncio
+import inspect
+import itertools
 import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import List
 
 from databay import Record
+from databay.errors import TransferTimeoutError
+from databay.support.circuit_breaker import CircuitBreaker
+from databay.support.executors import timeout_executor
+from databay.support.timeouts import wait_for_timeout
 import databay as da
 
 
+class _DrainedChunks(list):
+    """Chunks of a generator :any:`Inlet.pull` drained within a process pool, since generators can't be sent between processes."""
+    pass
+
+
+def _pull_in_process(inlet: 'Inlet', update: 'da.Update'):
+    data = inlet.pull(update)
+    if inspect.isgenerator(data):
+        return _DrainedChunks(data)
+    return data
+
+
 class Inlet(ABC):
     """
     Abstract class representing an input of the data stream.
     """
 
-    def __init__(self, metadata: dict = None):
+    def __init__(self, metadata: dict = None, executor: Executor = None, timeout: float = None, circuit_breaker: CircuitBreaker = None):
         """
         :type metadata: dict
         :param metadata: Global metadata that will be attached to each record generated by this inlet. It can be overridden or appended to by providing metadata when creating a record using :py:func:`new_record` function. |default| :code:`None`
+
+        :type executor: :any:`concurrent.futures.Executor`
+        :param executor: Executor that synchronous :any:`pull` calls of this inlet should be offloaded to. Overrides the executor of the governing link. Has no effect if :any:`pull` is a coroutine. |default| :code:`None`
+
+        :type timeout: float
+        :param timeout: Number of seconds after which pulling from this inlet is abandoned. When the governing link is streaming, applies to producing each chunk separately. Overrides the :code:`pull_timeout` of the governing link. |default| :code:`None`
+
+        :type circuit_breaker: :any:`CircuitBreaker`
+        :param circuit_breaker: Circuit breaker skipping this inlet while it keeps failing, shared by all links this inlet belongs to. Overrides the :code:`circuit_breaker` of the governing link. |default| :code:`None`
         """
         self._metadata = metadata if metadata is not None else {}
+        self.executor = executor
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
 
         self._active = False
 
         self._uses_coroutine = asyncio.iscoroutinefunction(self.pull)
+        self._uses_async_generator = inspect.isasyncgenfunction(self.pull)
         self._thread_lock = threading.Lock()
 
     @property
@@ -43,12 +75,82 @@ class Inlet(ABC):
         """
         return self._metadata
 
-    async def _pull(self, update: 'da.Update'):
-        if self._uses_coroutine:
+    async def _pull(self, update: 'da.Update', executor: Executor = None, timeout: float = None):
+        timeout = self.timeout if self.timeout is not None else timeout
+        if timeout is None:
+            return await self._collect_chunks(update, executor)
+
+        return await wait_for_timeout(self._collect_chunks(update, executor, offload=True), timeout,
+                                      TransferTimeoutError(f'Pulling from {self} exceeded the timeout of {timeout}s'))
+
+    async def _collect_chunks(self, update: 'da.Update', executor: Executor = None, offload: bool = False):
+        chunks = [chunk async for chunk in self._iter_chunks(update, executor, offload)]
+        if len(chunks) == 1:
+            return chunks[0]
+        return list(itertools.chain.from_iterable(chunks))
+
+    async def _pull_chunks(self, update: 'da.Update', executor: Executor = None, timeout: float = None):
+        """
+        Asynchronous generator yielding the records produced by :any:`pull` in chunks. Yields one chunk per element yielded if :any:`pull` is a generator or returns one, or a single chunk otherwise. The timeout applies to producing each chunk.
+        """
+        timeout = self.timeout if self.timeout is not None else timeout
+        chunks = self._iter_chunks(update, executor, offload=timeout is not None)
+        if timeout is None:
+            async for chunk in chunks:
+                yield chunk
+            return
+
+        try:
+            while True:
+                try:
+                    chunk = await wait_for_timeout(chunks.__anext__(), timeout,
+                                                   TransferTimeoutError(f'Pulling from {self} exceeded the timeout of {timeout}s'))
+                except StopAsyncIteration:
+                    break
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    async def _iter_chunks(self, update: 'da.Update', executor: Executor = None, offload: bool = False):
+        """
+        Produce the chunks of :any:`pull`. If :code:`offload` is set, synchronous calls run in the :any:`TimeoutExecutor` of this node when no executor is provided, so that they can be abandoned on timeout.
+        """
+        executor = self.executor if self.executor is not None else executor
+        if executor is None and offload:
+            executor = timeout_executor(self)
+
+        if self._uses_async_generator:
+            data = self.pull(update)
+        elif self._uses_coroutine:
             data = await self.pull(update)
-        else:
+        elif executor is None:
             data = self.pull(update)
+        elif isinstance(executor, ProcessPoolExecutor):
+            data = await asyncio.get_running_loop().run_in_executor(executor, _pull_in_process, self, update)
+        else:
+            data = await asyncio.get_running_loop().run_in_executor(executor, self.pull, update)
+
+        if isinstance(data, _DrainedChunks):
+            for chunk in data:
+                yield self._to_records(chunk)
+        elif inspect.isasyncgen(data):
+            async for chunk in data:
+                yield self._to_records(chunk)
+        elif inspect.isgenerator(data):
+            done = object()
+            while True:
+                if executor is None:
+                    chunk = next(data, done)
+                else:
+                    chunk = await asyncio.get_running_loop().run_in_executor(executor, next, data, done)
+
+                if chunk is done:
+                    break
+                yield self._to_records(chunk)
+        else:
+            yield self._to_records(data)
 
+    def _to_records(self, data) -> List[Record]:
         if not isinstance(data, list):
             data = [data]
 
@@ -67,6 +169,8 @@ class Inlet(ABC):
 
         Override this method to define how this inlet will produce new data.
 
+        This method can also be implemented as a generator or an asynchronous generator yielding the records in chunks, allowing large amounts of data to be produced incrementally. Each chunk can be a list of records or a single record. See :ref:`Streaming inlets <streaming_inlets>`.
+
         :type update: :any:`Update`
         :param update: Update object representing the particular Link update run.
 
@@ -168,6 +272,18 @@ class Inlet(ABC):
         """
         pass
 
+    def __getstate__(self):
+        # Allows pulling within a ProcessPoolExecutor. Neither the lock nor the executor can be pickled.
+        state = self.__dict__.copy()
+        del state['_thread_lock']
+        state['executor'] = None
+        state.pop('_timeout_executor', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._thread_lock = threading.Lock()
+
     @property
     def active(self):
         """
@@ -1,11 +1,26 @@
 import importlib.util
 
 if importlib.util.find_spec('aiohttp') is not None:
-    from databay.inlets.http_inlet import HttpInlet
+    from databay.inlets.http_inlet import HttpInlet, HttpSessionPool
+    from databay.inlets.multi_http_inlet import MultiHttpInlet, HttpRequest
 else:  # pragma: no cover
     def HttpInlet(*args, **kwargs):
         raise ImportError(
             'aiohttp dependency is required for HttpInlet. Fix by running: pip install "databay[HttpInlet]"')
 
+    def HttpSessionPool(*args, **kwargs):
+        raise ImportError(
+            'aiohttp dependency is required for HttpSessionPool. Fix by running: pip install "databay[HttpInlet]"')
+
+    def MultiHttpInlet(*args, **kwargs):
+        raise ImportError(
+            'aiohttp dependency is required for MultiHttpInlet. Fix by running: pip install "databay[HttpInlet]"')
+
+    def HttpRequest(*args, **kwargs):
+        raise ImportError(
+            'aiohttp dependency is required for HttpRequest. Fix by running: pip install "databay[HttpInlet]"')
+
 from databay.inlets.random_int_inlet import RandomIntInlet
 from databay.inlets.null_inlet import NullInlet
+from databay.inlets.http_pagination import Pagination, OffsetPagination, CursorPagination, LinkHeaderPagination
+from databay.support.json_stream import StreamFormat
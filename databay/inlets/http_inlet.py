@@ -5,24 +5,165 @@
     .. code-block:: python
 
         pip install "databay[HttpInlet]"
+
+Connections are kept alive across pulls by a :any:`HttpSessionPool`. Each :any:`HttpInlet` creates a pool of its own unless one is provided, allowing many inlets to share one pool:
+
+.. code-block:: python
+
+    pool = HttpSessionPool(limit_per_host=10, keepalive_timeout=30)
+    inlets = [HttpInlet(url, session_pool=pool) for url in urls]
+
+An event loop can't share its connections with other event loops, therefore connections are reused only by the transfers running on the same event loop - such as when using the :any:`AsyncioPlanner` or planners constructed with :code:`persistent_event_loops=True`.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
+import threading
 from json import JSONDecodeError
-from typing import List, Union, Optional
+from typing import Any, List, Union, Optional, Tuple
 
 import aiohttp
 import ssl
 
 from aiohttp.typedefs import LooseHeaders
+from multidict import CIMultiDict
 
 from databay.inlet import Inlet
+from databay.inlets.http_pagination import NOT_MODIFIED, Pagination
+from databay.support.json_stream import StreamFormat, create_decoder
 from databay import Record
 
 _LOGGER = logging.getLogger('databay.HttpInlet')
 
 
+class HttpSessionPool():
+    """
+    Pool of HTTP connections kept alive across pulls, wrapping one `aiohttp.ClientSession <aiohttp.ClientSession_>`__ per event loop.
+
+    Sessions are created on first use within each event loop and closed automatically when their event loop shuts down, or when :any:`close` is called.
+
+    .. _aiohttp.ClientSession: https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession
+    """
+
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 0,
+                 keepalive_timeout: float = 15.0,
+                 ttl_dns_cache: Optional[float] = 10):
+        """
+        :type limit: int
+        :param limit: Maximum number of simultaneous connections of each session. :code:`0` for no limit.
+            |default| :code:`100`
+
+        :type limit_per_host: int
+        :param limit_per_host: Maximum number of simultaneous connections to the same host of each session. :code:`0` for no limit.
+            |default| :code:`0`
+
+        :type keepalive_timeout: float
+        :param keepalive_timeout: Number of seconds an idle connection is kept alive for reuse.
+            |default| :code:`15.0`
+
+        :type ttl_dns_cache: float
+        :param ttl_dns_cache: Number of seconds resolved host addresses are cached for. :code:`None` caches them forever.
+            |default| :code:`10`
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+
+        self._sessions = {}  # event loop -> (session, guard closing the session)
+        self._lock = threading.Lock()
+
+    @property
+    def sessions(self) -> int:
+        """
+        Number of open sessions, one per event loop.
+
+        :rtype: int
+        """
+        return len(self._sessions)
+
+    async def session(self) -> aiohttp.ClientSession:
+        """
+        Session of the currently running event loop, created if it doesn't exist yet.
+
+        :rtype: `aiohttp.ClientSession <aiohttp.ClientSession_>`__
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._discard_closed_loops()
+            entry = self._sessions.get(loop)
+            if entry is not None:
+                return entry[0]
+
+            connector = aiohttp.TCPConnector(limit=self.limit,
+                                             limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout,
+                                             ttl_dns_cache=self.ttl_dns_cache)
+            session = aiohttp.ClientSession(connector=connector)
+            guard = self._hold_session(loop, session)
+            self._sessions[loop] = (session, guard)
+
+        # registers the guard with the event loop, which will close it when shutting down
+        await guard.__anext__()
+        return session
+
+    async def _hold_session(self, loop: asyncio.AbstractEventLoop, session: aiohttp.ClientSession):
+        """
+        Async generator closing the session when closed. Event loops close the async generators left open when shutting down, ensuring the session is closed before its event loop.
+        """
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._sessions.get(loop, (None, None))[0] is session:
+                    del self._sessions[loop]
+            await session.close()
+
+    def _discard_closed_loops(self):
+        """
+        Drop the sessions of event loops closed without closing their async generators. Their connections can no longer be closed gracefully.
+        """
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            session, _ = self._sessions.pop(loop)
+            session.detach()
+
+    def close(self, timeout: float = 10.0):
+        """
+        Close the sessions of all event loops.
+
+        :type timeout: float
+        :param timeout: Maximum number of seconds to wait for each session running on another thread to close.
+            |default| :code:`10.0`
+        """
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        for loop, (session, guard) in sessions.items():
+            if loop.is_closed():
+                session.detach()
+            elif loop is running_loop:
+                loop.create_task(guard.aclose())
+            elif loop.is_running():
+                try:
+                    asyncio.run_coroutine_threadsafe(guard.aclose(), loop).result(timeout)
+                except Exception as e:
+                    _LOGGER.warning(f'{self} failed to close session: "{e}"')
+            else:
+                loop.run_until_complete(guard.aclose())
+
+    def __repr__(self):
+        return 'HttpSessionPool(limit:%s, limit_per_host:%s)' % (self.limit, self.limit_per_host)
+
+
 class HttpInlet(Inlet):
     """
     Inlet for pulling data from a specified URL using `aiohttp <aiohttp.ClientSession.get_>`__.
@@ -30,7 +171,7 @@ class HttpInlet(Inlet):
     .. _aiohttp.ClientSession.get: https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession.get
     """
 
-    def __init__(self, url: str, json: str = True, cacert : Optional[str] = None, params : Optional[dict] = None, headers : Optional[LooseHeaders] = None, *args, **kwargs):
+    def __init__(self, url: str, json: str = True, cacert : Optional[str] = None, params : Optional[dict] = None, headers : Optional[LooseHeaders] = None, session_pool: Optional[HttpSessionPool] = None, conditional_requests: bool = False, skip_unchanged: bool = False, pagination: Optional[Pagination] = None, stream_format: Optional[StreamFormat] = None, chunk_size: int = 64 * 1024, *args, **kwargs):
         """
         :type url: str
         :param url: URL that should be queried for data.
@@ -46,9 +187,34 @@ class HttpInlet(Inlet):
 
         :type headers: LooseHeaders
         :param headers: Headers for the request. |default| :code:`None`
+
+        :type session_pool: :any:`HttpSessionPool`
+        :param session_pool: Pool of connections to send the requests through, which can be shared by many inlets. A pool shared this way isn't closed when this inlet shuts down.
+            |default| :code:`None` (Create a pool owned by this inlet)
+
+        :type conditional_requests: bool
+        :param conditional_requests: Whether to remember the :code:`ETag` and :code:`Last-Modified` response headers for each URL and params, sending them back as :code:`If-None-Match` and :code:`If-Modified-Since` request headers. No records are produced if the server responds with :code:`304 Not Modified`. With :code:`pagination`, this applies to each page - pages that weren't modified produce no records, while the pagination carries on to the following pages.
+            |default| :code:`False`
+
+        :type skip_unchanged: bool
+        :param skip_unchanged: Whether to produce no records if the response body is identical to the previous one for the same URL and params. Useful for servers not supporting conditional requests. With :code:`pagination`, this applies to each page in the same manner as :code:`conditional_requests`.
+            |default| :code:`False`
+
+        :type pagination: :any:`Pagination`
+        :param pagination: Strategy for fetching all pages of a paginated resource, producing each page as a separate chunk. Conditional requests and unchanged body skipping then apply to each page, and a page producing no records ends the pagination.
+            |default| :code:`None` (Fetch a single page)
+
+        :type stream_format: :any:`StreamFormat`
+        :param stream_format: Format of the response body, if it should be decoded incrementally while being received. Records decoded from each chunk of the body are produced as a separate chunk, keeping memory use bounded regardless of the size of the response. Can't be combined with :code:`pagination` or :code:`skip_unchanged`.
+            |default| :code:`None` (Decode the whole body at once)
+
+        :type chunk_size: int
+        :param chunk_size: Maximum number of bytes of the body read at once when :code:`stream_format` is set.
+            |default| :code:`65536`
         """
+        if stream_format is not None and (pagination is not None or skip_unchanged):
+            raise ValueError('Streaming the response body can\'t be combined with pagination or skip_unchanged')
 
-        self.tcp_connector = None
         self.context = None
         super().__init__(*args, **kwargs)
         self.url = url
@@ -56,6 +222,16 @@ class HttpInlet(Inlet):
         self.cacert = cacert
         self.params = params
         self.headers = headers
+        self.session_pool = session_pool
+        self._owns_session_pool = session_pool is None
+        self.conditional_requests = conditional_requests
+        self.skip_unchanged = skip_unchanged
+        self.pagination = pagination
+        self.stream_format = stream_format
+        self.chunk_size = chunk_size
+
+        self._validators = {}  # cache key -> (ETag, Last-Modified)
+        self._body_hashes = {}  # cache key -> digest of the last response body
 
         if self.cacert is not None and self.cacert != False:
             context = ssl.create_default_context()
@@ -64,36 +240,158 @@ class HttpInlet(Inlet):
             context.load_verify_locations(self.cacert)
             self.context = context
 
+    def on_start(self):
+        """
+        Create the pool of connections, unless one was provided.
+        """
+        self._get_session_pool()
+
+    def on_shutdown(self):
+        """
+        Close the pool of connections, unless it was provided.
+        """
+        if self._owns_session_pool and self.session_pool is not None:
+            self.session_pool.close()
+            self.session_pool = None
+
+    def _get_session_pool(self) -> HttpSessionPool:
+        if self.session_pool is None:
+            self.session_pool = self._create_session_pool()
+        return self.session_pool
+
+    def _create_session_pool(self) -> HttpSessionPool:
+        return HttpSessionPool()
+
+    def _cache_key(self, url: str, params: Optional[dict]) -> str:
+        return f'{url}?{json.dumps(params, sort_keys=True, default=str)}'
+
+    def _request_headers(self, cache_key: str, headers: Optional[LooseHeaders] = None) -> Optional[LooseHeaders]:
+        """
+        Headers for the request, including the conditional headers if validators are stored for the cache key provided. Defaults to the headers of this inlet if none are provided.
+        """
+        if headers is None:
+            headers = self.headers
+
+        validators = self._validators.get(cache_key) if self.conditional_requests else None
+        if validators is None:
+            return headers
+
+        etag, last_modified = validators
+        headers = CIMultiDict(headers or {})
+        if etag is not None:
+            headers['If-None-Match'] = etag
+        if last_modified is not None:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def _store_validators(self, cache_key: str, response: aiohttp.ClientResponse):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag is None and last_modified is None:
+            self._validators.pop(cache_key, None)
+        else:
+            self._validators[cache_key] = (etag, last_modified)
+
+    def _is_unchanged(self, cache_key: str, digest: bytes) -> bool:
+        """
+        Whether the digest of the payload is identical to the previous one for the cache key provided.
+        """
+        return self._body_hashes.get(cache_key) == digest
+
     async def pull(self, update) -> Union[List[Record], str]:
         """
         Asynchronously pulls data from the specified URL using aiohttp.ClientSession.get_
 
+        If :code:`pagination` or :code:`stream_format` is set, an asynchronous generator yielding the records of each page or of each chunk of the body is returned instead.
+
         :type update: :any:`Update`
         :param update: Update object representing the particular Link transfer.
 
         :return: Single or multiple records produced.
         :rtype: :any:`Record` or list[:any:`Record`]
         """
-        if self.context is not None: self.tcp_connector = aiohttp.TCPConnector(ssl=self.context)
-        _LOGGER.info(f'{update} pulling  {self.url} params={self.params}')
-        async with aiohttp.ClientSession(connector=self.tcp_connector, headers=self.headers) as session:
-            async with session.get(self.url, params=self.params) as response:
-                payload = await response.read()
-                _LOGGER.info(f'{update} received {self.url} params={self.params}')
-                if payload == b'':
-                    _LOGGER.info(f'{update} no results {self.url} params={self.params}')
-                    return []
-                try:
-                    if self.json:
-                        return json.loads(payload)
-                    else:
-                        return payload.decode("utf-8")
-                except Exception as e:
-                    if isinstance(e, JSONDecodeError) and 'Expecting value: line 1 column 1 (char 0)' in str(e):
-                        raise ValueError(
-                            f'Response does not contain valid JSON:\n\n{payload}')
-                    else:
-                        raise e
+        session = await self._get_session_pool().session()
+        if self.pagination is not None:
+            return self.pagination.pages(self, session, update)
+        if self.stream_format is not None:
+            return self._stream(session, update, self.url, self.params)
+
+        data, _ = await self._fetch(session, update, self.url, self.params)
+        return [] if data is NOT_MODIFIED else data
+
+    def _get(self, session: aiohttp.ClientSession, url: str, params: Optional[dict], cache_key: str, headers: Optional[LooseHeaders] = None):
+        return session.get(url, params=params, headers=self._request_headers(cache_key, headers), ssl=self.context if self.context is not None else True)
+
+    async def _fetch(self, session: aiohttp.ClientSession, update, url: str, params: Optional[dict], headers: Optional[LooseHeaders] = None) -> Tuple[Any, aiohttp.ClientResponse]:
+        """
+        Request the URL with the params provided, returning the decoded payload and the response. Sends the headers of this inlet if no headers are provided. The payload is :any:`NOT_MODIFIED` if the response wasn't modified, or was identical to the previous one when using :code:`skip_unchanged`.
+        """
+        _LOGGER.info(f'{update} pulling  {url} params={params}')
+        cache_key = self._cache_key(url, params)
+        async with self._get(session, url, params, cache_key, headers) as response:
+            if self.conditional_requests and response.status == 304:
+                _LOGGER.info(f'{update} not modified {url} params={params}')
+                return NOT_MODIFIED, response
+
+            payload = await response.read()
+            _LOGGER.info(f'{update} received {url} params={params}')
+            if payload == b'':
+                if self.conditional_requests:
+                    self._store_validators(cache_key, response)
+                _LOGGER.info(f'{update} no results {url} params={params}')
+                return [], response
+
+            digest = None
+            if self.skip_unchanged:
+                digest = hashlib.sha256(payload).digest()
+                if self._is_unchanged(cache_key, digest):
+                    _LOGGER.info(f'{update} unchanged {url} params={params}')
+                    return NOT_MODIFIED, response
+
+            try:
+                if self.json:
+                    data = json.loads(payload)
+                else:
+                    data = payload.decode("utf-8")
+            except Exception as e:
+                if isinstance(e, JSONDecodeError) and 'Expecting value: line 1 column 1 (char 0)' in str(e):
+                    raise ValueError(
+                        f'Response does not contain valid JSON:\n\n{payload}')
+                else:
+                    raise e
+
+            # remembered only once the payload is decoded, otherwise a failed pull would be skipped as unchanged on the next one
+            if self.conditional_requests:
+                self._store_validators(cache_key, response)
+            if digest is not None:
+                self._body_hashes[cache_key] = digest
+            return data, response
+
+    async def _stream(self, session: aiohttp.ClientSession, update, url: str, params: Optional[dict]):
+        """
+        Asynchronous generator requesting the URL with the params provided, yielding the values decoded from each chunk of the body.
+        """
+        _LOGGER.info(f'{update} pulling  {url} params={params}')
+        cache_key = self._cache_key(url, params)
+        async with self._get(session, url, params, cache_key) as response:
+            if self.conditional_requests and response.status == 304:
+                _LOGGER.info(f'{update} not modified {url} params={params}')
+                return
+
+            decoder = create_decoder(self.stream_format)
+            async for data in response.content.iter_chunked(self.chunk_size):
+                values = decoder.feed(data)
+                if values:
+                    yield values
+
+            values = decoder.close()
+            if values:
+                yield values
+            _LOGGER.info(f'{update} received {url} params={params}')
+
+            # remembered only once the whole body is decoded, otherwise a failed stream would be skipped as not modified on the next pull
+            if self.conditional_requests:
+                self._store_validators(cache_key, response)
 
     def __repr__(self):
         s = "%s(" % (self.__class__.__name__)
@@ -106,6 +404,9 @@ class HttpInlet(Inlet):
         if self.cacert:
             s += f'cacert={self.cacert}'
 
+        if self.pagination:
+            s += f', pagination={self.pagination}'
+
         if self.metadata:
             s += ', metadata:%s' % self.metadata
 
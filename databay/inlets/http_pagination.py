@@ -0,0 +1,265 @@
+"""
+Pagination strategies of the :any:`HttpInlet`, fetching all pages of a paginated resource in one pull. Pages are produced as separate chunks, therefore links constructed with :code:`streaming=True` pass each page on as soon as it is fetched. See :ref:`Streaming inlets <streaming_inlets>`.
+
+.. code-block:: python
+
+    HttpInlet('https://some.test.url.com/todos', pagination=OffsetPagination(page_size=50, items='results'))
+"""
+
+import asyncio
+import collections
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Optional, Union
+
+import databay as da
+
+_LOGGER = logging.getLogger('databay.Pagination')
+
+
+class _NotModified():
+    def __repr__(self):
+        return 'NOT_MODIFIED'
+
+
+NOT_MODIFIED = _NotModified()
+"""Page returned by the :any:`HttpInlet` in place of the data when the page wasn't modified since it was last fetched - either answered with :code:`304 Not Modified` when using :code:`conditional_requests`, or identical to the previous body when using :code:`skip_unchanged`. Its items aren't produced again, but the pagination carries on to the following pages using what it remembers of the page."""
+
+
+def _lookup(data: Any, path: Union[str, Callable[[Any], Any]]) -> Any:
+    """
+    Value at the dot-separated path of keys within the data, or the value returned by the callable provided.
+    """
+    if callable(path):
+        return path(data)
+
+    for key in path.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+class Pagination(ABC):
+    """
+    Abstract class representing a way of fetching the pages of a paginated resource.
+    """
+
+    def __init__(self, items: Union[str, Callable[[Any], Any]] = None, max_pages: int = None):
+        """
+        :type items: str or Callable
+        :param items: Dot-separated path of keys under which the items are found in each page, or a callable receiving the page and returning the items.
+            |default| :code:`None` (Whole page)
+
+        :type max_pages: int
+        :param max_pages: Maximum number of pages fetched in one pull.
+            |default| :code:`None` (No limit)
+        """
+        self.items = items
+        self.max_pages = max_pages
+        self._remembered = {}  # what is needed to carry on past each page that comes back not modified, by its cache key
+
+    def _page_items(self, page: Any) -> Any:
+        if self.items is None:
+            return page
+        return _lookup(page, self.items)
+
+    @abstractmethod
+    def pages(self, inlet: 'da.HttpInlet', session, update: 'da.Update') -> AsyncIterator:
+        """
+        Asynchronous generator yielding the items of each page. Pages fetched with :code:`inlet._fetch` may come back as :any:`NOT_MODIFIED`, in which case the pagination should carry on without yielding their items.
+
+        :type inlet: :any:`HttpInlet`
+        :param inlet: Inlet pulling the pages.
+
+        :type session: `aiohttp.ClientSession <https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession>`__
+        :param session: Session to send the requests through.
+
+        :type update: :any:`Update`
+        :param update: Update object representing the particular Link transfer.
+        """
+        raise NotImplementedError()
+
+
+class OffsetPagination(Pagination):
+    """
+    Pagination over pages selected with an offset or a page number parameter. As page addresses are known in advance, up to :code:`concurrency` pages are fetched concurrently. Pages are produced in order, stopping at the first page that is empty or holds fewer than :code:`page_size` items.
+    """
+
+    def __init__(self,
+                 param: str = 'offset',
+                 page_size: int = 100,
+                 size_param: Optional[str] = 'limit',
+                 start: int = 0,
+                 step: int = None,
+                 concurrency: int = 5,
+                 *args, **kwargs):
+        """
+        :type param: str
+        :param param: Name of the parameter selecting the page.
+            |default| :code:`'offset'`
+
+        :type page_size: int
+        :param page_size: Number of items per page.
+            |default| :code:`100`
+
+        :type size_param: str
+        :param size_param: Name of the parameter setting the number of items per page. :code:`None` to leave it to the server.
+            |default| :code:`'limit'`
+
+        :type start: int
+        :param start: Value of :code:`param` for the first page.
+            |default| :code:`0`
+
+        :type step: int
+        :param step: Increment of :code:`param` between pages. Use :code:`1` for page numbers.
+            |default| :code:`None` (Equal to :code:`page_size`)
+
+        :type concurrency: int
+        :param concurrency: Maximum number of pages fetched at once.
+            |default| :code:`5`
+        """
+        super().__init__(*args, **kwargs)
+        self.param = param
+        self.page_size = page_size
+        self.size_param = size_param
+        self.start = start
+        self.step = step
+        self.concurrency = concurrency
+
+    def _page_params(self, inlet: 'da.HttpInlet', page: int) -> dict:
+        step = self.step if self.step is not None else self.page_size
+        params = {**(inlet.params or {}), self.param: self.start + page * step}
+        if self.size_param is not None:
+            params[self.size_param] = self.page_size
+        return params
+
+    async def pages(self, inlet: 'da.HttpInlet', session, update: 'da.Update') -> AsyncIterator:
+        requests = collections.deque()
+        next_page = 0
+        try:
+            while True:
+                while len(requests) < self.concurrency and (self.max_pages is None or next_page < self.max_pages):
+                    params = self._page_params(inlet, next_page)
+                    key = inlet._cache_key(inlet.url, params)
+                    requests.append((key, asyncio.ensure_future(inlet._fetch(session, update, inlet.url, params))))
+                    next_page += 1
+
+                if not requests:
+                    return
+
+                key, request = requests.popleft()
+                page, _ = await request
+                if page is NOT_MODIFIED:
+                    # an unchanged page is the last one only if it was the last one when it was fetched
+                    count = self._remembered.get(key)
+                    if count is not None and count < self.page_size:
+                        return
+                    continue
+
+                items = self._page_items(page)
+                if items is None or items == []:
+                    self._remembered[key] = 0
+                    return
+
+                self._remembered[key] = len(items) if isinstance(items, list) else self.page_size
+                yield items
+
+                if isinstance(items, list) and len(items) < self.page_size:
+                    return
+        finally:
+            # pages requested past the last one are not needed
+            for _, request in requests:
+                request.cancel()
+            await asyncio.gather(*[request for _, request in requests], return_exceptions=True)
+
+    def __repr__(self):
+        return 'OffsetPagination(param:%s, page_size:%s, concurrency:%s)' % (self.param, self.page_size, self.concurrency)
+
+
+class CursorPagination(Pagination):
+    """
+    Pagination over pages each pointing to the next one with a cursor. Pages are fetched one at a time, following the cursors until a page has none.
+    """
+
+    def __init__(self,
+                 next_cursor: Union[str, Callable[[Any], Any]] = 'next',
+                 cursor_param: str = 'cursor',
+                 *args, **kwargs):
+        """
+        :type next_cursor: str or Callable
+        :param next_cursor: Dot-separated path of keys under which the cursor of the next page is found in each page, or a callable receiving the page and returning the cursor.
+            |default| :code:`'next'`
+
+        :type cursor_param: str
+        :param cursor_param: Name of the parameter passing the cursor. The first page is requested without it.
+            |default| :code:`'cursor'`
+        """
+        super().__init__(*args, **kwargs)
+        self.next_cursor = next_cursor
+        self.cursor_param = cursor_param
+
+    async def pages(self, inlet: 'da.HttpInlet', session, update: 'da.Update') -> AsyncIterator:
+        params = inlet.params
+        fetched = 0
+        while self.max_pages is None or fetched < self.max_pages:
+            key = inlet._cache_key(inlet.url, params)
+            page, _ = await inlet._fetch(session, update, inlet.url, params)
+            fetched += 1
+
+            if page is NOT_MODIFIED:
+                if key not in self._remembered:
+                    _LOGGER.warning(f'{update} page of {inlet.url} params={params} was not modified, but its cursor is unknown. Stopping the pagination.')
+                    return
+                cursor = self._remembered[key]
+            else:
+                items = self._page_items(page)
+                if items is not None and items != []:
+                    yield items
+
+                cursor = _lookup(page, self.next_cursor)
+                self._remembered[key] = cursor
+
+            if cursor is None or cursor == '':
+                return
+            params = {**(inlet.params or {}), self.cursor_param: cursor}
+
+    def __repr__(self):
+        return 'CursorPagination(next_cursor:%s, cursor_param:%s)' % (self.next_cursor, self.cursor_param)
+
+
+class LinkHeaderPagination(Pagination):
+    """
+    Pagination following the :code:`next` URL of the :code:`Link` response header, as described in `RFC 8288 <https://tools.ietf.org/html/rfc8288>`_. Pages are fetched one at a time.
+    """
+
+    async def pages(self, inlet: 'da.HttpInlet', session, update: 'da.Update') -> AsyncIterator:
+        url, params = inlet.url, inlet.params
+        fetched = 0
+        while self.max_pages is None or fetched < self.max_pages:
+            key = inlet._cache_key(url, params)
+            page, response = await inlet._fetch(session, update, url, params)
+            fetched += 1
+
+            next_link = response.links.get('next')
+            if page is NOT_MODIFIED:
+                # servers don't have to repeat the Link header in a 304 response
+                if next_link is None and key not in self._remembered:
+                    _LOGGER.warning(f'{update} page {url} params={params} was not modified, but its next link is unknown. Stopping the pagination.')
+                    return
+                next_url = str(next_link['url']) if next_link is not None else self._remembered[key]
+            else:
+                items = self._page_items(page)
+                if items is not None and items != []:
+                    yield items
+
+                next_url = str(next_link['url']) if next_link is not None else None
+                self._remembered[key] = next_url
+
+            if next_url is None:
+                return
+            # the next URL carries all of its parameters
+            url, params = next_url, None
+
+    def __repr__(self):
+        return 'LinkHeaderPagination()'
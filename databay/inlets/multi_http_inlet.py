@@ -0,0 +1,220 @@
+"""
+.. warning::
+    :any:`MultiHttpInlet` requires `AIOHTTP <https://docs.aiohttp.org/en/stable/>`_ to function. Please install required dependencies using:
+
+    .. code-block:: python
+
+        pip install "databay[HttpInlet]"
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from aiohttp.typedefs import LooseHeaders
+from multidict import CIMultiDict
+
+from databay import Record
+from databay.inlets.http_inlet import HttpInlet, HttpSessionPool
+from databay.inlets.http_pagination import NOT_MODIFIED
+from databay.support.rate_limit import TokenBucket
+
+_LOGGER = logging.getLogger('databay.MultiHttpInlet')
+
+
+class HttpRequest():
+    """
+    Request to be sent by the :any:`MultiHttpInlet`.
+    """
+
+    def __init__(self, url: str, params: Optional[dict] = None, headers: Optional[LooseHeaders] = None, source: Optional[str] = None):
+        """
+        :type url: str
+        :param url: URL that should be queried for data.
+
+        :type params: dict
+        :param params: Parameters for the request. |default| :code:`None`
+
+        :type headers: LooseHeaders
+        :param headers: Headers for the request, added to the headers of the inlet. |default| :code:`None`
+
+        :type source: str
+        :param source: Name of the source, stored in the metadata of the records produced from the response.
+            |default| :code:`None` (The URL)
+        """
+        self.url = url
+        self.params = params
+        self.headers = headers
+        self.source = source if source is not None else url
+
+    @property
+    def host(self) -> str:
+        """
+        Host the request is sent to.
+
+        :rtype: str
+        """
+        return urlsplit(self.url).hostname or ''
+
+    def __repr__(self):
+        return 'HttpRequest(url:%s, params:%s, source:%s)' % (self.url, self.params, self.source)
+
+
+class MultiHttpInlet(HttpInlet):
+    """
+    Inlet pulling data from many URLs at once over one pool of connections, limiting the number of simultaneous requests and the rate of requests sent to each host.
+
+    Records produced from each response are stored with the source of the request in their metadata under :code:`source_key`, and are produced as a separate chunk as soon as the response is received.
+    """
+
+    def __init__(self,
+                 requests: List[Union[HttpRequest, str]],
+                 limit_per_host: int = 10,
+                 rate_per_host: Optional[float] = None,
+                 burst_per_host: int = 1,
+                 concurrency: int = 100,
+                 ignore_request_errors: bool = False,
+                 source_key: str = '__source__',
+                 *args, **kwargs):
+        """
+        :type requests: list[:any:`HttpRequest` or str]
+        :param requests: Requests to send on each pull. URLs are turned into requests with no params.
+
+        :type limit_per_host: int
+        :param limit_per_host: Maximum number of simultaneous requests to the same host, shared by all pulls running on the same event loop. It also limits the connections to the same host of the pool created by this inlet.
+            |default| :code:`10`
+
+        :type rate_per_host: float
+        :param rate_per_host: Maximum number of requests per second sent to the same host, enforced with a :any:`TokenBucket` shared by all pulls.
+            |default| :code:`None` (No limit)
+
+        :type burst_per_host: int
+        :param burst_per_host: Number of requests that can be sent to the same host at once without waiting, if the rate allows.
+            |default| :code:`1`
+
+        :type concurrency: int
+        :param concurrency: Maximum number of simultaneous requests in total, shared by all pulls running on the same event loop.
+            |default| :code:`100`
+
+        :type ignore_request_errors: bool
+        :param ignore_request_errors: Whether to log the exceptions raised by individual requests and continue with the remaining ones. Otherwise the first exception is raised from the pull.
+            |default| :code:`False`
+
+        :type source_key: str
+        :param source_key: Metadata key under which the source of each record is stored.
+            |default| :code:`'__source__'`
+
+        Other parameters are passed on to :any:`HttpInlet`, applying to all requests. Params and headers of each request are added to the ones of the inlet.
+        """
+        super().__init__(None, *args, **kwargs)
+        if self.pagination is not None or self.stream_format is not None:
+            raise ValueError('MultiHttpInlet doesn\'t support pagination or streaming the response body')
+
+        self.requests = [request if isinstance(request, HttpRequest) else HttpRequest(request) for request in requests]
+        self.limit_per_host = limit_per_host
+        self.rate_per_host = rate_per_host
+        self.burst_per_host = burst_per_host
+        self.concurrency = concurrency
+        self.ignore_request_errors = ignore_request_errors
+        self.source_key = source_key
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._semaphores = weakref.WeakKeyDictionary()  # event loop -> (total semaphore, semaphore of each host)
+        self._lock = threading.Lock()
+
+    def _create_session_pool(self) -> HttpSessionPool:
+        return HttpSessionPool(limit_per_host=self.limit_per_host)
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        if self.rate_per_host is None:
+            return None
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate_per_host, self.burst_per_host)
+            return self._buckets[host]
+
+    def _limits(self, host: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        # semaphores are bound to an event loop, therefore pulls share them only within the same event loop
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._semaphores:
+                self._semaphores[loop] = (asyncio.Semaphore(self.concurrency), {})
+            total, hosts = self._semaphores[loop]
+            if host not in hosts:
+                hosts[host] = asyncio.Semaphore(self.limit_per_host)
+            return total, hosts[host]
+
+    def _params(self, request: HttpRequest) -> Optional[dict]:
+        if self.params is None:
+            return request.params
+        return {**self.params, **(request.params or {})}
+
+    def _headers(self, request: HttpRequest) -> Optional[LooseHeaders]:
+        if request.headers is None:
+            return self.headers
+        headers = CIMultiDict(self.headers or {})
+        headers.update(request.headers)
+        return headers
+
+    async def pull(self, update):
+        """
+        Send all requests, returning an asynchronous generator yielding the records of each response as soon as it is received.
+
+        :type update: :any:`Update`
+        :param update: Update object representing the particular Link transfer.
+        """
+        session = await self._get_session_pool().session()
+        return self._pull_all(session, update)
+
+    async def _pull_all(self, session, update):
+        async def fetch(request: HttpRequest) -> List[Record]:
+            total, host = self._limits(request.host)
+            # host limits go first, so that requests waiting for a busy host don't hold up other hosts
+            async with host:
+                bucket = self._bucket(request.host)
+                if bucket is not None:
+                    await bucket.acquire_async()
+                async with total:
+                    data, _ = await self._fetch(session, update, request.url, self._params(request), self._headers(request))
+            if data is NOT_MODIFIED:
+                return []
+            return self._to_source_records(data, request)
+
+        tasks = [asyncio.ensure_future(fetch(request)) for request in self.requests]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                try:
+                    records = await completed
+                except Exception as e:
+                    if not self.ignore_request_errors:
+                        raise
+                    _LOGGER.warning(f'{update} request of {self} failed: "{e}"')
+                    continue
+                if records:
+                    yield records
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _to_source_records(self, data, request: HttpRequest) -> List[Record]:
+        if not isinstance(data, list):
+            data = [data]
+        return [self.new_record(payload=payload, metadata={self.source_key: request.source}) for payload in data]
+
+    def __repr__(self):
+        s = "%s(" % (self.__class__.__name__)
+
+        s += f'requests={len(self.requests)}'
+
+        if self.rate_per_host:
+            s += f', rate_per_host={self.rate_per_host}'
+
+        if self.metadata:
+            s += ', metadata:%s' % self.metadata
+
+        s += ')'
+        return s
@@ -1,14 +1,22 @@
 import asyncio
+import contextlib
 import copy
 import datetime
 import itertools
 import warnings
 import logging
+import threading
 import warnings
-from typing import Any, List, Union
+from concurrent.futures import Executor
+from enum import Enum
+from typing import Any, AsyncContextManager, Callable, ContextManager, List, Union
 
 from databay import Inlet, Outlet
-from databay.errors import InvalidNodeError
+from databay.errors import CircuitOpenError, InvalidNodeError, TransferTimeoutError
+from databay.record import copy_on_write
+from databay.support.circuit_breaker import CircuitBreaker
+from databay.support.retry import RetryPolicy
+from databay.support.timeouts import wait_for_timeout
 _LOGGER = logging.getLogger('databay.Link')
 
 
@@ -43,6 +51,34 @@ class Update():
 
 from databay import Inlet, Outlet
 
+
+class OverrunPolicy(Enum):
+    """Enum defining what should happen when a link's transfer is due while its previous transfer is still running."""
+
+    ALLOW: str = 'allow'
+    """Start the transfer regardless, allowing multiple transfers of the link to run concurrently."""
+
+    SKIP: str = 'skip'
+    """Skip the transfer."""
+
+    QUEUE_ONE: str = 'queue_one'
+    """Wait for the running transfer to complete and start the transfer afterwards. Only one transfer can wait at a time, further transfers are skipped."""
+
+    COALESCE: str = 'coalesce'
+    """Merge all transfers that become due while a transfer is running into one transfer, started straight after the running transfer completes."""
+
+
+def _to_timedelta(interval: Union[datetime.timedelta, int, float]) -> datetime.timedelta:
+    if isinstance(interval, (int, float)):
+        return datetime.timedelta(seconds=interval)
+    return interval
+
+
+_ADMITTED = 'admitted'
+_QUEUED = 'queued'
+_REJECTED = 'rejected'
+
+
 class Link():
     """
     Link in the relationship graph. Use this class to define relationships between inlets and outlets.
@@ -54,12 +90,28 @@ class Link():
                  interval: Union[datetime.timedelta, int, float],
                  tags: Union[str, List[str]] = None,
                  copy_records: bool = True,
+                 copy_on_write: bool = False,
                  ignore_exceptions: bool = False,
                  catch_exceptions: bool = None,
                  inlet_concurrency : int = 9999,
                  immediate_transfer : bool = True,
                  processors: Union[callable, List[callable]] = None,
                  groupers: Union[callable, List[callable]] = None,
+                 executor: Executor = None,
+                 streaming: bool = False,
+                 batch_concurrency: int = 1,
+                 overrun_policy: OverrunPolicy = OverrunPolicy.ALLOW,
+                 min_interval: Union[datetime.timedelta, int, float] = None,
+                 max_interval: Union[datetime.timedelta, int, float] = None,
+                 backoff_factor: float = 2.0,
+                 priority: int = 0,
+                 weight: int = 1,
+                 pull_timeout: float = None,
+                 push_timeout: float = None,
+                 transfer_timeout: float = None,
+                 retry_policy: RetryPolicy = None,
+                 dead_letter_queue: 'DeadLetterQueue' = None,
+                 circuit_breaker: CircuitBreaker = None,
                  name=None):
         """
         :type inlets: :any:`Inlet` or list[:any:`Inlet`]
@@ -75,7 +127,10 @@ class Link():
         :param tags: List of tags of this link. |default| :code:`[]`
 
         :type copy_records: bool
-        :param copy_records: Whether to copy records before passing them to outlets. |default| :code:`True`
+        :param copy_records: Whether to copy records before passing them to outlets that declare they modify their records, see :any:`Outlet.mutates_records`. |default| :code:`True`
+
+        :type copy_on_write: bool
+        :param copy_on_write: Whether records passed to outlets should be copy-on-write copies sharing their data with the original records, instead of deep copies. Only data that outlets actually access is copied. Only used if :code:`copy_records` is :code:`True`. See :any:`copy_on_write <databay.record.copy_on_write>`. |default| :code:`False`
 
         :type ignore_exceptions: bool
         :param ignore_exceptions: Whether exceptions in inlets and outlets should be logged and ignored, or raised. |default| :code:`True`
@@ -91,16 +146,63 @@ class Link():
 
         :type groupers: :any:`callable` or list[:any:`callable`]
         :param groupers: :any:`groupers <groupers>` of this link. |default| :code:`None`
+
+        :type executor: :any:`concurrent.futures.Executor`
+        :param executor: Executor that synchronous :any:`Inlet.pull` and :any:`Outlet.push` calls should be offloaded to, allowing blocking inlets and outlets to execute concurrently. Inlets and outlets can override it by specifying their own executor. Note that when using a :any:`concurrent.futures.ProcessPoolExecutor` inlets and outlets must be picklable and any changes to their state made while pulling or pushing are not retained. Generators can't be sent between processes either, therefore an inlet whose :any:`Inlet.pull` is a generator has it drained within the worker process, which passes on its chunks only once the generator is exhausted. |default| :code:`None` (Synchronous calls are executed on the event loop's thread)
+
+        :type streaming: bool
+        :param streaming: Whether records of each inlet should be passed through processors, groupers and outlets as soon as that inlet completes, instead of waiting for all inlets to complete first. Inlets yielding records in chunks have each chunk passed on as soon as it is yielded. Processors and groupers are then called separately for records of each inlet or chunk. |default| :code:`False`
+        
+        :type batch_concurrency: int
+        :param batch_concurrency: How many batches produced by groupers are allowed to be pushed concurrently. Outlets that need to receive batches in order can declare so using :any:`Outlet.preserve_batch_order`. |default| :code:`1`
+        
+        :type overrun_policy: :any:`OverrunPolicy`
+        :param overrun_policy: What should happen when a transfer of this link is due while its previous transfer is still running. |default| :code:`OverrunPolicy.ALLOW`
+        
+        :type min_interval: Union[datetime.timedelta, int, float]
+        :param min_interval: Shortest interval this link speeds up to when using adaptive intervals. |default| :code:`None` (Same as :code:`interval`)
+
+        :type max_interval: Union[datetime.timedelta, int, float]
+        :param max_interval: Longest interval this link backs off to when its transfers produce no records. Providing it enables adaptive intervals - the interval is multiplied by :code:`backoff_factor` after each transfer in which inlets produced no records and divided by it after each transfer in which they did, staying between :code:`min_interval` and :code:`max_interval`. |default| :code:`None` (Interval is fixed)
+
+        :type backoff_factor: float
+        :param backoff_factor: Factor the interval is multiplied or divided by when using adaptive intervals. |default| :code:`2.0`
+
+        :type priority: int
+        :param priority: Priority of this link's transfers when the planner limits the number of concurrently executing transfers with :code:`max_transfers`. Transfers of links with higher priority are admitted first. |default| :code:`0`
+
+        :type weight: int
+        :param weight: Number of the planner's :code:`max_transfers` slots each of this link's transfers takes up. |default| :code:`1`
+
+        :type pull_timeout: float
+        :param pull_timeout: Number of seconds after which pulling from an inlet is abandoned, raising :any:`TransferTimeoutError`. Can be overridden by the :code:`timeout` of each inlet. Coroutines are cancelled, while synchronous pulls are run in an executor and abandoned. When :code:`streaming` is set, applies to producing each chunk separately. |default| :code:`None`
+
+        :type push_timeout: float
+        :param push_timeout: Number of seconds after which pushing a batch to an outlet is abandoned, raising :any:`TransferTimeoutError`. Can be overridden by the :code:`timeout` of each outlet. |default| :code:`None`
+
+        :type transfer_timeout: float
+        :param transfer_timeout: Number of seconds after which the whole transfer is cancelled, raising :any:`TransferTimeoutError`. |default| :code:`None`
+
+        :type retry_policy: :any:`RetryPolicy`
+        :param retry_policy: Policy for retrying failed pushes. Each outlet retries its batches independently, without holding up the other outlets. Can be overridden by the :code:`retry_policy` of each outlet. |default| :code:`None` (Failed pushes aren't retried)
+
+        :type dead_letter_queue: :any:`DeadLetterQueue`
+        :param dead_letter_queue: Queue storing the records of pushes that failed, allowing them to be replayed later on. |default| :code:`None`
+
+        :type circuit_breaker: :any:`CircuitBreaker`
+        :param circuit_breaker: Circuit breaker configuration applied to each inlet and outlet of this link separately. Inlets and outlets failing repeatedly are skipped straight away until their circuit closes, without holding up the others. Can be overridden by the :code:`circuit_breaker` of each inlet and outlet. |default| :code:`None`
         """
 
         self._inlets = []
         self._outlets = []
         self.add_inlets(inlets)
         self.add_outlets(outlets)
-        if isinstance(interval, (int, float)):
-            self._interval = datetime.timedelta(seconds=interval)
-        else:
-            self._interval = interval
+        self._interval = _to_timedelta(interval)
+        self.min_interval = _to_timedelta(min_interval) if min_interval is not None else self._interval
+        self.max_interval = _to_timedelta(max_interval) if max_interval is not None else None
+        self.backoff_factor = backoff_factor
+        self.priority = priority
+        self.weight = weight
         self._transfer_number = -1
         self._job = None
         if name != None:
@@ -112,6 +214,7 @@ class Link():
             tags = [tags]
         self._tags = tags if tags is not None else []
         self._copy_records = copy_records
+        self._copy_on_write = copy_on_write
         self._ignore_exceptions = ignore_exceptions
         if catch_exceptions is not None:  # pragma: no cover
             self._ignore_exceptions = catch_exceptions
@@ -120,6 +223,28 @@ class Link():
 
         self.inlet_concurrency = inlet_concurrency
         self.immediate_transfer = immediate_transfer
+        self.executor = executor
+        self.streaming = streaming
+        self.batch_concurrency = batch_concurrency
+        self.overrun_policy = overrun_policy
+        self.pull_timeout = pull_timeout
+        self.push_timeout = push_timeout
+        self.transfer_timeout = transfer_timeout
+        self.retry_policy = retry_policy
+        self.dead_letter_queue = dead_letter_queue
+        self.circuit_breaker = circuit_breaker
+
+        self._overrun_lock = threading.Lock()
+        self._running_transfers = 0
+        self._queued_transfer = None  # callback starting the transfer waiting for the running one to complete
+        self._coalesce_pending = False
+        self._skipped_transfers = 0
+        self._coalesced_transfers = 0
+        self._timeouts = 0
+        self._counters_lock = threading.Lock()
+        self._dropped_batches = 0
+        self._circuit_breakers = {}  # node -> circuit breaker created from the circuit_breaker of this link
+        self._circuit_breakers_lock = threading.Lock()
 
         processors = [] if processors is None else processors
         groupers = [] if groupers is None else groupers
@@ -176,6 +301,7 @@ class Link():
                     'Link does not contain inlet: %s' % (inl))
 
             self._inlets.remove(inl)
+            self._circuit_breakers.pop(inl, None)
 
     @property
     def outlets(self) -> List[Outlet]:
@@ -226,11 +352,12 @@ class Link():
                     'Link does not contain outlet: %s' % (outl))
 
             self._outlets.remove(outl)
+            self._circuit_breakers.pop(outl, None)
 
     @property
     def interval(self) -> datetime.timedelta:
         """
-        Frequency at which this link should transfer.
+        Frequency at which this link should transfer. When using adaptive intervals, this changes after each transfer depending on whether inlets produced any records.
 
         :returns: interval object
         :rtype: :class:`datetime.timedelta`
@@ -278,13 +405,200 @@ class Link():
         """
         return self._tags
 
-    def transfer(self):
+    @property
+    def skipped_transfers(self) -> int:
+        """
+        Number of transfers skipped due to the :any:`OverrunPolicy` of this link.
+
+        :rtype: int
+        """
+        return self._skipped_transfers
+
+    @property
+    def coalesced_transfers(self) -> int:
+        """
+        Number of transfers merged into other transfers due to the :any:`OverrunPolicy` of this link.
+
+        :rtype: int
+        """
+        return self._coalesced_transfers
+
+    @property
+    def timeouts(self) -> int:
+        """
+        Number of pulls, pushes and transfers of this link that exceeded their timeout.
+
+        :rtype: int
+        """
+        return self._timeouts
+
+    @property
+    def dropped_batches(self) -> int:
+        """
+        Number of batches not pushed to an outlet because its circuit was open, with no dead letter queue to store them in.
+
+        :rtype: int
+        """
+        return self._dropped_batches
+
+    def _count_timeout(self, exception: Exception):
+        if isinstance(exception, TransferTimeoutError):
+            with self._counters_lock:
+                self._timeouts += 1
+
+    def _get_circuit_breaker(self, node: Union[Inlet, Outlet]) -> CircuitBreaker:
+        """
+        Circuit breaker of the node provided - its own one if set, otherwise one created for it from the :code:`circuit_breaker` of this link.
+        """
+        # nodes that don't call the base constructor have no circuit_breaker attribute
+        circuit_breaker = getattr(node, 'circuit_breaker', None)
+        if circuit_breaker is not None or self.circuit_breaker is None:
+            return circuit_breaker
+
+        with self._circuit_breakers_lock:
+            if node not in self._circuit_breakers:
+                self._circuit_breakers[node] = self.circuit_breaker.copy()
+            return self._circuit_breakers[node]
+
+    def _record_failure(self, circuit_breaker: CircuitBreaker, node: Union[Inlet, Outlet], exception: Exception, update: Update):
+        if circuit_breaker is not None and circuit_breaker.record_failure(exception):
+            _LOGGER.warning(f'Circuit opened for: {node}, in: {self}, during: {update}, skipping it for {circuit_breaker.probe_interval}s')
+
+    def transfer(self, event_loop: asyncio.AbstractEventLoop = None, slot: Callable[[], ContextManager] = None):
         """
         Execute one transfer on this link. This will run through all inlets querying them for data, then pass that data to all outlets.
 
+        If a transfer of this link is already running, this method follows the :any:`OverrunPolicy` of this link, blocking if the transfer is queued.
+
         See :ref:`Link transfer <link_transfer>` to learn more about the transfer.
+
+        :type event_loop: :any:`asyncio.AbstractEventLoop`
+        :param event_loop: Event loop to run the transfer on. The loop is left open afterwards, allowing it to be reused by subsequent transfers. When :code:`None`, a new event loop is created and closed for this transfer only.
+            |default| :code:`None`
+
+        :type slot: Callable
+        :param slot: Callable returning a context manager the transfer runs within, entered only once the :any:`OverrunPolicy` let the transfer start. Used by planners to limit the number of transfers executing concurrently, without transfers that get skipped or are queued behind their own link taking up the limit.
+            |default| :code:`None`
+        """
+        queued = threading.Event()
+        admission = self._admit_transfer(queued.set)
+        if admission is _REJECTED:
+            return
+        elif admission is _QUEUED:
+            queued.wait()
+
+        try:
+            rerun = True
+            while rerun:
+                with slot() if slot is not None else contextlib.nullcontext():
+                    if event_loop is None:
+                        asyncio.run(self._run())
+                    else:
+                        event_loop.run_until_complete(self._run())
+                rerun = self._finish_transfer()
+        except BaseException:
+            self._finish_transfer(failed=True)
+            raise
+
+    async def transfer_async(self, slot: Callable[[], AsyncContextManager] = None):
+        """
+        Execute one transfer on this link using the currently running event loop, following the :any:`OverrunPolicy` of this link if a transfer is already running.
+
+        See :any:`transfer`.
+
+        :type slot: Callable
+        :param slot: Callable returning an asynchronous context manager the transfer runs within, entered only once the :any:`OverrunPolicy` let the transfer start.
+            |default| :code:`None`
+        """
+        loop = asyncio.get_running_loop()
+        queued = loop.create_future()
+
+        def start_queued():
+            loop.call_soon_threadsafe(lambda: queued.done() or queued.set_result(None))
+
+        admission = self._admit_transfer(start_queued)
+        if admission is _REJECTED:
+            return
+        elif admission is _QUEUED:
+            try:
+                await queued
+            except asyncio.CancelledError:
+                if not self._withdraw_transfer(start_queued):
+                    self._finish_transfer(failed=True)
+                raise
+
+        try:
+            rerun = True
+            while rerun:
+                if slot is None:
+                    await self._run()
+                else:
+                    async with slot():
+                        await self._run()
+                rerun = self._finish_transfer()
+        except BaseException:
+            self._finish_transfer(failed=True)
+            raise
+
+    def _admit_transfer(self, start_queued: callable) -> str:
         """
-        asyncio.run(self._run())
+        Decide whether a transfer can start based on the :any:`OverrunPolicy` of this link.
+
+        :type start_queued: callable
+        :param start_queued: Callback starting the transfer if it gets queued.
+
+        :returns: Whether the transfer was admitted, queued or rejected.
+        """
+        with self._overrun_lock:
+            if self._running_transfers == 0 or self.overrun_policy is OverrunPolicy.ALLOW:
+                self._running_transfers += 1
+                return _ADMITTED
+
+            if self.overrun_policy is OverrunPolicy.QUEUE_ONE and self._queued_transfer is None:
+                self._queued_transfer = start_queued
+                return _QUEUED
+
+            if self.overrun_policy is OverrunPolicy.COALESCE:
+                self._coalesce_pending = True
+                self._coalesced_transfers += 1
+                _LOGGER.debug(f'{self} transfer coalesced, previous transfer is still running')
+            else:
+                self._skipped_transfers += 1
+                _LOGGER.info(f'{self} transfer skipped, previous transfer is still running')
+            return _REJECTED
+
+    def _finish_transfer(self, failed: bool = False) -> bool:
+        """
+        Release the transfer slot of a completed transfer, handing it over to the queued transfer if there is one.
+
+        :returns: Whether the transfer should run once more to carry out the transfers coalesced in the meantime.
+        """
+        with self._overrun_lock:
+            if self._coalesce_pending and not failed:
+                self._coalesce_pending = False
+                return True
+
+            self._coalesce_pending = False
+            start_queued = self._queued_transfer
+            self._queued_transfer = None
+            if start_queued is None:
+                self._running_transfers -= 1
+
+        if start_queued is not None:
+            start_queued()
+        return False
+
+    def _withdraw_transfer(self, start_queued: callable) -> bool:
+        """
+        Remove a queued transfer that was cancelled before it could start.
+
+        :returns: Whether the transfer was still queued. If False, the transfer slot was already handed over to it.
+        """
+        with self._overrun_lock:
+            if self._queued_transfer is start_queued:
+                self._queued_transfer = None
+                return True
+            return False
 
     async def _run(self):
         """
@@ -295,22 +609,146 @@ class Link():
         update = Update(tags=self.tags, transfer_number=self._transfer_number)
         _LOGGER.debug(f'{update} transfer')
 
-        async def inlet_task(inlet):
+        if self.transfer_timeout is None:
+            record_count = await self._transfer_records(update, semaphore)
+        else:
+            e = TransferTimeoutError(f'{self} exceeded the transfer timeout of {self.transfer_timeout}s')
             try:
-                async with semaphore:
-                    return await inlet._pull(update)
-            except Exception as e:
+                record_count = await wait_for_timeout(self._transfer_records(update, semaphore), self.transfer_timeout, e)
+            except TransferTimeoutError as raised:
+                if raised is not e:
+                    # raised by one of the nodes, already handled
+                    raise
+                self._count_timeout(e)
                 if self._ignore_exceptions:
-                    _LOGGER.exception(
-                        f'Inlet exception: "{e}" for inlet: {inlet}, in: {self}, during: {update}', exc_info=True)
-                    return []
+                    _LOGGER.warning(f'Transfer exception: "{e}" in: {self}, during: {update}')
+                    return
                 else:
                     raise e
 
-        inlet_tasks = [inlet_task(inlet) for inlet in self._inlets]
+        if self.max_interval is not None:
+            self._adapt_interval(record_count)
+
+        _LOGGER.debug(f'{update} done')
+
+    async def _transfer_records(self, update: Update, semaphore: asyncio.Semaphore) -> int:
+        """
+        Pull records from the inlets and push them to the outlets.
+
+        :returns: Number of records produced by the inlets.
+        """
+        if self.streaming:
+            return await self._run_streaming(update, semaphore)
+
+        inlet_tasks = [self._pull_inlet(inlet, update, semaphore) for inlet in self._inlets]
         results_raw = await asyncio.gather(*inlet_tasks)
         records = list(itertools.chain.from_iterable(results_raw))
+        await self._push_batches(self._process(records, update), update)
+        return len(records)
+
+    def _adapt_interval(self, record_count: int):
+        """
+        Back off the interval if inlets produced no records, otherwise speed it up.
+        """
+        if record_count == 0:
+            interval = min(self._interval * self.backoff_factor, self.max_interval)
+        else:
+            interval = max(self._interval / self.backoff_factor, self.min_interval)
+
+        if interval != self._interval:
+            _LOGGER.debug(f'{self} interval changed to {interval}')
+            self._interval = interval
+
+    async def _run_streaming(self, update: Update, semaphore: asyncio.Semaphore) -> int:
+        """
+        Pass records through processors, groupers and outlets as soon as they are produced by any of the inlets. Inlets implementing :any:`Inlet.pull` as a generator have each of their chunks passed on separately.
+
+        :returns: Number of records produced by the inlets.
+        """
+        # bounded, so that inlets don't produce records faster than outlets are able to consume them
+        queue = asyncio.Queue(maxsize=max(len(self._inlets), 1))
+        inlet_done = object()
+
+        async def stream_inlet(inlet):
+            circuit_breaker = self._get_circuit_breaker(inlet)
+            if circuit_breaker is not None and not circuit_breaker.allow_request():
+                _LOGGER.debug(f'Skipping inlet: {inlet} with an open circuit, in: {self}, during: {update}')
+                await queue.put(inlet_done)
+                return
 
+            try:
+                async with semaphore:
+                    async for chunk in inlet._pull_chunks(update, **self._node_kwargs(self.pull_timeout)):
+                        await queue.put(chunk)
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success()
+            except Exception as e:
+                self._count_timeout(e)
+                self._record_failure(circuit_breaker, inlet, e, update)
+                if self._ignore_exceptions:
+                    _LOGGER.exception(
+                        f'Inlet exception: "{e}" for inlet: {inlet}, in: {self}, during: {update}', exc_info=True)
+                else:
+                    await queue.put(e)
+                    return
+            await queue.put(inlet_done)
+
+        inlet_tasks = [asyncio.ensure_future(stream_inlet(inlet)) for inlet in self._inlets]
+        record_count = 0
+        try:
+            remaining = len(inlet_tasks)
+            while remaining:
+                chunk = await queue.get()
+                if chunk is inlet_done:
+                    remaining -= 1
+                elif isinstance(chunk, Exception):
+                    raise chunk
+                else:
+                    record_count += len(chunk)
+                    await self._push_batches(self._process(list(chunk), update), update)
+        finally:
+            for inlet_task in inlet_tasks:
+                inlet_task.cancel()
+            await asyncio.gather(*inlet_tasks, return_exceptions=True)
+
+        return record_count
+
+    def _executor_kwargs(self) -> dict:
+        # only pass the executor when one is set, keeping the default node call signatures intact
+        return {'executor': self.executor} if self.executor is not None else {}
+
+    def _node_kwargs(self, timeout: float) -> dict:
+        kwargs = self._executor_kwargs()
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        return kwargs
+
+    async def _pull_inlet(self, inlet: Inlet, update: Update, semaphore: asyncio.Semaphore) -> List:
+        circuit_breaker = self._get_circuit_breaker(inlet)
+        if circuit_breaker is not None and not circuit_breaker.allow_request():
+            _LOGGER.debug(f'Skipping inlet: {inlet} with an open circuit, in: {self}, during: {update}')
+            return []
+
+        try:
+            async with semaphore:
+                records = await inlet._pull(update, **self._node_kwargs(self.pull_timeout))
+            if circuit_breaker is not None:
+                circuit_breaker.record_success()
+            return records
+        except Exception as e:
+            self._count_timeout(e)
+            self._record_failure(circuit_breaker, inlet, e, update)
+            if self._ignore_exceptions:
+                _LOGGER.exception(
+                    f'Inlet exception: "{e}" for inlet: {inlet}, in: {self}, during: {update}', exc_info=True)
+                return []
+            else:
+                raise e
+
+    def _process(self, records: List, update: Update) -> List:
+        """
+        Run the records through processors and groupers, returning the batches to be pushed.
+        """
         for processor in self.processors:
             try:
                 records = processor(records)
@@ -332,27 +770,110 @@ class Link():
                 else:
                     raise e
 
-        async def outlet_task(outlet, records_copy):
-            try:
-                await outlet._push(records_copy, update)
-            except Exception as e:
-                if self._ignore_exceptions:
-                    _LOGGER.exception(
-                        f'Outlet exception: "{e}" for outlet: {outlet}, in link: {self}, during: {update}', exc_info=True)
-                else:
-                    raise e
+        return batches
+
+    async def _push_outlet(self, outlet: Outlet, records: List, update: Update):
+        circuit_breaker = self._get_circuit_breaker(outlet)
+        if circuit_breaker is not None and not circuit_breaker.allow_request():
+            if self.dead_letter_queue is not None:
+                _LOGGER.debug(f'Skipping outlet: {outlet} with an open circuit, in: {self}, during: {update}')
+                self._put_dead_letter(outlet, records, update, CircuitOpenError(f'Circuit of {outlet} is open'))
+            else:
+                with self._counters_lock:
+                    self._dropped_batches += 1
+                _LOGGER.warning(f'Dropping {len(records)} record(s) for outlet: {outlet} with an open circuit, in: {self}, during: {update}')
+            return
+
+        try:
+            kwargs = self._node_kwargs(self.push_timeout)
+            if self.retry_policy is not None:
+                kwargs['retry_policy'] = self.retry_policy
+            await outlet._push(records, update, **kwargs)
+            if circuit_breaker is not None:
+                circuit_breaker.record_success()
+        except Exception as e:
+            self._count_timeout(e)
+            self._record_failure(circuit_breaker, outlet, e, update)
+            if self.dead_letter_queue is not None:
+                self._put_dead_letter(outlet, records, update, e)
+            if self._ignore_exceptions:
+                _LOGGER.exception(
+                    f'Outlet exception: "{e}" for outlet: {outlet}, in link: {self}, during: {update}', exc_info=True)
+            else:
+                raise e
+
+    def _put_dead_letter(self, outlet: Outlet, records: List, update: Update, exception: Exception):
+        try:
+            self.dead_letter_queue.put(update, outlet, records, exception)
+        except Exception:
+            _LOGGER.exception(f'Storing dead letter failed for outlet: {outlet}, in link: {self}, during: {update}')
+
+    async def _push_batches(self, batches: List, update: Update):
+        if self.batch_concurrency <= 1:
+            for batch in batches:
+                outlet_tasks = []
+                for outlet in self._outlets:
+                    task = self._push_outlet(outlet, self._copy_batch(batch, outlet), update)
+                    outlet_tasks.append(task)
+                await asyncio.gather(*outlet_tasks)
+        else:
+            await self._push_batches_concurrently(batches, update)
+
+    async def _push_batches_concurrently(self, batches: List, update: Update):
+        """
+        Push up to :code:`batch_concurrency` batches at once. Outlets with :any:`Outlet.preserve_batch_order` set receive the batches one at a time, in the order they were produced by groupers.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        last_pushed = {}  # futures set once the last batch scheduled for each ordered outlet was pushed
 
+        async def push(outlet, records, previous, pushed):
+            try:
+                if previous is not None:
+                    await previous
+                await self._push_outlet(outlet, records, update)
+            finally:
+                if pushed is not None and not pushed.done():
+                    pushed.set_result(None)
+
+        async def push_batch(pushes):
+            try:
+                async with semaphore:
+                    await asyncio.gather(*[push(*args) for args in pushes])
+            finally:
+                # release the ordered outlets waiting on this batch if it didn't get to push
+                for _, _, _, pushed in pushes:
+                    if pushed is not None and not pushed.done():
+                        pushed.set_result(None)
+
+        batch_tasks = []
         for batch in batches:
-            outlet_tasks = []
+            pushes = []
             for outlet in self._outlets:
-                if self._copy_records:
-                    task = outlet_task(outlet, copy.deepcopy(batch))
-                else:
-                    task = outlet_task(outlet, batch)
-                outlet_tasks.append(task)
-            await asyncio.gather(*outlet_tasks)
-
-        _LOGGER.debug(f'{update} done')
+                previous, pushed = None, None
+                if outlet.preserve_batch_order:
+                    previous = last_pushed.get(outlet)
+                    pushed = last_pushed[outlet] = loop.create_future()
+                pushes.append((outlet, self._copy_batch(batch, outlet), previous, pushed))
+            batch_tasks.append(asyncio.ensure_future(push_batch(pushes)))
+
+        try:
+            await asyncio.gather(*batch_tasks)
+        finally:
+            for batch_task in batch_tasks:
+                batch_task.cancel()
+            await asyncio.gather(*batch_tasks, return_exceptions=True)
+
+    def _copy_batch(self, batch: List, outlet: Outlet) -> List:
+        """
+        Copy the batch for the outlet provided. Outlets that don't modify their records are given the original batch, shared with all other such outlets.
+        """
+        if not self._copy_records or not outlet.mutates_records:
+            return batch
+        elif self._copy_on_write:
+            return [copy_on_write(record) for record in batch]
+        else:
+            return copy.deepcopy(batch)
 
     def on_start(self):
         """
@@ -7,13 +7,22 @@
 
 """
 import asyncio
+import logging
 import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
 from typing import List, Union
 
 from databay import Record
+from databay.errors import TransferTimeoutError
+from databay.support.executors import timeout_executor
+from databay.support.timeouts import wait_for_timeout
+from databay.support.circuit_breaker import CircuitBreaker
+from databay.support.retry import RetryPolicy
 import databay as da
 
+_LOGGER = logging.getLogger('databay.Outlet')
+
 
 class MetadataKey(str):
     """ Used to distinguish class attributes containing metadata keys."""
@@ -25,12 +34,42 @@ class Outlet(ABC):
     Abstract class representing an output of the data stream.
     """
 
-    def __init__(self, processors: Union[callable, List[callable]] = None):
+    mutates_records: bool = True
+    """Whether this outlet or its processors modify the records they receive. Links copy records only for outlets that modify them and provide all other outlets with the same shared records. Override it in subclasses that never modify their records. Outlets constructed with processors are assumed to modify their records, unless :code:`mutates_records` is passed explicitly."""
+
+    preserve_batch_order: bool = False
+    """Whether this outlet must receive batches one at a time in the order they were produced, when the governing link pushes multiple batches concurrently. See :code:`batch_concurrency` parameter of :any:`Link`."""
+
+    def __init__(self, processors: Union[callable, List[callable]] = None, executor: Executor = None, mutates_records: bool = None, preserve_batch_order: bool = None, timeout: float = None, retry_policy: RetryPolicy = None, circuit_breaker: CircuitBreaker = None):
         """
         :type processors: :any:`callable` or list[:any:`callable`]
         :param processors: :any:`Processors <processors>` of this outlet. |default| :code:`None`
+
+        :type executor: :any:`concurrent.futures.Executor`
+        :param executor: Executor that synchronous :any:`push` calls of this outlet should be offloaded to. Overrides the executor of the governing link. Has no effect if :any:`push` is a coroutine. |default| :code:`None`
+
+        :type mutates_records: bool
+        :param mutates_records: Overrides :any:`Outlet.mutates_records` for this outlet. |default| :code:`None` (Use the value declared by the outlet class, or :code:`True` if processors are provided)
+
+        :type preserve_batch_order: bool
+        :param preserve_batch_order: Overrides :any:`Outlet.preserve_batch_order` for this outlet. |default| :code:`None` (Use the value declared by the outlet class)
+
+        :type timeout: float
+        :param timeout: Number of seconds after which pushing a batch to this outlet is abandoned. Overrides the :code:`push_timeout` of the governing link. |default| :code:`None`
+
+        :type retry_policy: :any:`RetryPolicy`
+        :param retry_policy: Policy for retrying failed pushes to this outlet. Overrides the :code:`retry_policy` of the governing link. |default| :code:`None`
+
+        :type circuit_breaker: :any:`CircuitBreaker`
+        :param circuit_breaker: Circuit breaker skipping this outlet while it keeps failing, shared by all links this outlet belongs to. Overrides the :code:`circuit_breaker` of the governing link. |default| :code:`None`
         """
         self._active = False
+        self.executor = executor
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        if preserve_batch_order is not None:
+            self.preserve_batch_order = preserve_batch_order
 
         self._uses_coroutine = asyncio.iscoroutinefunction(self.push)
 
@@ -39,14 +78,59 @@ class Outlet(ABC):
         processors = [] if processors is None else processors
         self.processors = processors if isinstance(processors, list) else [processors]
 
-    async def _push(self, records: List[Record], update: 'da.Update'):
+        if mutates_records is not None:
+            self.mutates_records = mutates_records
+        elif self.processors:
+            # processors may modify the records, which the outlet class can't vouch for
+            self.mutates_records = True
+
+    async def _push(self, records: List[Record], update: 'da.Update', executor: Executor = None, timeout: float = None, retry_policy: RetryPolicy = None):
         for processor in self.processors:
             records = processor(records)
 
+        timeout = self.timeout if self.timeout is not None else timeout
+        retry_policy = self.retry_policy if self.retry_policy is not None else retry_policy
+        if retry_policy is None:
+            return await self._push_records(records, update, executor, timeout)
+
+        attempt = 1
+        while True:
+            try:
+                return await self._push_records(records, update, executor, timeout)
+            except Exception as e:
+                if not retry_policy.should_retry(e, attempt):
+                    raise e
+
+                delay = retry_policy.delay(attempt)
+                _LOGGER.warning(f'Retrying push to {self} in {delay:.3f}s after attempt {attempt} failed with: "{e}", during: {update}')
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _push_records(self, records: List[Record], update: 'da.Update', executor: Executor = None, timeout: float = None):
+        """
+        Push the records once, abandoning the push if it exceeds the timeout.
+        """
+        if timeout is None:
+            return await self._call_push(records, update, executor)
+
+        await wait_for_timeout(self._call_push(records, update, executor, offload=True), timeout,
+                               TransferTimeoutError(f'Pushing to {self} exceeded the timeout of {timeout}s'))
+
+    async def _call_push(self, records: List[Record], update: 'da.Update', executor: Executor = None, offload: bool = False):
+        """
+        Call :any:`push`. If :code:`offload` is set, synchronous :any:`push` runs in the :any:`TimeoutExecutor` of this node when no executor is provided, so that it can be abandoned on timeout.
+        """
         if self._uses_coroutine:
             rv = await self.push(records, update)
         else:
-            rv = self.push(records, update)
+            executor = self.executor if self.executor is not None else executor
+            if executor is None and offload:
+                executor = timeout_executor(self)
+
+            if executor is None:
+                rv = self.push(records, update)
+            else:
+                rv = await asyncio.get_running_loop().run_in_executor(executor, self.push, records, update)
 
     @abstractmethod
     def push(self, records: List[Record], update: 'da.Update'):
@@ -138,6 +222,18 @@ class Outlet(ABC):
 
         pass
 
+    def __getstate__(self):
+        # Allows pushing within a ProcessPoolExecutor. Neither the lock nor the executor can be pickled.
+        state = self.__dict__.copy()
+        del state['_thread_lock']
+        state['executor'] = None
+        state.pop('_timeout_executor', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._thread_lock = threading.Lock()
+
     @property
     def active(self):
         """
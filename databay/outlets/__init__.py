@@ -10,3 +10,5 @@ else:  # pragma: no cover
 from databay.outlets.print_outlet import PrintOutlet
 from databay.outlets.csv_outlet import CsvOutlet
 from databay.outlets.null_outlet import NullOutlet
+from databay.outlets.wal_outlet import WalOutlet
+from databay.outlets.async_writer_outlet import AsyncWriterOutlet, OverflowPolicy
@@ -0,0 +1,302 @@
+"""
+.. seealso::
+    * :ref:`Background writing <background_writing>` to learn more about pushing records in the background.
+"""
+
+import asyncio
+import collections
+import logging
+import threading
+import time
+from enum import Enum
+from typing import List
+
+from databay import Outlet, Record
+import databay as da
+
+_LOGGER = logging.getLogger('databay.AsyncWriterOutlet')
+
+
+class OverflowPolicy(Enum):
+    """Enum defining what the :any:`AsyncWriterOutlet` should do with a batch pushed while its queue is full."""
+
+    BLOCK: str = 'block'
+    """Wait until the writer frees up space in the queue, holding up the transfer."""
+
+    DROP_OLDEST: str = 'drop_oldest'
+    """Discard the oldest queued batch to make room for the new one."""
+
+    DROP_NEWEST: str = 'drop_newest'
+    """Discard the new batch."""
+
+
+class AsyncWriterOutlet(Outlet):
+    """
+    Outlet wrapping another outlet, pushing records to it in the background. Batches pushed to this outlet are placed in a bounded in-memory queue and the transfer continues straight away, while a dedicated writer thread drains the queue - joining the queued batches into larger ones before pushing them to the wrapped outlet.
+
+    Records still queued when the application crashes are lost. Use :any:`WalOutlet` if they need to survive a crash.
+
+    Batches of different transfers joined into one push are pushed with the :any:`Update` of the last of them, therefore the wrapped outlet can't tell which transfer each record came from.
+    """
+
+    def __init__(self,
+                 outlet: Outlet,
+                 max_queue: int = 1000,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                 max_batch_size: int = 1000,
+                 linger: float = 0,
+                 shutdown_timeout: float = 10.0,
+                 *args, **kwargs):
+        """
+        :type outlet: :any:`Outlet`
+        :param outlet: Outlet to push the records to.
+
+        :type max_queue: int
+        :param max_queue: Maximum number of batches waiting in the queue.
+            |default| :code:`1000`
+
+        :type overflow_policy: :any:`OverflowPolicy`
+        :param overflow_policy: What to do with a batch pushed while the queue is full.
+            |default| :any:`OverflowPolicy.BLOCK`
+
+        :type max_batch_size: int
+        :param max_batch_size: Maximum number of records the writer joins into one push to the wrapped outlet. Batches larger than that are pushed on their own. Joined batches are pushed with the update of the last of them.
+            |default| :code:`1000`
+
+        :type linger: float
+        :param linger: Number of seconds the writer waits for more batches to arrive before pushing, in order to join them into larger pushes.
+            |default| :code:`0`
+
+        :type shutdown_timeout: float
+        :param shutdown_timeout: Maximum number of seconds to wait for the queued batches to be written when shutting down, including the batches being pushed at that time.
+            |default| :code:`10.0`
+        """
+        super().__init__(*args, **kwargs)
+        if max_queue < 1:
+            raise ValueError(f'Queue size must be at least 1, got: {max_queue}')
+
+        self.outlet = outlet
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self.max_batch_size = max_batch_size
+        self.linger = linger
+        self.shutdown_timeout = shutdown_timeout
+        # records are handed over to the wrapped outlet, copies are only needed if it or the processors of this outlet modify them
+        if kwargs.get('mutates_records') is None:
+            self.mutates_records = outlet.mutates_records or bool(self.processors)
+
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._space_waiters = []
+        self._writing = 0  # number of batches being pushed
+        self._stopping = False
+        self._flushing = 0
+        self._writer = None
+        self._start_lock = threading.Lock()
+
+        self._dropped_batches = 0
+        self._failed_batches = 0
+        self._written_batches = 0
+
+    @property
+    def queued(self) -> int:
+        """
+        Number of batches currently waiting in the queue.
+
+        :rtype: int
+        """
+        return len(self._queue)
+
+    @property
+    def dropped_batches(self) -> int:
+        """
+        Number of batches discarded due to the queue being full.
+
+        :rtype: int
+        """
+        return self._dropped_batches
+
+    @property
+    def failed_batches(self) -> int:
+        """
+        Number of batches the wrapped outlet failed to push.
+
+        :rtype: int
+        """
+        return self._failed_batches
+
+    @property
+    def written_batches(self) -> int:
+        """
+        Number of batches pushed to the wrapped outlet successfully.
+
+        :rtype: int
+        """
+        return self._written_batches
+
+    def on_start(self):
+        """
+        Start the wrapped outlet and the writer thread.
+        """
+        self._ensure_started()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._writer is not None:
+                return
+
+            self.outlet.try_start()
+            writer = threading.Thread(target=self._write_loop, name='AsyncWriterOutlet-writer', daemon=True)
+            with self._condition:
+                self._stopping = False
+                self._writer = writer
+            writer.start()
+
+    async def push(self, records: List[Record], update: 'da.Update'):
+        """
+        Place the records in the queue, following the :any:`OverflowPolicy` if it's full.
+
+        :type records: list[:any:`Record`]
+        :param records: List of records generated by inlets.
+
+        :type update: :any:`Update`
+        :param update: Update object representing the particular Link transfer.
+        """
+        self._ensure_started()
+
+        while True:
+            with self._condition:
+                if len(self._queue) < self.max_queue:
+                    self._queue.append((records, update))
+                    self._condition.notify_all()
+                    return
+
+                if self.overflow_policy == OverflowPolicy.DROP_NEWEST:
+                    self._dropped_batches += 1
+                    _LOGGER.warning(f'{self} queue is full, dropping batch of {update}')
+                    return
+
+                if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+                    _, dropped_update = self._queue.popleft()
+                    self._dropped_batches += 1
+                    _LOGGER.warning(f'{self} queue is full, dropping batch of {dropped_update}')
+                    continue
+
+                loop = asyncio.get_running_loop()
+                space = loop.create_future()
+                self._space_waiters.append((loop, space))
+
+            await space
+
+    def _notify_space(self):
+        """
+        Wake up the pushes waiting for space in the queue. Must be called while holding the condition.
+        """
+        for loop, space in self._space_waiters:
+            try:
+                loop.call_soon_threadsafe(lambda space=space: space.done() or space.set_result(None))
+            except RuntimeError:  # the waiting push was cancelled and its loop closed
+                pass
+        self._space_waiters = []
+
+    def _take_batches(self) -> List:
+        """
+        Take the batches to be pushed next from the queue, joining up to :code:`max_batch_size` records. Must be called while holding the condition.
+        """
+        batches = [self._queue.popleft()]
+        size = len(batches[0][0])
+        while self._queue and size + len(self._queue[0][0]) <= self.max_batch_size:
+            records, update = self._queue.popleft()
+            batches.append((records, update))
+            size += len(records)
+        self._notify_space()
+        return batches
+
+    def _write_loop(self):
+        writer = threading.current_thread()
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                with self._condition:
+                    if self._writer is not writer:
+                        # abandoned by a shutdown that timed out while this writer was pushing
+                        return
+                    self._writing = 0
+                    self._condition.notify_all()
+                    self._condition.wait_for(lambda: self._queue or self._stopping)
+                    if not self._queue:
+                        return
+
+                if self.linger > 0 and not self._stopping:
+                    deadline = time.monotonic() + self.linger
+                    with self._condition:
+                        self._condition.wait_for(lambda: self._stopping or self._flushing or sum(len(r) for r, _ in self._queue) >= self.max_batch_size,
+                                                 timeout=max(deadline - time.monotonic(), 0))
+
+                with self._condition:
+                    batches = self._take_batches()
+                    self._writing = len(batches)
+
+                records = [record for batch_records, _ in batches for record in batch_records]
+                # joined batches are pushed with the update of the last one
+                update = batches[-1][1]
+                try:
+                    loop.run_until_complete(self.outlet._push(records, update))
+                    self._written_batches += len(batches)
+                except Exception as e:
+                    self._failed_batches += len(batches)
+                    updates = ', '.join(dict.fromkeys(str(batch_update) for _, batch_update in batches))
+                    _LOGGER.exception(f'{self} failed pushing {len(batches)} batch(es) to {self.outlet}, during: {updates}: "{e}"')
+        finally:
+            loop.close()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until all queued batches are written.
+
+        :type timeout: float
+        :param timeout: Maximum number of seconds to wait.
+            |default| :code:`None` (Wait indefinitely)
+
+        :returns: Whether all batches were written.
+        """
+        with self._condition:
+            # the writer stops lingering while anyone waits for a flush
+            self._flushing += 1
+            self._condition.notify_all()
+            try:
+                return self._condition.wait_for(lambda: not self._queue and not self._writing, timeout=timeout)
+            finally:
+                self._flushing -= 1
+
+    def on_shutdown(self):
+        """
+        Wait up to :code:`shutdown_timeout` seconds for the queued batches to be written, then stop the writer thread and shut down the wrapped outlet. Batches still queued by then are discarded, while a push to the wrapped outlet still running by then is abandoned.
+        """
+        with self._start_lock:
+            if self._writer is None:
+                return
+
+            deadline = time.monotonic() + self.shutdown_timeout
+            if not self.flush(self.shutdown_timeout):
+                with self._condition:
+                    unwritten = len(self._queue) + self._writing
+                _LOGGER.warning(f'{self} shutting down with {unwritten} batch(es) left unwritten')
+
+            writer = self._writer
+            with self._condition:
+                self._stopping = True
+                self._queue.clear()
+                self._notify_space()
+                self._condition.notify_all()
+            writer.join(max(deadline - time.monotonic(), 0))
+            with self._condition:
+                if writer.is_alive():
+                    _LOGGER.warning(f'{self} abandoning the push to {self.outlet} still running after the shutdown timeout of {self.shutdown_timeout}s')
+                self._writer = None
+                self._writing = 0
+                self._condition.notify_all()
+            self.outlet.try_shutdown()
+
+    def __repr__(self):
+        return 'AsyncWriterOutlet(outlet:%s, max_queue:%s)' % (self.outlet, self.max_queue)
@@ -21,6 +21,9 @@ class CsvOutlet(Outlet):
     FILE_MODE: MetadataKey = 'CsvOutlet.FILE_MODE'
     """Write mode to use when writing into the csv file."""
 
+    mutates_records: bool = False
+    preserve_batch_order: bool = True
+
     def __init__(self, default_filepath: str, default_file_mode: str = 'a', *args, **kwargs):
         """
 
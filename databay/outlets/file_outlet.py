@@ -16,6 +16,9 @@ class FileOutlet(Outlet):
     FILE_ENCODING: MetadataKey = 'FileOutlet.FILE_ENCODING'
     """Encoding to use when writing into the file."""
 
+    mutates_records: bool = False
+    preserve_batch_order: bool = True
+
     def __init__(self, default_filepath: str, default_file_mode: str = 'a', default_encoding: str = 'utf-8', *args, **kwargs):
         """
 
@@ -49,6 +49,9 @@ class MongoOutlet(Outlet):
     MONGODB_COLLECTION: MetadataKey = 'MongoOutlet.MONGODB_COLLECTION'
     """ Name of collection to write to. """
 
+    mutates_records: bool = True
+    """ PyMongo adds an :code:`_id` field to the payloads it inserts. """
+
     def __init__(self, database_name: str = 'databay', collection: str = 'default_collection', host: str = None, port: str = None, *args, **kwargs):
         """
 
@@ -7,6 +7,8 @@ class NullOutlet(Outlet):  # pragma: no cover
     Outlet that doesn't do anything, essentially a 'no-op' outlet.
     """
 
+    mutates_records: bool = False
+
     async def push(self, records: [Record], update):
         """
         Doesn't do anything.
@@ -7,6 +7,8 @@ class PrintOutlet(Outlet):
     Outlet that will print all records one by one.
     """
 
+    mutates_records: bool = False
+
     def __init__(self, only_payload: bool = False, skip_update: bool = False, *args, **kwargs):
         """
         :param only_payload: If True, prints only the payload of records.
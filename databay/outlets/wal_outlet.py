@@ -0,0 +1,450 @@
+"""
+.. seealso::
+    * :ref:`Write-ahead log <write_ahead_log>` to learn more about delivering records through a write-ahead log.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from typing import List, Tuple
+
+from databay import Outlet, Record
+from databay.support import segments
+from databay.support.dead_letter import DeadLetterQueue
+from databay.support.retry import RetryPolicy
+import databay as da
+
+_LOGGER = logging.getLogger('databay.WalOutlet')
+
+_SUFFIX = 'wal'
+_CHECKPOINT = struct.Struct('>QQ')  # segment index and offset delivered up to
+_STOP = object()
+
+
+class WalOutlet(Outlet):
+    """
+    Outlet wrapping another outlet with a write-ahead log, providing at-least-once delivery to it while decoupling transfers from its latency.
+
+    Each batch pushed is appended to a segmented log on disk and acknowledged once flushed - appends of concurrent pushes are flushed together, sharing one :code:`fsync` call. A background thread then delivers the logged batches to the wrapped outlet in order, retrying failed deliveries - until they succeed, or as allowed by the :code:`delivery_retry_policy`. Segments are removed once all their batches are delivered.
+
+    Batches left undelivered when the application stops or crashes are delivered when this outlet starts again. Delivery is tracked per segment in case of a crash, therefore batches may be delivered more than once.
+    """
+
+    mutates_records: bool = False
+
+    def __init__(self,
+                 outlet: Outlet,
+                 directory: str,
+                 segment_size: int = 16 * 1024 * 1024,
+                 fsync: bool = True,
+                 retry_interval: float = 1.0,
+                 shutdown_timeout: float = 10.0,
+                 delivery_retry_policy: RetryPolicy = None,
+                 dead_letter_queue: DeadLetterQueue = None,
+                 *args, **kwargs):
+        """
+        :type outlet: :any:`Outlet`
+        :param outlet: Outlet to deliver the records to.
+
+        :type directory: str
+        :param directory: Directory storing the log. Created if it doesn't exist. Each :any:`WalOutlet` needs a directory of its own.
+
+        :type segment_size: int
+        :param segment_size: Size in bytes after which a new segment file is started.
+            |default| :code:`16777216` (16 MiB)
+
+        :type fsync: bool
+        :param fsync: Whether batches should be flushed to disk with :code:`fsync` before being acknowledged, so that they survive a power loss. When :code:`False`, batches survive a crash of the application only.
+            |default| :code:`True`
+
+        :type retry_interval: float
+        :param retry_interval: Number of seconds to wait before retrying a failed delivery, if no :code:`delivery_retry_policy` is provided.
+            |default| :code:`1.0`
+
+        :type shutdown_timeout: float
+        :param shutdown_timeout: Maximum number of seconds to wait for the remaining batches to be delivered when shutting down. Batches not delivered by then are delivered on the next start.
+            |default| :code:`10.0`
+
+        :type delivery_retry_policy: :any:`RetryPolicy`
+        :param delivery_retry_policy: Policy for retrying failed deliveries. Once it gives up on a batch, the batch is stored in the :code:`dead_letter_queue` - or dropped if there is none - and delivery continues with the following batches.
+            |default| :code:`None` (Retry every :code:`retry_interval` seconds until the delivery succeeds, holding up the following batches)
+
+        :type dead_letter_queue: :any:`DeadLetterQueue`
+        :param dead_letter_queue: Queue storing the batches the :code:`delivery_retry_policy` gave up on, keyed by the wrapped outlet.
+            |default| :code:`None`
+        """
+        super().__init__(*args, **kwargs)
+        self.outlet = outlet
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self.retry_interval = retry_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.delivery_retry_policy = delivery_retry_policy
+        self.dead_letter_queue = dead_letter_queue
+
+        self._start_lock = threading.Lock()
+        self._started = False
+        self._appends = None
+        self._writer = None
+        self._deliverer = None
+        self._stop_delivery = threading.Event()
+
+        # position up to which the log is durable, guarded by the condition
+        self._committed = threading.Condition()
+        self._commit_position = (0, 0)
+        self._delivered_position = (0, 0)
+        self._write_file = None
+        self._write_index = 0
+
+        self._written = 0
+        self._delivered = 0
+        self._failed = 0
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of batches pushed since this outlet started that are yet to be delivered.
+
+        :rtype: int
+        """
+        return self._written - self._delivered - self._failed
+
+    @property
+    def failed_batches(self) -> int:
+        """
+        Number of batches pushed since this outlet started that the :code:`delivery_retry_policy` gave up on, stored in the :code:`dead_letter_queue` if one was provided.
+
+        :rtype: int
+        """
+        return self._failed
+
+    def _segment_path(self, index: int) -> str:
+        return segments.segment_path(self.directory, index, _SUFFIX)
+
+    @property
+    def _checkpoint_path(self) -> str:
+        return os.path.join(self.directory, 'checkpoint')
+
+    def _read_checkpoint(self) -> Tuple[int, int]:
+        try:
+            with open(self._checkpoint_path, 'rb') as f:
+                return _CHECKPOINT.unpack(f.read(_CHECKPOINT.size))
+        except (OSError, struct.error):
+            return 0, 0
+
+    def _write_checkpoint(self, position: Tuple[int, int]):
+        with open(self._checkpoint_path, 'wb') as f:
+            f.write(_CHECKPOINT.pack(*position))
+
+    def on_start(self):
+        """
+        Start the wrapped outlet and the delivery of batches, including the ones left undelivered by a previous run.
+        """
+        self._ensure_started()
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._started:
+                return
+
+            self.outlet.try_start()
+            os.makedirs(self.directory, exist_ok=True)
+            indices = segments.segment_indices(self.directory, _SUFFIX)
+
+            # batches of existing segments are all durable, new ones go to a new segment
+            self._write_index = indices[-1] + 1 if indices else 0
+            self._open_write_file()
+
+            checkpoint = self._read_checkpoint()
+            first_index = indices[0] if indices else self._write_index
+            self._delivered_position = max(checkpoint, (first_index, 0))
+            if indices:
+                _LOGGER.info(f'{self} delivering batches left in {len(indices)} segment(s) by a previous run')
+
+            self._written = 0
+            self._delivered = 0
+            self._failed = 0
+            # each deliverer gets its own event, so that one abandoned by a shutdown never resumes
+            self._stop_delivery = threading.Event()
+            self._appends = queue.Queue()
+            self._writer = threading.Thread(target=self._write_loop, name='WalOutlet-writer', daemon=True)
+            self._deliverer = threading.Thread(target=self._deliver_loop, name='WalOutlet-deliverer', daemon=True)
+            self._writer.start()
+            self._deliverer.start()
+            self._started = True
+
+    async def push(self, records: List[Record], update: 'da.Update'):
+        """
+        Append the records to the write-ahead log, returning once they are durable. Delivery to the wrapped outlet happens in the background.
+
+        :type records: list[:any:`Record`]
+        :param records: List of records generated by inlets.
+
+        :type update: :any:`Update`
+        :param update: Update object representing the particular Link transfer.
+        """
+        self._ensure_started()
+        data = segments.encode_entry({'tags': list(update.tags), 'transfer_number': update.transfer_number, 'records': list(records)})
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def acknowledge(exception: Exception = None):
+            def resolve():
+                if future.done():
+                    return
+                if exception is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(exception)
+            loop.call_soon_threadsafe(resolve)
+
+        self._appends.put((data, acknowledge))
+        await future
+
+    def _write_loop(self):
+        """
+        Append the queued batches to the log, flushing all batches queued in the meantime together.
+        """
+        stop = False
+        while not stop:
+            group = [self._appends.get()]
+            while True:
+                try:
+                    group.append(self._appends.get_nowait())
+                except queue.Empty:
+                    break
+
+            if _STOP in group:
+                stop = True
+                group = [append for append in group if append is not _STOP]
+            if not group:
+                continue
+
+            try:
+                if self._write_file is None:
+                    self._open_write_file()
+                for data, _ in group:
+                    self._write_file.write(data)
+                self._write_file.flush()
+                if self.fsync:
+                    os.fsync(self._write_file.fileno())
+            except Exception as e:
+                _LOGGER.exception(f'{self} failed to write to the log')
+                self._discard_failed_write()
+                for _, acknowledge in group:
+                    acknowledge(e)
+                continue
+
+            with self._committed:
+                self._written += len(group)
+                self._commit_position = (self._write_index, self._write_file.tell())
+                self._committed.notify_all()
+
+            for _, acknowledge in group:
+                acknowledge()
+
+            if self._write_file.tell() >= self.segment_size:
+                self._close_write_file()
+
+    def _open_write_file(self):
+        """
+        Open the segment the following batches are appended to, committing its header.
+        """
+        self._write_file = segments.open_segment(self._segment_path(self._write_index))
+        with self._committed:
+            self._commit_position = (self._write_index, self._write_file.tell())
+            self._committed.notify_all()
+
+    def _close_write_file(self):
+        """
+        Close the segment written to, so that the following batches are appended to a new segment once they arrive.
+        """
+        try:
+            self._write_file.close()
+        except OSError:
+            pass  # only uncommitted data fails to be written when closing
+        self._write_file = None
+        self._write_index += 1
+
+    def _discard_failed_write(self):
+        """
+        Drop the data left in the segment by a failed write. The segment is cut back to its last committed batch and closed, and the following batches go to a new segment - even if cutting it back fails, the deliverer then stops reading the segment at the incomplete batch.
+        """
+        if self._write_file is None:
+            # opening a new segment failed, it is created again with the next batches
+            try:
+                os.remove(self._segment_path(self._write_index))
+            except OSError:
+                pass
+            return
+
+        self._close_write_file()
+        index, offset = self._commit_position
+        try:
+            os.truncate(self._segment_path(index), offset)
+        except OSError as e:
+            _LOGGER.warning(f'{self} failed to remove an incomplete batch from {self._segment_path(index)}: "{e}"')
+
+    def _deliver_loop(self):
+        """
+        Deliver the durable batches to the wrapped outlet in order, removing segments once all their batches are delivered.
+        """
+        stop = self._stop_delivery
+        loop = asyncio.new_event_loop()
+        index, offset = self._delivered_position
+        f = None
+        try:
+            while not stop.is_set():
+                if f is None:
+                    path = self._segment_path(index)
+                    if not os.path.exists(path):
+                        if index >= self._commit_position[0]:
+                            with self._committed:
+                                self._committed.wait(0.1)
+                            continue
+                        index, offset = index + 1, 0
+                        continue
+                    f = open(path, 'rb')
+                    if offset == 0 and not segments.read_magic(f):
+                        _LOGGER.warning(f'Skipping {path}: not a write-ahead log segment')
+                        f.close()
+                        f = None
+                        os.remove(path)
+                        index, offset = index + 1, 0
+                        continue
+                    f.seek(max(offset, len(segments.MAGIC)))
+
+                with self._committed:
+                    commit_index, commit_offset = self._commit_position
+                    if index == commit_index and f.tell() >= commit_offset:
+                        # caught up with the writer
+                        self._delivered_position = (index, f.tell())
+                        self._committed.notify_all()
+                        self._committed.wait(0.1)
+                        continue
+
+                entry_offset = f.tell()
+                try:
+                    entry = segments.read_entry(f)
+                except segments.CorruptEntryError as e:
+                    if index >= commit_index:
+                        # the writer may still be using the segment, it is only ever removed once the writer moved on
+                        _LOGGER.error(f'{e} in {f.name} before its last committed batch, waiting for the writer to move to a new segment')
+                        f.seek(entry_offset)
+                        stop.wait(self.retry_interval)
+                        continue
+                    _LOGGER.warning(f'{e} in {f.name}, skipping the rest of the segment')
+                    entry = None
+
+                if entry is None:
+                    # segment is complete, as the writer moved to a new one or it was left by a previous run
+                    f.close()
+                    f = None
+                    os.remove(self._segment_path(index))
+                    index, offset = index + 1, 0
+                    continue
+
+                if not self._deliver(loop, entry, stop) or stop.is_set():
+                    # a batch delivered after stopping isn't recorded, it is delivered again on the next start
+                    break
+                self._delivered_position = (index, f.tell())
+        finally:
+            if f is not None:
+                f.close()
+            loop.close()
+
+    def _deliver(self, loop: asyncio.AbstractEventLoop, entry: dict, stop: threading.Event) -> bool:
+        """
+        Push the batch to the wrapped outlet, retrying until it succeeds or the :code:`delivery_retry_policy` gives up on it.
+
+        :returns: Whether delivery can continue with the following batch, or delivery was stopped.
+        """
+        update = da.Update(tags=entry['tags'], transfer_number=entry['transfer_number'])
+        retry_policy = self.delivery_retry_policy
+        attempt = 1
+        while True:
+            try:
+                loop.run_until_complete(self.outlet._push(entry['records'], update))
+                with self._committed:
+                    if not stop.is_set():
+                        self._delivered += 1
+                return True
+            except Exception as e:
+                if retry_policy is None:
+                    delay = self.retry_interval
+                elif retry_policy.should_retry(e, attempt):
+                    delay = retry_policy.delay(attempt)
+                elif self._give_up(entry['records'], update, e):
+                    return True
+                else:
+                    # storing the dead letter failed, the batch is retried from scratch
+                    attempt, delay = 0, self.retry_interval
+
+                _LOGGER.warning(f'{self} failed delivering batch of {update} to {self.outlet}, retrying in {delay:.3f}s: "{e}"')
+                if stop.wait(delay):
+                    return False
+                attempt += 1
+
+    def _give_up(self, records: List[Record], update: 'da.Update', exception: Exception) -> bool:
+        """
+        Store the batch the retry policy gave up on in the dead letter queue, or drop it if there is none.
+
+        :returns: Whether the batch was handled.
+        """
+        if self.dead_letter_queue is not None:
+            try:
+                self.dead_letter_queue.put(update, self.outlet, records, exception)
+            except Exception:
+                _LOGGER.exception(f'{self} failed storing the batch of {update} in {self.dead_letter_queue}')
+                return False
+            _LOGGER.warning(f'{self} gave up delivering batch of {update} to {self.outlet}, stored in {self.dead_letter_queue}: "{exception}"')
+        else:
+            _LOGGER.error(f'{self} gave up delivering batch of {update} to {self.outlet}, dropping {len(records)} record(s): "{exception}"')
+
+        with self._committed:
+            self._failed += 1
+        return True
+
+    def on_shutdown(self):
+        """
+        Stop accepting batches, wait up to :code:`shutdown_timeout` seconds for the remaining batches to be delivered, then shut down the wrapped outlet. A delivery to the wrapped outlet still running by then is abandoned, and its batch is delivered again on the next start.
+        """
+        with self._start_lock:
+            if not self._started:
+                return
+
+            deadline = time.monotonic() + self.shutdown_timeout
+            self._appends.put(_STOP)
+            self._writer.join()
+
+            with self._committed:
+                caught_up = self._committed.wait_for(lambda: self._delivered_position == self._commit_position or not self._deliverer.is_alive(),
+                                                     timeout=max(deadline - time.monotonic(), 0))
+                self._stop_delivery.set()
+            self._deliverer.join(max(deadline - time.monotonic(), 0))
+            if self._deliverer.is_alive():
+                _LOGGER.warning(f'{self} abandoning the delivery to {self.outlet} still running after the shutdown timeout of {self.shutdown_timeout}s')
+            if self._write_file is not None:
+                self._write_file.close()
+                self._write_file = None
+
+            if caught_up and self._delivered_position == self._commit_position:
+                for index in segments.segment_indices(self.directory, _SUFFIX):
+                    os.remove(self._segment_path(index))
+                if os.path.exists(self._checkpoint_path):
+                    os.remove(self._checkpoint_path)
+            else:
+                _LOGGER.warning(f'{self} shutting down with {self.pending} batch(es) left to deliver on the next start')
+                self._write_checkpoint(self._delivered_position)
+
+            self._started = False
+            self.outlet.try_shutdown()
+
+    def __repr__(self):
+        return 'WalOutlet(outlet:%s, directory:%s)' % (self.outlet, self.directory)
@@ -1,2 +1,4 @@
 from databay.planners.aps_planner import ApsPlanner, APSPlanner
 from databay.planners.schedule_planner import SchedulePlanner
+from databay.planners.asyncio_planner import AsyncioPlanner
+from databay.planners.timer_wheel_planner import TimerWheelPlanner
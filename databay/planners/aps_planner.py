@@ -4,6 +4,7 @@
     * :any:`BasePlanner` for the remaining interface of this planner.
 """
 
+import datetime
 import logging
 import warnings
 from typing import Union, List
@@ -43,7 +44,11 @@ class ApsPlanner(BasePlanner):
                  job_defaults_override: dict = None,
                  ignore_exceptions: bool = False,
                  catch_exceptions: bool = None,
-                 immediate_transfer: bool = True):
+                 immediate_transfer: bool = True,
+                 persistent_event_loops: bool = False,
+                 phase_spread: bool = False,
+                 jitter: float = 0,
+                 max_transfers: int = None):
         """
 
         :type links: :any:`Link` or list[:any:`Link`]
@@ -68,6 +73,18 @@ class ApsPlanner(BasePlanner):
 
         :type immediate_transfer: :class:`bool`
         :param immediate_transfer: Whether planner should execute one transfer immediately upon starting. |default| :code:`True`
+
+        :type persistent_event_loops: bool
+        :param persistent_event_loops: Whether each of the worker threads should reuse one long-lived event loop for all transfers it executes. |default| :code:`False`
+
+        :type phase_spread: bool
+        :param phase_spread: Whether the first scheduled runs of links sharing the same interval should be spread evenly across that interval. |default| :code:`False`
+
+        :type jitter: float
+        :param jitter: Maximum random delay in seconds added to each scheduled run of a link. |default| :code:`0`
+
+        :type max_transfers: int
+        :param max_transfers: Maximum number of transfers allowed to execute concurrently across all links, as measured by their :any:`Link.weight`. Waiting transfers are started in order of their link's :any:`Link.priority`. |default| :code:`None`
         """
 
         self._threads = threads
@@ -89,7 +106,7 @@ class ApsPlanner(BasePlanner):
 
         self.links_by_jobid = {}
 
-        super().__init__(links=links, ignore_exceptions=ignore_exceptions, immediate_transfer=immediate_transfer)
+        super().__init__(links=links, ignore_exceptions=ignore_exceptions, immediate_transfer=immediate_transfer, persistent_event_loops=persistent_event_loops, phase_spread=phase_spread, jitter=jitter, max_transfers=max_transfers)
 
         if catch_exceptions is not None:  # pragma: no cover
             self._ignore_exceptions = catch_exceptions
@@ -109,11 +126,26 @@ class ApsPlanner(BasePlanner):
         :param link: Link to be scheduled
         """
 
-        job = self._scheduler.add_job(link.transfer, trigger=IntervalTrigger(
-            seconds=link.interval.total_seconds()))
+        interval = link.interval.total_seconds()
+        start_date = None
+        if self.phase_spread:
+            start_date = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=self._start_offset(link))
+
+        job = self._scheduler.add_job(self._transfer, args=[link], trigger=IntervalTrigger(
+            seconds=interval, start_date=start_date, jitter=self.jitter or None))
         link.set_job(job)
         self.links_by_jobid[job.id] = link
 
+    def _reschedule(self, link: Link):
+        """
+        Replace the trigger of the link's job to match its changed interval.
+
+        :type link: :any:`Link`
+        :param link: Link whose interval changed.
+        """
+        link.job.reschedule(trigger=IntervalTrigger(
+            seconds=link.interval.total_seconds(), jitter=self.jitter or None))
+
     def _unschedule(self, link: Link):
         """
         Unschedule a link.
@@ -0,0 +1,338 @@
+"""
+.. seealso::
+    * :ref:`Scheduling <scheduling>` to learn more about scheduling in Databay.
+    * :any:`BasePlanner` for the remaining interface of this planner.
+"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import threading
+from typing import List, Union
+
+from databay.base_planner import BasePlanner
+from databay import Link
+
+_LOGGER = logging.getLogger('databay.AsyncioPlanner')
+
+
+class AsyncioJob():
+    """
+    Job of a link scheduled by the :any:`AsyncioPlanner`. Wraps the asyncio task that periodically starts the link's transfers.
+    """
+
+    def __init__(self, link: Link):
+        """
+        :type link: :any:`Link`
+        :param link: Link this job is executing.
+        """
+        self.link = link
+        self.task = None
+
+    def __repr__(self):
+        return 'AsyncioJob(link:%s)' % (self.link)
+
+
+class AsyncioPlanner(BasePlanner):
+    """
+    Planner running all links as asyncio tasks on a single event loop. Scheduling sets an :any:`AsyncioJob` as links' job.
+
+    Transfers are timed using the event loop's monotonic clock and are run directly on the loop without any worker threads. Since all transfers share one thread, inlets and outlets should implement their :code:`pull` and :code:`push` methods as coroutines - synchronous implementations will block all other transfers while they execute.
+    """
+
+    def __init__(self,
+                 links: Union[Link, List[Link]] = None,
+                 concurrency: int = 1000,
+                 ignore_exceptions: bool = False,
+                 immediate_transfer: bool = True,
+                 shutdown_at_exit: bool = False,
+                 phase_spread: bool = False,
+                 jitter: float = 0,
+                 max_transfers: int = None):
+        """
+        :type links: :any:`Link` or list[:any:`Link`]
+        :param links: Links that should be added and scheduled.
+            |default| :code:`None`
+
+        :type concurrency: int
+        :param concurrency: Maximum number of transfers allowed to execute concurrently.
+            |default| :code:`1000`
+
+        :type ignore_exceptions: bool
+        :param ignore_exceptions: Whether exceptions should be ignored or halt the planner.
+            |default| :code:`False`
+
+        :type immediate_transfer: :class:`bool`
+        :param immediate_transfer: Whether planner should execute one transfer immediately upon starting. |default| :code:`True`
+
+        :type shutdown_at_exit: bool
+        :param shutdown_at_exit: Whether this planner should attempt to gracefully shutdown if the app exists unexpectedly.
+            |default| :code:`False`
+
+        :type phase_spread: bool
+        :param phase_spread: Whether the first scheduled runs of links sharing the same interval should be spread evenly across that interval. |default| :code:`False`
+
+        :type jitter: float
+        :param jitter: Maximum random delay in seconds added to each scheduled run of a link. |default| :code:`0`
+
+        :type max_transfers: int
+        :param max_transfers: Maximum number of transfers allowed to execute concurrently across all links, as measured by their :any:`Link.weight`. Waiting transfers are started in order of their link's :any:`Link.priority`. |default| :code:`None`
+        """
+
+        self._concurrency = concurrency
+        self._loop = None
+        self._semaphore = None
+        self._stop_event = None
+        self._finished = None
+        self._stopped = threading.Event()
+        self._stopped.set()
+        self._running = False
+        self._shutdown_requested = False
+        self._wait = True
+        self._transfers = set()
+
+        super().__init__(links=links, ignore_exceptions=ignore_exceptions, immediate_transfer=immediate_transfer, shutdown_at_exit=shutdown_at_exit, phase_spread=phase_spread, jitter=jitter, max_transfers=max_transfers)
+
+    @property
+    def concurrency(self) -> int:
+        """
+        Maximum number of transfers allowed to execute concurrently.
+
+        :rtype: int
+        """
+        return self._concurrency
+
+    def _is_loop_thread(self) -> bool:
+        """
+        Whether the current thread is the one running this planner's event loop.
+        """
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _schedule(self, link: Link):
+        """
+        Schedule a link. Sets :any:`AsyncioJob` as this link's job. If the planner is running, the link's task is started on the event loop straight away.
+
+        :type link: :any:`Link`
+        :param link: Link to be scheduled
+        """
+        job = AsyncioJob(link)
+        link.set_job(job)
+
+        if self._running:
+            self._loop.call_soon_threadsafe(self._start_job, job)
+
+    def _unschedule(self, link: Link):
+        """
+        Unschedule a link. Transfers of this link that are already executing are allowed to finish.
+
+        :type link: :any:`Link`
+        :param link: Link to be unscheduled
+        """
+        job = link.job
+        if job is None:
+            return
+
+        link.set_job(None)
+        if job.task is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(job.task.cancel)
+
+    def _start_job(self, job: AsyncioJob):
+        if job.task is None and job.link.job is job and self._running:
+            job.task = self._loop.create_task(self._run_job(job))
+
+    async def _run_job(self, job: AsyncioJob):
+        """
+        Start the link's transfers on its interval. Next run times are accumulated from the previous ones rather than from the time a transfer finished, therefore no drift builds up over time. Runs missed due to the event loop being blocked are skipped.
+        """
+        link = job.link
+        next_run = self._loop.time() + self._start_offset(link)
+        while True:
+            await asyncio.sleep(max(next_run - self._loop.time(), 0) + self._get_jitter())
+            self._create_transfer_task(link)
+
+            interval = link.interval.total_seconds()
+            next_run += interval
+            now = self._loop.time()
+            if next_run < now and interval > 0:
+                next_run += ((now - next_run) // interval + 1) * interval
+
+    def _create_transfer_task(self, link: Link):
+        task = self._loop.create_task(self._transfer_async(link))
+        self._transfers.add(task)
+        task.add_done_callback(self._transfers.discard)
+        return task
+
+    async def _transfer_async(self, link: Link):
+        """
+        Execute one transfer of the link provided on this planner's event loop, handling its exceptions.
+
+        :type link: :any:`Link`
+        :param link: Link to execute the transfer of.
+        """
+        try:
+            await self._run_transfer(link)
+        except Exception as e:
+            self._on_exception(e, link)
+
+    async def _run_transfer(self, link: Link):
+        """
+        Execute one transfer of the link provided on this planner's event loop, bounded by the :code:`max_transfers` and :any:`concurrency` limits.
+
+        :type link: :any:`Link`
+        :param link: Link to execute the transfer of.
+        """
+        # the limits are applied only once the overrun policy of the link let the transfer start
+        await link.transfer_async(slot=functools.partial(self._transfer_slot_async, link))
+
+    @contextlib.asynccontextmanager
+    async def _transfer_slot_async(self, link: Link):
+        """
+        Asynchronous context manager taking up the admission slots and the :any:`concurrency` slot of a transfer of the link provided for as long as it executes.
+
+        :type link: :any:`Link`
+        :param link: Link executing the transfer.
+        """
+        if self._admission is not None:
+            await self._admission.acquire_async(link.priority, link.weight)
+        try:
+            async with self._semaphore:
+                yield
+        finally:
+            if self._admission is not None:
+                self._admission.release(link.weight)
+
+    def _transfer(self, link: Link):
+        """
+        Execute one transfer of the link provided. If the planner is running, the transfer is executed on its event loop.
+
+        :type link: :any:`Link`
+        :param link: Link to execute the transfer of.
+        """
+        if not self._running:
+            super()._transfer(link)
+        elif self._is_loop_thread():
+            self._create_transfer_task(link)
+        else:
+            asyncio.run_coroutine_threadsafe(self._run_transfer(link), self._loop).result()
+
+    def start(self):
+        """
+        Start this planner. Runs :any:`start_async` on a new event loop, blocking until the planner is shut down.
+
+        See :ref:`Start and Shutdown <start_shutdown>` to learn more about starting and shutdown.
+        """
+        asyncio.run(self.start_async())
+
+    async def start_async(self):
+        """
+        Start this planner on the currently running event loop. The coroutine completes once the planner is shut down.
+
+        This will call the on_start callback of all links and - if :code:`immediate_transfer` is set to True - execute one transfer for each link concurrently before starting the scheduling.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self._concurrency)
+        self._stop_event = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._shutdown_requested = False
+        self._stopped.clear()
+
+        try:
+            _LOGGER.info('Starting %s' % str(self))
+            self._start_links()
+
+            if self.immediate_transfer:
+                links = [link for link in self.links if link.immediate_transfer]
+                results = await asyncio.gather(*[self._run_transfer(link) for link in links], return_exceptions=True)
+                exceptions = [(result, link) for result, link in zip(results, links) if isinstance(result, Exception)]
+                for exception, link in exceptions:
+                    self._on_exception(exception, link)
+
+                if exceptions and not self._ignore_exceptions:
+                    return
+
+            await self._start_planner_async()
+        finally:
+            self._finished.set()
+            self._stopped.set()
+
+    def _start_planner(self):  # pragma: no cover
+        asyncio.run(self._start_planner_async())
+
+    async def _start_planner_async(self):
+        if self._shutdown_requested:
+            return
+
+        self._running = True
+        for link in self.links:
+            if link.job is not None:
+                self._start_job(link.job)
+
+        try:
+            await self._stop_event.wait()
+        finally:
+            self._running = False
+            for link in self.links:
+                if link.job is not None and link.job.task is not None:
+                    link.job.task.cancel()
+                    link.job.task = None
+
+            if not self._wait:
+                for task in self._transfers:
+                    task.cancel()
+            await asyncio.gather(*self._transfers, return_exceptions=True)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shutdown this planner. Links will stop being scheduled after calling this method. If called from outside of the planner's event loop, this blocks until the planner has stopped.
+
+        See :ref:`Start and Shutdown <start_shutdown>` to learn more about starting and shutdown.
+
+        :type wait: bool
+        :param wait: Whether to let the currently executing transfers finish, or cancel them.
+            |default| :code:`True`
+        """
+        super().shutdown(wait)
+
+    async def shutdown_async(self, wait: bool = True):
+        """
+        Shutdown this planner from within its event loop, waiting until the planner has stopped before calling the on_shutdown callback of all links.
+
+        Must not be awaited from within a transfer of this planner, as it waits for all transfers to complete.
+
+        :type wait: bool
+        :param wait: Whether to let the currently executing transfers finish, or cancel them.
+            |default| :code:`True`
+        """
+        _LOGGER.info('Shutting down %s' % str(self))
+        self._shutdown_planner(wait)
+        if self._finished is not None:
+            await self._finished.wait()
+        for link in self.links:
+            link.on_shutdown()
+
+    def _shutdown_planner(self, wait: bool = True):
+        self._shutdown_requested = True
+        self._wait = wait
+        if self._stopped.is_set():
+            return
+
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+        if not self._is_loop_thread():
+            self._stopped.wait()
+
+    @property
+    def running(self):
+        """
+        Whether this planner is currently running. Changed by calls to :any:`start` and :any:`shutdown`.
+
+        :return: State of this planner
+        :rtype: bool
+        """
+        return self._running
+
+    def __repr__(self):
+        return 'AsyncioPlanner(concurrency:%s)' % (self._concurrency)
@@ -4,12 +4,15 @@
     * :any:`BasePlanner` for the remaining interface of this planner.
 """
 
+import datetime
+import heapq
+import itertools
 import logging
 import threading
 import time
 import warnings
 from concurrent import futures
-from typing import List, Union
+from typing import List, Tuple, Union
 
 import schedule
 
@@ -20,19 +23,21 @@ _LOGGER = logging.getLogger('databay.SchedulePlanner')
 
 
 class ScheduleIntervalError(Exception):
-    """ Raised when link interval is smaller than the Schedule refresh interval."""
+    """ Deprecated, no longer raised since link intervals are no longer limited by the refresh interval. Will be removed in version 1.0."""
     pass
 
 
 class SchedulePlanner(BasePlanner):
     """
-    Planner implementing scheduling using Schedule_. Scheduling sets the :class:`Schedule's Job <schedule.Job>` as links' job.
+    Planner scheduling links on a monotonic clock. Scheduling sets the :class:`Schedule's Job <schedule.Job>` as links' job.
+
+    Next run times of all links are kept in a heap, and the planner sleeps exactly until the next link is due. Next run times are accumulated from the previous ones rather than from the time the planner woke up, therefore no drift builds up over time. Runs missed due to the planner being blocked are skipped.
 
     .. _Schedule: https://schedule.readthedocs.io/
 
     """
 
-    def __init__(self, links: Union[Link, List[Link]] = None, threads: int = 30, refresh_interval: float = 1.0, ignore_exceptions: bool = False, catch_exceptions: bool = None, immediate_transfer: bool = True):
+    def __init__(self, links: Union[Link, List[Link]] = None, threads: int = 30, refresh_interval: float = None, ignore_exceptions: bool = False, catch_exceptions: bool = None, immediate_transfer: bool = True, persistent_event_loops: bool = False, phase_spread: bool = False, jitter: float = 0, max_transfers: int = None):
         """
         :type links: :any:`Link` or list[:any:`Link`]
         :param links: Links that should be added and scheduled.
@@ -43,10 +48,8 @@ class SchedulePlanner(BasePlanner):
             |default| :code:`30`
 
         :type refresh_interval: :class:`float`
-        :param refresh_interval: Frequency at which this planner will scan over
-            its links and attempt to update them if necessary. Note that adding
-            links with intervals smaller than this value will raise a :any:`ScheduleIntervalError`.
-            |default| :code:`1.0`
+        :param refresh_interval: Deprecated, no longer used since links are started exactly when they are due. Will be removed in version 1.0.
+            |default| :code:`None`
 
         :type ignore_exceptions: :class:`bool`
         :param ignore_exceptions: Whether exceptions should be ignored, or halt the planner.
@@ -54,10 +57,31 @@ class SchedulePlanner(BasePlanner):
 
         :type immediate_transfer: :class:`bool`
         :param immediate_transfer: Whether planner should execute one transfer immediately upon starting. |default| :code:`True`
+
+        :type persistent_event_loops: :class:`bool`
+        :param persistent_event_loops: Whether each of the worker threads should reuse one long-lived event loop for all transfers it executes. |default| :code:`False`
+
+        :type phase_spread: bool
+        :param phase_spread: Whether the first scheduled runs of links sharing the same interval should be spread evenly across that interval. |default| :code:`False`
+
+        :type jitter: float
+        :param jitter: Maximum random delay in seconds added to each scheduled run of a link. |default| :code:`0`
+
+        :type max_transfers: int
+        :param max_transfers: Maximum number of transfers allowed to execute concurrently across all links, as measured by their :any:`Link.weight`. Waiting transfers are started in order of their link's :any:`Link.priority`. |default| :code:`None`
         """
 
-        self._refresh_interval = refresh_interval
-        super().__init__(links=links, ignore_exceptions=ignore_exceptions, immediate_transfer=immediate_transfer)
+        if refresh_interval is not None:
+            warnings.warn(
+                '\'refresh_interval\' parameter is no longer used and will be removed in version 1.0.', DeprecationWarning)
+        self._refresh_interval = refresh_interval if refresh_interval is not None else 1.0
+
+        self._queue = []  # heap of (next run time including jitter, sequence number, job, link, next run time)
+        self._queue_lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._wakeup = threading.Event()
+
+        super().__init__(links=links, ignore_exceptions=ignore_exceptions, immediate_transfer=immediate_transfer, persistent_event_loops=persistent_event_loops, phase_spread=phase_spread, jitter=jitter, max_transfers=max_transfers)
         self._running = False
         self._threads = threads
         self._thread_pool = None
@@ -72,9 +96,7 @@ class SchedulePlanner(BasePlanner):
     def refresh_interval(self) -> float:
         """
 
-        Frequency at which this planner will scan over its links and attempt to update
-        them if necessary. Note that adding links with interval smaller than this
-        value will raise a :any:`ScheduleIntervalError`.
+        Deprecated, no longer used since links are started exactly when they are due. Will be removed in version 1.0.
 
         :return: Refresh interval frequency.
         :rtype: float
@@ -104,32 +126,76 @@ class SchedulePlanner(BasePlanner):
 
     def _try_job(self, link):
         try:
-            link.transfer()
+            self._transfer(link)
         except:
             import sys
             with self._exc_lock:
                 self._exc_info.append((sys.exc_info(), link))
+            self._wakeup.set()
 
     def _run_job(self, link):
-        self._thread_pool.submit(self._try_job, link)
+        thread_pool = self._thread_pool
+        if thread_pool is None:
+            return
+
+        try:
+            thread_pool.submit(self._try_job, link)
+        except RuntimeError:  # pragma: no cover
+            # thread pool was shut down in the meantime
+            pass
 
     def _schedule(self, link: Link):
         """
-        Schedule a link, setting a :class:`schedule.Job` as this link's job.
+        Schedule a link, setting a :class:`schedule.Job` as this link's job. The link is first run once its interval has elapsed.
 
         :type link: :any:`Link`
         :param link: Link to be scheduled
-
-        :raises: :class:`ScheduleIntervalError` if link's interval is smaller than the :any:`refresh interval`.
         """
 
-        if link.interval.total_seconds() < self._refresh_interval:
-            raise ScheduleIntervalError(
-                f'Link interval must be greater than or equal to refresh interval. Link interval: {link.interval.total_seconds()}s, Refresh interval: {self._refresh_interval}s')
-
-        job = schedule.every(link.interval.total_seconds()
-                             ).seconds.do(self._run_job, link)
+        interval = link.interval.total_seconds()
+        job = schedule.every(interval).seconds.do(self._run_job, link)
         link.set_job(job)
+        self._push(time.monotonic() + self._start_offset(link), job, link)
+
+    def _push(self, due: float, job: schedule.Job, link: Link):
+        with self._queue_lock:
+            heapq.heappush(self._queue, self._queue_entry(due, job, link))
+            job.next_run = datetime.datetime.now() + datetime.timedelta(seconds=due - time.monotonic())
+        self._wakeup.set()
+
+    def _queue_entry(self, due: float, job: schedule.Job, link: Link) -> tuple:
+        return (due + self._get_jitter(), next(self._sequence), job, link, due)
+
+    def _pop_due(self) -> Tuple[List[Link], float]:
+        """
+        Pop all links that are due, pushing them back with their next run time.
+
+        :returns: Links that are due and the time until the next link is due.
+        """
+        now = time.monotonic()
+        due_links = []
+        rescheduled = []
+        with self._queue_lock:
+            while self._queue and self._queue[0][0] <= now:
+                _, _, job, link, due = heapq.heappop(self._queue)
+                if link.job is not job:  # link was unscheduled
+                    continue
+
+                due_links.append(link)
+                interval = link.interval.total_seconds()
+                due += interval
+                if due < now and interval > 0:
+                    due += ((now - due) // interval + 1) * interval
+                rescheduled.append(self._queue_entry(due, job, link))
+                job.last_run = datetime.datetime.now()
+                job.next_run = job.last_run + datetime.timedelta(seconds=due - now)
+
+            for entry in rescheduled:
+                heapq.heappush(self._queue, entry)
+
+            timeout = self._queue[0][0] - now if self._queue else None
+
+        return due_links, timeout
 
     def _unschedule(self, link):
         """
@@ -163,7 +229,7 @@ class SchedulePlanner(BasePlanner):
             self._create_thread_pool()
 
         while self._running:
-            schedule.run_pending()
+            self._wakeup.clear()
 
             # handle exceptions raised by threads
             if len(self._exc_info) > 0:
@@ -173,9 +239,15 @@ class SchedulePlanner(BasePlanner):
 
                     self._exc_info = []
 
-            # TODO: adjust interval to avoid drift - look how APS does it in BlockingScheduler
-            time.sleep(self._refresh_interval)
+            if not self._running:
+                break
+
+            due_links, timeout = self._pop_due()
+            for link in due_links:
+                self._run_job(link)
 
+            if timeout is None or timeout > 0:
+                self._wakeup.wait(timeout)
 
     def shutdown(self, wait: bool = True):
         """
@@ -191,6 +263,7 @@ class SchedulePlanner(BasePlanner):
 
     def _shutdown_planner(self, wait: bool = True):
         self._running = False
+        self._wakeup.set()
         self._destroy_thread_pool(wait=wait)
 
     @property
@@ -204,5 +277,4 @@ class SchedulePlanner(BasePlanner):
         return self._running
 
     def __repr__(self):
-        return 'SchedulePlanner(threads:%s, refresh_interval:%s)' \
-               % (self._threads, self.refresh_interval)
+        return 'SchedulePlanner(threads:%s)' % (self._threads)
@@ -0,0 +1,296 @@
+"""
+.. seealso::
+    * :ref:`Scheduling <scheduling>` to learn more about scheduling in Databay.
+    * :any:`BasePlanner` for the remaining interface of this planner.
+"""
+
+import logging
+import sys
+import threading
+import time
+from concurrent import futures
+from typing import List, Union
+
+from databay.base_planner import BasePlanner
+from databay import Link
+
+_LOGGER = logging.getLogger('databay.TimerWheelPlanner')
+
+
+class TimerWheelJob():
+    """
+    Job of a link scheduled by the :any:`TimerWheelPlanner`, stored in one of the slots of the timer wheel.
+    """
+
+    def __init__(self, link: Link):
+        """
+        :type link: :any:`Link`
+        :param link: Link this job is executing.
+        """
+        self.link = link
+        self.due = None
+        self.expires = None
+        self.slot = None
+
+    def __repr__(self):
+        return 'TimerWheelJob(link:%s, expires:%s)' % (self.link, self.expires)
+
+
+class TimerWheelPlanner(BasePlanner):
+    """
+    Planner scheduling links using a hierarchical timer wheel, designed for very large numbers of links. Scheduling sets a :any:`TimerWheelJob` as links' job.
+
+    Time is divided into ticks of fixed length. The wheel consists of multiple levels of slots, each level covering a range of ticks :code:`wheel_size` times larger than the previous one. Links are stored in the slot corresponding to the tick they are due at and are moved to lower levels as that tick approaches. Scheduling, unscheduling and processing a tick therefore take constant time regardless of the number of links, while link intervals are rounded to whole ticks.
+    """
+
+    def __init__(self,
+                 links: Union[Link, List[Link]] = None,
+                 threads: int = 30,
+                 tick: float = 0.01,
+                 wheel_size: int = 256,
+                 levels: int = 4,
+                 ignore_exceptions: bool = False,
+                 immediate_transfer: bool = True,
+                 shutdown_at_exit: bool = False,
+                 persistent_event_loops: bool = False,
+                 phase_spread: bool = False,
+                 jitter: float = 0,
+                 max_transfers: int = None):
+        """
+        :type links: :any:`Link` or list[:any:`Link`]
+        :param links: Links that should be added and scheduled.
+            |default| :code:`None`
+
+        :type threads: int
+        :param threads: Number of threads to execute transfers on.
+            |default| :code:`30`
+
+        :type tick: float
+        :param tick: Length of one tick in seconds. Link intervals are rounded to whole ticks.
+            |default| :code:`0.01`
+
+        :type wheel_size: int
+        :param wheel_size: Number of slots on each level of the wheel.
+            |default| :code:`256`
+
+        :type levels: int
+        :param levels: Number of levels of the wheel. Intervals longer than :code:`tick * wheel_size ** levels` are supported, but links with such intervals are moved around the wheel more often.
+            |default| :code:`4`
+
+        :type ignore_exceptions: bool
+        :param ignore_exceptions: Whether exceptions should be ignored or halt the planner.
+            |default| :code:`False`
+
+        :type immediate_transfer: :class:`bool`
+        :param immediate_transfer: Whether planner should execute one transfer immediately upon starting. |default| :code:`True`
+
+        :type shutdown_at_exit: bool
+        :param shutdown_at_exit: Whether this planner should attempt to gracefully shutdown if the app exists unexpectedly.
+            |default| :code:`False`
+
+        :type persistent_event_loops: bool
+        :param persistent_event_loops: Whether each of the worker threads should reuse one long-lived event loop for all transfers it executes. |default| :code:`False`
+
+        :type phase_spread: bool
+        :param phase_spread: Whether the first scheduled runs of links sharing the same interval should be spread evenly across that interval. |default| :code:`False`
+
+        :type jitter: float
+        :param jitter: Maximum random delay in seconds added to each scheduled run of a link. |default| :code:`0`
+
+        :type max_transfers: int
+        :param max_transfers: Maximum number of transfers allowed to execute concurrently across all links, as measured by their :any:`Link.weight`. Waiting transfers are started in order of their link's :any:`Link.priority`. |default| :code:`None`
+        """
+        self._threads = threads
+        self._tick = tick
+        self._wheel_size = wheel_size
+        self._levels = levels
+        self._wheels = [[{} for _ in range(wheel_size)] for _ in range(levels)]
+        self._max_ticks = wheel_size ** levels - 1
+        self._current_tick = 0
+        self._origin = None
+        self._wheel_lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+        self._running = False
+        self._thread_pool = None
+        self._exc_info = []
+        self._exc_lock = threading.Lock()
+
+        super().__init__(links=links, ignore_exceptions=ignore_exceptions, immediate_transfer=immediate_transfer, shutdown_at_exit=shutdown_at_exit, persistent_event_loops=persistent_event_loops, phase_spread=phase_spread, jitter=jitter, max_transfers=max_transfers)
+
+    @property
+    def tick(self) -> float:
+        """
+        Length of one tick in seconds.
+
+        :rtype: float
+        """
+        return self._tick
+
+    def _interval_ticks(self, link: Link) -> int:
+        return max(1, round(link.interval.total_seconds() / self._tick))
+
+    def _set_due(self, job: TimerWheelJob, due: int):
+        """
+        Set the tick the job is due at, and the tick it expires at after applying the jitter.
+        """
+        job.due = due
+        job.expires = max(due + round(self._get_jitter() / self._tick), self._current_tick + 1)
+
+    def _insert(self, job: TimerWheelJob):
+        """
+        Store the job in the slot of the lowest level covering its expiry tick. Must be called while holding the wheel lock.
+        """
+        delta = min(job.expires - self._current_tick, self._max_ticks)
+        expires = self._current_tick + delta
+
+        level = 0
+        while delta >= self._wheel_size ** (level + 1):
+            level += 1
+
+        slot = self._wheels[level][(expires // self._wheel_size ** level) % self._wheel_size]
+        slot[job] = None
+        job.slot = slot
+
+    def _advance(self) -> List[TimerWheelJob]:
+        """
+        Advance the wheel by one tick, cascading jobs from higher levels whose range is reached and returning the jobs due at the new tick. Must be called while holding the wheel lock.
+        """
+        self._current_tick += 1
+        tick = self._current_tick
+
+        for level in range(1, self._levels):
+            if tick % self._wheel_size ** level != 0:
+                break
+
+            slot = self._wheels[level][(tick // self._wheel_size ** level) % self._wheel_size]
+            jobs = list(slot)
+            slot.clear()
+            for job in jobs:
+                self._insert(job)
+
+        slot = self._wheels[0][tick % self._wheel_size]
+        jobs = list(slot)
+        slot.clear()
+
+        due = []
+        for job in jobs:
+            if job.expires <= tick:
+                due.append(job)
+                interval = self._interval_ticks(job.link)
+                next_due = job.due + interval
+                if next_due <= tick:
+                    next_due += ((tick - next_due) // interval + 1) * interval
+                self._set_due(job, next_due)
+            # jobs with expiry beyond the wheel's range are reinserted until they're due
+            self._insert(job)
+        return due
+
+    def _schedule(self, link: Link):
+        """
+        Schedule a link. Sets :any:`TimerWheelJob` as this link's job.
+
+        :type link: :any:`Link`
+        :param link: Link to be scheduled
+        """
+        job = TimerWheelJob(link)
+        with self._wheel_lock:
+            self._set_due(job, self._current_tick + max(1, round(self._start_offset(link) / self._tick)))
+            self._insert(job)
+        link.set_job(job)
+
+    def _unschedule(self, link: Link):
+        """
+        Unschedule a link.
+
+        :type link: :any:`Link`
+        :param link: Link to be unscheduled
+        """
+        job = link.job
+        if job is None:
+            return
+
+        with self._wheel_lock:
+            if job.slot is not None:
+                job.slot.pop(job, None)
+                job.slot = None
+        link.set_job(None)
+
+    def _try_job(self, link: Link):
+        try:
+            self._transfer(link)
+        except:
+            with self._exc_lock:
+                self._exc_info.append((sys.exc_info(), link))
+            self._wakeup.set()
+
+    def _run_job(self, link: Link):
+        thread_pool = self._thread_pool
+        if thread_pool is None:
+            return
+
+        try:
+            thread_pool.submit(self._try_job, link)
+        except RuntimeError:  # pragma: no cover
+            # thread pool was shut down in the meantime
+            pass
+
+    def _handle_exceptions(self):
+        if len(self._exc_info) > 0:
+            with self._exc_lock:
+                exc_info = self._exc_info
+                self._exc_info = []
+
+            for (_, exception, _), link in exc_info:
+                self._on_exception(exception, link)
+
+    def _start_planner(self):
+        if self._running:  # pragma: no cover
+            return
+        self._running = True
+
+        if self._thread_pool is None:
+            self._thread_pool = futures.ThreadPoolExecutor(max_workers=self._threads)
+
+        # continue from the current tick, in case the planner was started before
+        self._origin = time.monotonic() - self._current_tick * self._tick
+
+        while self._running:
+            self._wakeup.clear()
+            self._handle_exceptions()
+            if not self._running:
+                break
+
+            target_tick = int((time.monotonic() - self._origin) / self._tick)
+            due = {}
+            with self._wheel_lock:
+                while self._current_tick < target_tick:
+                    # a link due multiple times while catching up is run only once
+                    due.update(dict.fromkeys(self._advance()))
+
+            for job in due:
+                if job.link.job is job:
+                    self._run_job(job.link)
+
+            next_tick_at = self._origin + (self._current_tick + 1) * self._tick
+            self._wakeup.wait(max(next_tick_at - time.monotonic(), 0))
+
+    def _shutdown_planner(self, wait: bool = True):
+        self._running = False
+        self._wakeup.set()
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait)
+            self._thread_pool = None
+
+    @property
+    def running(self):
+        """
+        Whether this planner is currently running. Changed by calls to :any:`start` and :any:`shutdown`.
+
+        :return: State of this planner
+        :rtype: bool
+        """
+        return self._running
+
+    def __repr__(self):
+        return 'TimerWheelPlanner(threads:%s, tick:%s)' % (self._threads, self._tick)
@@ -1,3 +1,5 @@
+import copy
+
 
 class Record():
     """
@@ -37,9 +39,229 @@ class Record():
 
         return self._metadata
 
+    def copy_on_write(self) -> 'Record':
+        """
+        Create a copy of this record that shares its payload and metadata with this record until they are modified. See :any:`copy_on_write`.
+
+        :returns: Copy-on-write copy of this record.
+        :rtype: :any:`Record`
+        """
+
+        record = copy.copy(self)
+        record._payload = copy_on_write(self._payload)
+        record._metadata = copy_on_write(self._metadata)
+        return record
+
     def __repr__(self):
         """
         :returns: Record(payload=%s, metadata=%s)
         """
 
         return ('Record(payload=%s, metadata=%s)' % (self.payload, self.metadata))
+
+
+
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None), range)
+
+
+def copy_on_write(value):
+    """
+    Create a copy of the value provided that shares its underlying data with the original until it is accessed.
+
+    * :any:`dict` and :any:`list` are copied one level at a time. Copying a container only copies the references it holds, while the containers nested within it are copied in the same manner once they are first accessed. Containers that are never reached aren't copied at all.
+    * :any:`Record` is copied using :any:`Record.copy_on_write`.
+    * Immutable values are returned as they are.
+    * Any other value is copied using :any:`copy.deepcopy`.
+
+    Modifying the returned value never modifies the original, as long as the original is not modified while the copy is in use, and the nested values are reached through the methods of the copied containers: indexing, slicing, iteration and the other :any:`dict` and :any:`list` methods, concatenation and repetition, and the operators and functions built on them - such as :code:`{**value}`, :code:`|`, :any:`list`, :any:`sorted` or :any:`copy.copy`. Functions reading the storage of a :any:`list` directly bypass these methods and reach the shared values of the original - notably the :any:`heapq` functions and assigning the copy to a slice of another list. Convert the copy with :code:`list(value)` before passing it to them.
+
+    :type value: Any
+    :param value: Value to copy.
+
+    :returns: Copy-on-write copy of the value.
+    """
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    elif isinstance(value, Record):
+        return value.copy_on_write()
+    elif type(value) in (dict, _CowDict):
+        return _CowDict(value)
+    elif type(value) in (list, _CowList):
+        return _CowList(value)
+    else:
+        return copy.deepcopy(value)
+
+
+class _CowDict(dict):
+    """
+    :any:`dict` holding references to the values of another dict, copying them with :any:`copy_on_write` when they are first accessed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._owned = set()  # keys of values that were already copied or assigned to this dict
+
+    def _get_owned(self, key):
+        value = dict.__getitem__(self, key)
+        if key not in self._owned:
+            value = copy_on_write(value)
+            dict.__setitem__(self, key, value)
+            self._owned.add(key)
+        return value
+
+    def __getitem__(self, key):
+        return self._get_owned(key)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._owned.add(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._owned.discard(key)
+
+    def __iter__(self):
+        # overriding __iter__ makes dict(self) and {**self} read the values through __getitem__
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        return self._get_owned(key) if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self._get_owned(key)
+        self[key] = default
+        return default
+
+    def pop(self, key, *args):
+        if key not in self:
+            return dict.pop(self, key, *args)
+        value = self._get_owned(key)
+        del self[key]
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        if key not in self._owned:
+            value = copy_on_write(value)
+        self._owned.discard(key)
+        return key, value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        dict.clear(self)
+        self._owned.clear()
+
+    def values(self):
+        return [self._get_owned(key) for key in dict.keys(self)]
+
+    def items(self):
+        return [(key, self._get_owned(key)) for key in dict.keys(self)]
+
+    def copy(self):
+        # values are shared without being accessed, the copy wraps them again once they are read
+        return _CowDict(dict.items(self))
+
+    __copy__ = copy
+
+    def __reduce__(self):
+        return dict, (dict(dict.items(self)),)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(dict.items(self)), memo)
+
+
+class _CowList(list):
+    """
+    :any:`list` holding references to the items of another list, copying them with :any:`copy_on_write` when they are first accessed.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._owned = set()  # ids of items that were already copied or assigned to this list
+
+    def _own(self, value):
+        if not isinstance(value, _IMMUTABLE_TYPES):
+            self._owned.add(id(value))
+        return value
+
+    def _owned_copy(self, value):
+        if id(value) in self._owned:
+            return value
+        return self._own(copy_on_write(value))
+
+    def _get_owned(self, index):
+        value = list.__getitem__(self, index)
+        owned = self._owned_copy(value)
+        if owned is not value:
+            list.__setitem__(self, index, owned)
+        return owned
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return _CowList(list.__getitem__(self, index))
+        return self._get_owned(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            for item in value:
+                self._own(item)
+        else:
+            self._own(value)
+        list.__setitem__(self, index, value)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._get_owned(index)
+
+    def __reversed__(self):
+        for index in range(len(self) - 1, -1, -1):
+            yield self._get_owned(index)
+
+    def __add__(self, other):
+        return _CowList(list.__add__(self, other))
+
+    def __radd__(self, other):
+        # called instead of list.__add__ of the left operand, which would read the shared items directly
+        if not isinstance(other, list):
+            return NotImplemented
+        result = _CowList()
+        result.extend(other)
+        list.extend(result, list.copy(self))
+        return result
+
+    def __mul__(self, other):
+        return _CowList(list.__mul__(self, other))
+
+    __rmul__ = __mul__
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def append(self, value):
+        list.append(self, self._own(value))
+
+    def insert(self, index, value):
+        list.insert(self, index, self._own(value))
+
+    def extend(self, values):
+        list.extend(self, [self._own(value) for value in values])
+
+    def pop(self, index=-1):
+        return self._owned_copy(list.pop(self, index))
+
+    def copy(self):
+        return _CowList(list.copy(self))
+
+    __copy__ = copy
+
+    def __reduce__(self):
+        return list, (list.copy(self),)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list.copy(self), memo)
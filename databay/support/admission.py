@@ -0,0 +1,264 @@
+"""
+.. seealso::
+    * :ref:`Scheduling <scheduling>` to learn more about limiting concurrent transfers.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+_LOGGER = logging.getLogger('databay.AdmissionController')
+
+
+class _Waiter():
+    def __init__(self, weight: int):
+        self.weight = weight
+        self.granted = False
+        self.cancelled = False
+        self.event = None
+        self.future = None
+        self.loop = None
+
+    def grant(self):
+        self.granted = True
+        if self.future is not None:
+            self.loop.call_soon_threadsafe(self._resolve)
+        else:
+            self.event.set()
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdmissionController():
+    """
+    Limits the number of transfers executing concurrently across all links of a planner. Each transfer takes up a number of slots equal to its link's :any:`Link.weight`. When all slots are taken, further transfers wait and are admitted in order of their link's :any:`Link.priority` - higher priority first, and in order of arrival within the same priority.
+
+    Admission is strictly ordered: a waiting transfer holds back the transfers of lower priority until enough slots are freed for it, therefore heavy transfers are never starved by lighter ones.
+
+    Usable both from threads with :any:`acquire` and from coroutines with :any:`acquire_async`.
+    """
+
+    def __init__(self, limit: int):
+        """
+        :type limit: int
+        :param limit: Number of slots available to transfers executing concurrently.
+        """
+        if limit < 1:
+            raise ValueError(f'Admission limit must be at least 1, got: {limit}')
+
+        self._limit = limit
+        self._in_use = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+        self._admitted = 0
+        self._deferred = 0
+        self._total_delay = 0.0
+        self._max_delay = 0.0
+
+    @property
+    def limit(self) -> int:
+        """
+        Number of slots available to transfers executing concurrently.
+
+        :rtype: int
+        """
+        return self._limit
+
+    @property
+    def in_use(self) -> int:
+        """
+        Number of slots currently taken by executing transfers.
+
+        :rtype: int
+        """
+        return self._in_use
+
+    @property
+    def waiting(self) -> int:
+        """
+        Number of transfers currently waiting to be admitted.
+
+        :rtype: int
+        """
+        return sum(1 for *_, waiter in self._waiters if not waiter.cancelled)
+
+    @property
+    def admitted(self) -> int:
+        """
+        Number of transfers admitted so far.
+
+        :rtype: int
+        """
+        return self._admitted
+
+    @property
+    def deferred(self) -> int:
+        """
+        Number of transfers admitted so far that had to wait for a slot.
+
+        :rtype: int
+        """
+        return self._deferred
+
+    @property
+    def total_delay(self) -> float:
+        """
+        Total time in seconds admitted transfers spent waiting for a slot.
+
+        :rtype: float
+        """
+        return self._total_delay
+
+    @property
+    def max_delay(self) -> float:
+        """
+        Longest time in seconds a transfer spent waiting for a slot.
+
+        :rtype: float
+        """
+        return self._max_delay
+
+    @property
+    def mean_delay(self) -> float:
+        """
+        Average time in seconds admitted transfers spent waiting for a slot, including the ones admitted straight away.
+
+        :rtype: float
+        """
+        if self._admitted == 0:
+            return 0.0
+        return self._total_delay / self._admitted
+
+    def _clamp(self, weight: int) -> int:
+        # a transfer heavier than the limit could never be admitted
+        return min(max(weight, 1), self._limit)
+
+    def _try_admit(self, priority: int, weight: int) -> _Waiter:
+        """
+        Admit the transfer straight away if there is room and nobody is waiting, otherwise enqueue a waiter. Must be called while holding the lock.
+        """
+        waiter = _Waiter(weight)
+        if not self._waiters and self._in_use + weight <= self._limit:
+            self._in_use += weight
+            waiter.granted = True
+        else:
+            heapq.heappush(self._waiters, (-priority, next(self._sequence), waiter))
+        return waiter
+
+    def _dispatch(self):
+        """
+        Admit the waiting transfers that fit into the free slots, in order of priority. Must be called while holding the lock.
+        """
+        while self._waiters:
+            waiter = self._waiters[0][-1]
+            if waiter.cancelled:
+                heapq.heappop(self._waiters)
+                continue
+            if self._in_use + waiter.weight > self._limit:
+                break
+            heapq.heappop(self._waiters)
+            self._in_use += waiter.weight
+            waiter.grant()
+
+    def _record_delay(self, delay: float):
+        with self._lock:
+            self._admitted += 1
+            self._total_delay += delay
+            if delay > 0:
+                self._deferred += 1
+                self._max_delay = max(self._max_delay, delay)
+
+    def acquire(self, priority: int = 0, weight: int = 1) -> float:
+        """
+        Block until the transfer is admitted.
+
+        :type priority: int
+        :param priority: Priority of the transfer, higher is admitted first.
+            |default| :code:`0`
+
+        :type weight: int
+        :param weight: Number of slots the transfer takes up.
+            |default| :code:`1`
+
+        :returns: Time in seconds spent waiting for a slot.
+        """
+        weight = self._clamp(weight)
+        start = time.monotonic()
+        with self._lock:
+            waiter = self._try_admit(priority, weight)
+            if not waiter.granted:
+                waiter.event = threading.Event()
+
+        if waiter.event is not None:
+            waiter.event.wait()
+            delay = time.monotonic() - start
+            _LOGGER.debug(f'Transfer admitted after waiting {delay:.3f}s')
+        else:
+            delay = 0.0
+
+        self._record_delay(delay)
+        return delay
+
+    async def acquire_async(self, priority: int = 0, weight: int = 1) -> float:
+        """
+        Wait until the transfer is admitted. Same as :any:`acquire`, without blocking the event loop.
+
+        :type priority: int
+        :param priority: Priority of the transfer, higher is admitted first.
+            |default| :code:`0`
+
+        :type weight: int
+        :param weight: Number of slots the transfer takes up.
+            |default| :code:`1`
+
+        :returns: Time in seconds spent waiting for a slot.
+        """
+        weight = self._clamp(weight)
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiter = self._try_admit(priority, weight)
+            if not waiter.granted:
+                waiter.loop = loop
+                waiter.future = loop.create_future()
+
+        if waiter.future is not None:
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                with self._lock:
+                    waiter.cancelled = True
+                    granted = waiter.granted
+                if granted:
+                    # slot was granted in the meantime, pass it on
+                    self.release(weight)
+                raise
+            delay = time.monotonic() - start
+            _LOGGER.debug(f'Transfer admitted after waiting {delay:.3f}s')
+        else:
+            delay = 0.0
+
+        self._record_delay(delay)
+        return delay
+
+    def release(self, weight: int = 1):
+        """
+        Free the slots taken by a transfer that finished, admitting the waiting transfers that fit into them.
+
+        :type weight: int
+        :param weight: Number of slots the transfer took up. Must match the weight it was admitted with.
+            |default| :code:`1`
+        """
+        with self._lock:
+            self._in_use -= self._clamp(weight)
+            self._dispatch()
+
+    def __repr__(self):
+        return 'AdmissionController(limit:%s, in_use:%s, waiting:%s)' % (self._limit, self._in_use, self.waiting)
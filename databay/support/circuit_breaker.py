@@ -0,0 +1,198 @@
+"""
+.. seealso::
+    * :ref:`Circuit breakers <circuit_breakers>` to learn more about skipping failing inlets and outlets.
+"""
+
+import threading
+import time
+from enum import Enum
+from typing import Tuple, Type, Union
+
+
+class CircuitState(Enum):
+    """Enum defining the states of a :any:`CircuitBreaker`."""
+
+    CLOSED: str = 'closed'
+    """Calls are allowed, consecutive failures are counted."""
+
+    OPEN: str = 'open'
+    """Calls are rejected until the probe interval elapses."""
+
+    HALF_OPEN: str = 'half_open'
+    """A single probe call is allowed at a time, deciding whether the circuit closes or opens again."""
+
+
+class CircuitBreaker():
+    """
+    Circuit breaker guarding calls to a failing inlet or outlet.
+
+    The circuit opens after :code:`failure_threshold` consecutive failures, rejecting calls straight away instead of letting each of them fail slowly. Once :code:`probe_interval` seconds pass, the circuit becomes half-open and lets a single probe call through - closing again after :code:`success_threshold` successful probes, or opening again if a probe fails.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 probe_interval: float = 30.0,
+                 success_threshold: int = 1,
+                 failure_on: Union[Type[Exception], Tuple[Type[Exception], ...]] = Exception):
+        """
+        :type failure_threshold: int
+        :param failure_threshold: Number of consecutive failures after which the circuit opens.
+            |default| :code:`5`
+
+        :type probe_interval: float
+        :param probe_interval: Number of seconds after which an open circuit lets a probe call through.
+            |default| :code:`30.0`
+
+        :type success_threshold: int
+        :param success_threshold: Number of consecutive successful probes after which a half-open circuit closes.
+            |default| :code:`1`
+
+        :type failure_on: Type[Exception] or tuple[Type[Exception]]
+        :param failure_on: Exception types counted as failures. Exceptions of other types are ignored by the circuit breaker.
+            |default| :code:`Exception`
+        """
+        if failure_threshold < 1:
+            raise ValueError(f'Failure threshold must be at least 1, got: {failure_threshold}')
+        if success_threshold < 1:
+            raise ValueError(f'Success threshold must be at least 1, got: {success_threshold}')
+
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.success_threshold = success_threshold
+        self.failure_on = failure_on
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._successes = 0
+        self._opened_at = 0.0
+        self._probe_started_at = None
+        self._rejected = 0
+
+    def copy(self) -> 'CircuitBreaker':
+        """
+        Create a closed circuit breaker with the same configuration.
+
+        :rtype: :any:`CircuitBreaker`
+        """
+        return CircuitBreaker(failure_threshold=self.failure_threshold,
+                              probe_interval=self.probe_interval,
+                              success_threshold=self.success_threshold,
+                              failure_on=self.failure_on)
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        Current state of the circuit. An open circuit is reported as half-open once the probe interval elapses.
+
+        :rtype: :any:`CircuitState`
+        """
+        with self._lock:
+            if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.probe_interval:
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    @property
+    def rejected(self) -> int:
+        """
+        Number of calls rejected while the circuit was open.
+
+        :rtype: int
+        """
+        return self._rejected
+
+    def allow_request(self) -> bool:
+        """
+        Whether a call should be made. Returning :code:`True` for a half-open circuit starts a probe, which needs to be followed by a call to :any:`record_success` or :any:`record_failure`.
+
+        :rtype: bool
+        """
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+
+            now = time.monotonic()
+            if self._state == CircuitState.OPEN:
+                if now - self._opened_at < self.probe_interval:
+                    self._rejected += 1
+                    return False
+                self._state = CircuitState.HALF_OPEN
+                self._successes = 0
+                self._probe_started_at = None
+
+            # probes that never reported back, such as cancelled ones, expire after the probe interval
+            if self._probe_started_at is not None and now - self._probe_started_at < self.probe_interval:
+                self._rejected += 1
+                return False
+
+            self._probe_started_at = now
+            return True
+
+    def record_success(self):
+        """
+        Record a successful call.
+        """
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._probe_started_at = None
+                self._successes += 1
+                if self._successes >= self.success_threshold:
+                    self._state = CircuitState.CLOSED
+                    self._failures = 0
+            else:
+                self._failures = 0
+
+    def record_failure(self, exception: Exception) -> bool:
+        """
+        Record a failed call.
+
+        :type exception: Exception
+        :param exception: Exception the call failed with. Ignored if it isn't one of the :code:`failure_on` types.
+
+        :returns: Whether the failure opened the circuit.
+        :rtype: bool
+        """
+        with self._lock:
+            if not isinstance(exception, self.failure_on):
+                if self._state == CircuitState.HALF_OPEN:
+                    self._probe_started_at = None
+                return False
+
+            if self._state == CircuitState.HALF_OPEN:
+                self._open()
+                return True
+
+            self._failures += 1
+            if self._state == CircuitState.CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+                return True
+            return False
+
+    def _open(self):
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_started_at = None
+        self._successes = 0
+
+    def reset(self):
+        """
+        Close the circuit, forgetting all failures.
+        """
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._successes = 0
+            self._probe_started_at = None
+
+    def __getstate__(self):
+        # Allows pulling and pushing within a ProcessPoolExecutor. The lock can't be pickled.
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'CircuitBreaker(state:%s, failure_threshold:%s, probe_interval:%s)' % (self.state.value, self.failure_threshold, self.probe_interval)
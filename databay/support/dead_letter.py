@@ -0,0 +1,344 @@
+"""
+.. seealso::
+    * :ref:`Dead-letter queue <dead_letter_queue>` to learn more about storing and replaying failed pushes.
+
+Can be run as a command line tool to inspect and replay dead-letter queues:
+
+.. code-block:: bash
+
+    python -m databay.support.dead_letter info ./dead_letters
+    python -m databay.support.dead_letter replay ./dead_letters --outlets my_app.outlets:create_outlets --rate 50
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterator, List, Tuple
+
+import databay as da
+from databay.support import segments
+
+_LOGGER = logging.getLogger('databay.DeadLetterQueue')
+
+_SUFFIX = 'dlq'
+
+
+def default_outlet_key(outlet: 'da.Outlet') -> str:
+    """
+    Identify outlets by their class name.
+
+    :type outlet: :any:`Outlet`
+    :param outlet: Outlet to identify.
+
+    :rtype: str
+    """
+    return type(outlet).__name__
+
+
+class DeadLetter():
+    """
+    Records of a failed push, as stored in the :any:`DeadLetterQueue`.
+    """
+
+    def __init__(self, outlet_key: str, tags: List[str], transfer_number: int, records: list, error: str, timestamp: float):
+        """
+        :type outlet_key: str
+        :param outlet_key: Key of the outlet the push failed for.
+
+        :type tags: List[str]
+        :param tags: Tags of the link that executed the push.
+
+        :type transfer_number: int
+        :param transfer_number: Number of the transfer that executed the push.
+
+        :type records: list[:any:`Record`]
+        :param records: Records that failed to be pushed.
+
+        :type error: str
+        :param error: Description of the exception the push failed with.
+
+        :type timestamp: float
+        :param timestamp: Time of the failure, in seconds since the epoch.
+        """
+        self.outlet_key = outlet_key
+        self.tags = tags
+        self.transfer_number = transfer_number
+        self.records = records
+        self.error = error
+        self.timestamp = timestamp
+
+    @property
+    def update(self) -> 'da.Update':
+        """
+        Update of the transfer that executed the push.
+
+        :rtype: :any:`Update`
+        """
+        return da.Update(tags=self.tags, transfer_number=self.transfer_number)
+
+    def __repr__(self):
+        return 'DeadLetter(outlet:%s, update:%s, records:%s)' % (self.outlet_key, self.update, len(self.records))
+
+
+class DeadLetterQueue():
+    """
+    Disk-backed store of records that outlets failed to push, allowing them to be replayed once the destination recovers. Provide it to a :any:`Link` using its :code:`dead_letter_queue` parameter.
+
+    Dead letters are appended to segment files in the directory provided. Each entry is stored as a zlib-compressed pickle prefixed with its length and CRC32 checksum, therefore an entry left incomplete by a crash is detected and skipped. See :any:`segments`. Records need to be picklable.
+
+    Outlets are identified by a key, by default their class name. Provide a custom :code:`outlet_key` function if a link has multiple outlets of the same class.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 segment_size: int = 64 * 1024 * 1024,
+                 fsync: bool = False,
+                 outlet_key: Callable[['da.Outlet'], str] = default_outlet_key):
+        """
+        :type directory: str
+        :param directory: Directory storing the segment files. Created if it doesn't exist.
+
+        :type segment_size: int
+        :param segment_size: Size in bytes after which a new segment file is started.
+            |default| :code:`67108864` (64 MiB)
+
+        :type fsync: bool
+        :param fsync: Whether each dead letter should be flushed to disk before the transfer continues, so that it survives a power loss.
+            |default| :code:`False`
+
+        :type outlet_key: :any:`callable`
+        :param outlet_key: Function returning the key identifying the outlet provided.
+            |default| :any:`default_outlet_key`
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self.outlet_key = outlet_key
+
+        self._lock = threading.Lock()
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+        self._segment_index = max(self._segment_indices(), default=-1) + 1
+
+    def _segment_indices(self) -> List[int]:
+        return segments.segment_indices(self.directory, _SUFFIX)
+
+    def _segment_path(self, index: int) -> str:
+        return segments.segment_path(self.directory, index, _SUFFIX)
+
+    def _roll(self):
+        """
+        Close the current segment, so that the following dead letters are written to a new one. Must be called while holding the lock.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._segment_index += 1
+
+    def _write(self, entry: dict):
+        data = segments.encode_entry(entry)
+        with self._lock:
+            if self._file is not None and self._file.tell() >= self.segment_size:
+                self._roll()
+
+            if self._file is None:
+                self._file = segments.open_segment(self._segment_path(self._segment_index))
+
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def put(self, update: 'da.Update', outlet: 'da.Outlet', records: list, exception: Exception = None):
+        """
+        Store the records that failed to be pushed to the outlet provided.
+
+        :type update: :any:`Update`
+        :param update: Update of the transfer that executed the push.
+
+        :type outlet: :any:`Outlet`
+        :param outlet: Outlet the push failed for.
+
+        :type records: list[:any:`Record`]
+        :param records: Records that failed to be pushed.
+
+        :type exception: Exception
+        :param exception: Exception the push failed with.
+            |default| :code:`None`
+        """
+        self._put_entry(self.outlet_key(outlet), update.tags, update.transfer_number, records,
+                        repr(exception) if exception is not None else '', time.time())
+
+    def _put_entry(self, outlet_key: str, tags: List[str], transfer_number: int, records: list, error: str, timestamp: float):
+        self._write({
+            'outlet_key': outlet_key,
+            'tags': list(tags),
+            'transfer_number': transfer_number,
+            'records': list(records),
+            'error': error,
+            'timestamp': timestamp,
+        })
+
+    def _read_segment(self, path: str) -> Iterator[DeadLetter]:
+        with open(path, 'rb') as f:
+            if not segments.read_magic(f):
+                _LOGGER.warning(f'Skipping {path}: not a dead-letter segment')
+                return
+
+            while True:
+                try:
+                    entry = segments.read_entry(f)
+                except segments.CorruptEntryError as e:
+                    _LOGGER.warning(f'{e} in {path}, skipping the rest of the segment')
+                    return
+
+                if entry is None:
+                    return
+                yield DeadLetter(**entry)
+
+    def __iter__(self) -> Iterator[DeadLetter]:
+        """
+        Iterate over all stored dead letters, oldest first.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            indices = self._segment_indices()
+
+        for index in indices:
+            yield from self._read_segment(self._segment_path(index))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    async def replay_async(self, outlets: List['da.Outlet'], rate: float = None) -> Tuple[int, int]:
+        """
+        Push the stored dead letters to the outlets they failed for, oldest first. Dead letters pushed successfully are removed from the queue. Dead letters failing again - or whose outlet isn't provided - are stored again.
+
+        Outlets that aren't active are started before the replay and shut down once it completes, letting outlets pushing in the background - such as :any:`AsyncWriterOutlet` - write the replayed records before they are removed from the queue. Outlets already started, for instance by a running planner, are left running.
+
+        :type outlets: list[:any:`Outlet`]
+        :param outlets: Outlets to push the dead letters to, matched by their key.
+
+        :type rate: float
+        :param rate: Maximum number of dead letters pushed per second.
+            |default| :code:`None` (Unlimited)
+
+        :returns: Number of dead letters replayed and number of dead letters that failed again.
+        """
+        outlets_by_key = {self.outlet_key(outlet): outlet for outlet in outlets}
+
+        with self._lock:
+            # new dead letters, including the ones failing again, go to a new segment
+            self._roll()
+            indices = [index for index in self._segment_indices() if index < self._segment_index]
+
+        started = [outlet for outlet in outlets_by_key.values() if not outlet.active]
+        for outlet in started:
+            outlet.try_start()
+
+        replayed = 0
+        failed = 0
+        start = time.monotonic()
+        try:
+            for index in indices:
+                for dead_letter in self._read_segment(self._segment_path(index)):
+                    if rate is not None:
+                        delay = start + (replayed + failed) / rate - time.monotonic()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+
+                    outlet = outlets_by_key.get(dead_letter.outlet_key)
+                    try:
+                        if outlet is None:
+                            raise KeyError(f'No outlet provided for key: {dead_letter.outlet_key}')
+                        await outlet._push(dead_letter.records, dead_letter.update)
+                        replayed += 1
+                    except Exception as e:
+                        _LOGGER.warning(f'Replaying {dead_letter} failed: "{e}"')
+                        failed += 1
+                        self._put_entry(dead_letter.outlet_key, dead_letter.tags, dead_letter.transfer_number,
+                                        dead_letter.records, repr(e), dead_letter.timestamp)
+        finally:
+            for outlet in started:
+                outlet.try_shutdown()
+
+        # segments are removed only once the outlets finished writing, a replay interrupted before then is repeated
+        for index in indices:
+            os.remove(self._segment_path(index))
+
+        _LOGGER.info(f'Replayed {replayed} dead letters from {self.directory}, {failed} failed')
+        return replayed, failed
+
+    def replay(self, outlets: List['da.Outlet'], rate: float = None) -> Tuple[int, int]:
+        """
+        Synchronous version of :any:`replay_async`, running the replay on a new event loop.
+
+        :type outlets: list[:any:`Outlet`]
+        :param outlets: Outlets to push the dead letters to, matched by their key.
+
+        :type rate: float
+        :param rate: Maximum number of dead letters pushed per second.
+            |default| :code:`None` (Unlimited)
+
+        :returns: Number of dead letters replayed and number of dead letters that failed again.
+        """
+        return asyncio.run(self.replay_async(outlets, rate))
+
+    def close(self):
+        """
+        Close the segment file currently written to.
+        """
+        with self._lock:
+            self._roll()
+
+    def __repr__(self):
+        return 'DeadLetterQueue(directory:%s)' % self.directory
+
+
+def _load_outlets(path: str) -> List['da.Outlet']:
+    module_name, _, attribute = path.partition(':')
+    outlets = getattr(importlib.import_module(module_name), attribute)
+    if callable(outlets):
+        outlets = outlets()
+    return outlets if isinstance(outlets, list) else [outlets]
+
+
+def main(args: List[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m databay.support.dead_letter',
+                                     description='Inspect and replay Databay dead-letter queues.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    info_parser = subparsers.add_parser('info', help='Print the number of dead letters stored for each outlet.')
+    info_parser.add_argument('directory')
+
+    replay_parser = subparsers.add_parser('replay', help='Push the dead letters to their outlets.')
+    replay_parser.add_argument('directory')
+    replay_parser.add_argument('--outlets', required=True,
+                               help='Outlets to replay to, as "module:attribute". The attribute can be an outlet, a list of outlets or a callable returning either.')
+    replay_parser.add_argument('--rate', type=float, default=None, help='Maximum number of dead letters replayed per second.')
+
+    args = parser.parse_args(args)
+    queue = DeadLetterQueue(args.directory)
+
+    if args.command == 'info':
+        counts = {}
+        for dead_letter in queue:
+            counts[dead_letter.outlet_key] = counts.get(dead_letter.outlet_key, 0) + len(dead_letter.records)
+        for outlet_key, count in sorted(counts.items()):
+            print(f'{outlet_key}: {count} records')
+        print(f'Total: {sum(counts.values())} records')
+    else:
+        replayed, failed = queue.replay(_load_outlets(args.outlets), rate=args.rate)
+        print(f'Replayed: {replayed}, failed: {failed}')
+        queue.close()
+        return 1 if failed else 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
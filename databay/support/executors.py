@@ -0,0 +1,82 @@
+"""
+Executors shared by Databay's internals.
+"""
+
+import logging
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+_LOGGER = logging.getLogger('databay.TimeoutExecutor')
+
+_timeout_executor_lock = threading.Lock()
+
+
+class TimeoutExecutor(ThreadPoolExecutor):
+    """
+    Executor running the synchronous calls of one inlet or outlet that have a timeout but no executor of their own.
+
+    Calls exceeding their timeout are abandoned and keep running in this executor until they return, occupying one of its workers. Each inlet and outlet gets an executor of its own, therefore calls abandoned by a hung node only ever hold up further calls of that same node. Once all workers are taken up, further calls wait for a free worker and the wait counts towards their timeout - a warning is logged when this happens.
+    """
+
+    def __init__(self, owner, max_workers: int = None):
+        """
+        :type owner: :any:`Inlet` or :any:`Outlet`
+        :param owner: Node whose calls run in this executor, used for logging.
+
+        :type max_workers: int
+        :param max_workers: Maximum number of calls running at once.
+            |default| :code:`None` (Same as :any:`concurrent.futures.ThreadPoolExecutor`)
+        """
+        super().__init__(max_workers=max_workers, thread_name_prefix='databay_timeout')
+        self._owner_name = str(owner)
+        self._pending = 0
+        self._saturated = False
+        self._pending_lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of calls submitted that didn't return yet, including the calls that were abandoned.
+
+        :rtype: int
+        """
+        return self._pending
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        with self._pending_lock:
+            self._pending += 1
+            saturated = self._pending > self._max_workers
+            log = saturated and not self._saturated
+            self._saturated = saturated
+
+        if log:
+            _LOGGER.warning(f'All {self._max_workers} workers running synchronous calls of {self._owner_name} are busy, likely with calls abandoned after exceeding their timeout. Further calls wait for a free worker and the wait counts towards their timeout.')
+
+        future = super().submit(fn, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future):
+        with self._pending_lock:
+            self._pending -= 1
+            if self._pending <= self._max_workers:
+                self._saturated = False
+
+
+def timeout_executor(node) -> Executor:
+    """
+    Get the :any:`TimeoutExecutor` of the inlet or outlet provided, creating it on first use.
+
+    Unlike the event loop's default executor, this executor outlives the event loop of a transfer, therefore an abandoned call doesn't hold up the transfer from completing.
+
+    :type node: :any:`Inlet` or :any:`Outlet`
+    :param node: Node whose synchronous calls should run in the executor.
+
+    :rtype: :any:`TimeoutExecutor`
+    """
+    with _timeout_executor_lock:
+        executor = getattr(node, '_timeout_executor', None)
+        if executor is None:
+            executor = TimeoutExecutor(node)
+            node._timeout_executor = executor
+        return executor
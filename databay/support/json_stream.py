@@ -0,0 +1,232 @@
+"""
+Incremental decoders of JSON documents received in chunks, producing the decoded values as soon as they are complete. Only the undecoded remainder of the data is buffered, keeping memory use bounded by the size of the largest value rather than the whole document.
+"""
+
+import codecs
+import json
+import re
+from enum import Enum
+from typing import Any, List, Optional
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_SCALAR_END = re.compile(r'[ \t\n\r,\]]')
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
+
+class StreamFormat(Enum):
+    """Enum defining the formats of JSON documents that can be decoded incrementally."""
+
+    NDJSON: str = 'ndjson'
+    """Newline-delimited JSON, each line holding one value."""
+
+    JSON_ARRAY: str = 'json_array'
+    """Top-level JSON array, each of its elements being one value."""
+
+
+class NdjsonDecoder():
+    """
+    Incremental decoder of newline-delimited JSON.
+    """
+
+    def __init__(self):
+        self._buffer = b''
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Decode the values of all lines completed by the data provided.
+
+        :type data: bytes
+        :param data: Next chunk of the document.
+
+        :returns: Values decoded.
+        :rtype: list
+        """
+        lines = (self._buffer + data).split(b'\n')
+        self._buffer = lines.pop()
+        return [json.loads(line) for line in lines if line.strip()]
+
+    def close(self) -> List[Any]:
+        """
+        Decode the last line, if not terminated by a newline.
+
+        :returns: Values decoded.
+        :rtype: list
+        """
+        line, self._buffer = self._buffer, b''
+        return [json.loads(line)] if line.strip() else []
+
+
+class JsonArrayDecoder():
+    """
+    Incremental decoder of a top-level JSON array, decoding its elements one by one.
+
+    Each chunk is scanned once, tracking the nesting depth and strings of the element being received. An element is decoded only once it is complete, therefore the cost of decoding stays linear in the size of the document regardless of how many chunks an element is split into.
+    """
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._started = False
+        self._finished = False
+        self._after_value = False
+
+        # element being received and the state of scanning it
+        self._receiving = False
+        self._element = []
+        self._scalar = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Decode all elements completed by the data provided.
+
+        :type data: bytes
+        :param data: Next chunk of the document.
+
+        :returns: Values decoded.
+        :rtype: list
+
+        :raises ValueError: If the document is not a valid JSON array.
+        """
+        return self._decode(self._text.decode(data), final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Decode the remaining elements, verifying that the array is complete. An empty document is treated as an empty array.
+
+        :returns: Values decoded.
+        :rtype: list
+
+        :raises ValueError: If the document is not a valid and complete JSON array.
+        """
+        values = self._decode(self._text.decode(b'', final=True), final=True)
+        if self._started and not self._finished:
+            raise ValueError('JSON array is incomplete')
+        return values
+
+    def _decode(self, text: str, final: bool) -> List[Any]:
+        values = []
+        position = 0
+        while True:
+            if self._receiving:
+                end = self._scan(text, position)
+                if end is None:
+                    self._element.append(text[position:])
+                    break
+                self._element.append(text[position:end])
+                values.append(self._decode_element())
+                position = end
+                continue
+
+            position = _WHITESPACE.match(text, position).end()
+            if position == len(text):
+                break
+
+            char = text[position]
+            if not self._started:
+                if char != '[':
+                    raise ValueError('Document is not a JSON array')
+                self._started = True
+                position += 1
+                continue
+
+            if self._finished:
+                raise ValueError('Extra data after the JSON array')
+
+            if char == ']':
+                self._finished = True
+                position += 1
+                continue
+
+            if self._after_value:
+                if char != ',':
+                    raise ValueError(f'Expecting \',\' delimiter in JSON array, got: {char!r}')
+                self._after_value = False
+                position += 1
+                continue
+
+            self._receiving = True
+            self._scalar = char not in '[{"'
+
+        if final and self._receiving:
+            # the end of the document ends a scalar, while an incomplete container fails to decode
+            values.append(self._decode_element())
+        return values
+
+    def _scan(self, text: str, position: int) -> Optional[int]:
+        """
+        Scan the text for the end of the element being received, carrying on from the state left by the previous chunk.
+
+        :returns: Index just past the end of the element, or :code:`None` if it doesn't end within the text.
+        """
+        if self._scalar:
+            match = _SCALAR_END.search(text, position)
+            return match.start() if match is not None else None
+
+        while True:
+            if self._in_string:
+                if self._escape:
+                    if position == len(text):
+                        return None
+                    position += 1
+                    self._escape = False
+
+                position = _STRING_BODY.match(text, position).end()
+                if position == len(text):
+                    return None
+                if text[position] == '\\':
+                    # escape split across chunks
+                    self._escape = True
+                    return None
+                position += 1
+                self._in_string = False
+                if self._depth == 0:
+                    return position
+                continue
+
+            match = _STRUCTURE.search(text, position)
+            if match is None:
+                return None
+            position = match.end()
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char in '[{':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return position
+
+    def _decode_element(self) -> Any:
+        text = ''.join(self._element)
+        self._receiving = False
+        self._element = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._after_value = True
+
+        value, end = self._decoder.raw_decode(text)
+        if end < len(text):
+            raise ValueError(f'Expecting \',\' delimiter in JSON array, got: {text[end]!r}')
+        return value
+
+
+def create_decoder(stream_format: StreamFormat):
+    """
+    Create a decoder of the format provided.
+
+    :type stream_format: :any:`StreamFormat`
+    :param stream_format: Format of the document.
+
+    :rtype: :any:`NdjsonDecoder` or :any:`JsonArrayDecoder`
+    """
+    if stream_format == StreamFormat.NDJSON:
+        return NdjsonDecoder()
+    elif stream_format == StreamFormat.JSON_ARRAY:
+        return JsonArrayDecoder()
+    raise ValueError(f'Unsupported stream format: {stream_format}')
@@ -0,0 +1,82 @@
+"""
+.. seealso::
+    * :any:`MultiHttpInlet` limiting the rate of requests to each host.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket():
+    """
+    Token bucket rate limiter. Tokens are added at a constant rate up to the capacity of the bucket, and each acquisition takes tokens out - waiting for them to be added if the bucket is empty.
+
+    Acquisitions reserve their tokens straight away, therefore waiting callers are served in order. The bucket isn't bound to any event loop or thread.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        :type rate: float
+        :param rate: Number of tokens added per second.
+
+        :type capacity: float
+        :param capacity: Maximum number of tokens the bucket holds, allowing bursts of up to that many acquisitions.
+            |default| :code:`1`
+        """
+        if rate <= 0:
+            raise ValueError(f'Rate must be positive, got: {rate}')
+        if capacity < 1:
+            raise ValueError(f'Capacity must be at least 1, got: {capacity}')
+
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take the tokens out of the bucket, returning how long the caller needs to wait before they are available.
+
+        :type tokens: float
+        :param tokens: Number of tokens to take.
+            |default| :code:`1`
+
+        :returns: Number of seconds to wait.
+        :rtype: float
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1):
+        """
+        Take the tokens out of the bucket, blocking until they are available.
+
+        :type tokens: float
+        :param tokens: Number of tokens to take.
+            |default| :code:`1`
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1):
+        """
+        Take the tokens out of the bucket, waiting until they are available without blocking the event loop.
+
+        :type tokens: float
+        :param tokens: Number of tokens to take.
+            |default| :code:`1`
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def __repr__(self):
+        return 'TokenBucket(rate:%s, capacity:%s)' % (self.rate, self.capacity)
@@ -0,0 +1,73 @@
+"""
+.. seealso::
+    * :ref:`Retrying pushes <retrying_pushes>` to learn more about retrying failed pushes.
+"""
+
+import random
+from typing import Tuple, Type, Union
+
+
+class RetryPolicy():
+    """
+    Policy deciding whether and when a failed push should be retried.
+
+    Retries are delayed using exponential backoff with full jitter - the delay before the :code:`n`-th retry is chosen at random between zero and :code:`min(cap, base * 2 ** (n - 1))` seconds. Randomising the whole delay prevents multiple failing outlets and links from retrying in lockstep and overwhelming a recovering destination.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 base: float = 0.1,
+                 cap: float = 10,
+                 retry_on: Union[Type[Exception], Tuple[Type[Exception], ...]] = Exception):
+        """
+        :type max_attempts: int
+        :param max_attempts: Maximum number of attempts, including the first one.
+            |default| :code:`3`
+
+        :type base: float
+        :param base: Maximum delay in seconds before the first retry, doubled with each following retry.
+            |default| :code:`0.1`
+
+        :type cap: float
+        :param cap: Upper bound in seconds of the delay before any retry.
+            |default| :code:`10`
+
+        :type retry_on: Type[Exception] or tuple[Type[Exception]]
+        :param retry_on: Exception types considered transient. Exceptions of other types are raised straight away. Note that retrying a synchronous push that exceeded its timeout - raising :any:`TransferTimeoutError` - may run it concurrently with the abandoned attempt, which keeps running in the background.
+            |default| :code:`Exception`
+        """
+        if max_attempts < 1:
+            raise ValueError(f'Retry policy needs to allow at least 1 attempt, got: {max_attempts}')
+
+        self.max_attempts = max_attempts
+        self.base = base
+        self.cap = cap
+        self.retry_on = retry_on
+
+    def should_retry(self, exception: Exception, attempt: int) -> bool:
+        """
+        Whether the attempt that failed with the exception provided should be retried.
+
+        :type exception: Exception
+        :param exception: Exception the attempt failed with.
+
+        :type attempt: int
+        :param attempt: Number of the attempt that failed, starting at 1.
+
+        :rtype: bool
+        """
+        return attempt < self.max_attempts and isinstance(exception, self.retry_on)
+
+    def delay(self, attempt: int) -> float:
+        """
+        Number of seconds to wait before retrying the attempt provided.
+
+        :type attempt: int
+        :param attempt: Number of the attempt that failed, starting at 1.
+
+        :rtype: float
+        """
+        return random.uniform(0, min(self.cap, self.base * 2 ** (attempt - 1)))
+
+    def __repr__(self):
+        return 'RetryPolicy(max_attempts:%s, base:%s, cap:%s)' % (self.max_attempts, self.base, self.cap)
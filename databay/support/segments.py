@@ -0,0 +1,79 @@
+"""
+Append-only segment files shared by the :any:`DeadLetterQueue` and the :any:`WalOutlet`.
+
+Each segment file starts with a magic header, followed by entries. Each entry is a zlib-compressed pickle prefixed with its length and CRC32 checksum, allowing an entry left incomplete by a crash to be detected.
+"""
+
+import os
+import pickle
+import re
+import struct
+import zlib
+from typing import Any, BinaryIO, List, Optional
+
+MAGIC = b'DBSEG\x01'
+_HEADER = struct.Struct('>II')  # length and crc32 of the compressed entry
+
+
+class CorruptEntryError(ValueError):
+    """ Raised when reading an entry that is incomplete or doesn't match its checksum."""
+    pass
+
+
+def segment_path(directory: str, index: int, suffix: str) -> str:
+    return os.path.join(directory, 'segment-%08d.%s' % (index, suffix))
+
+
+def segment_indices(directory: str, suffix: str) -> List[int]:
+    """
+    Indices of the segment files with the suffix provided stored in the directory, in ascending order.
+    """
+    pattern = re.compile(r'^segment-(\d{8})\.%s$' % re.escape(suffix))
+    indices = []
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            indices.append(int(match.group(1)))
+    return sorted(indices)
+
+
+def open_segment(path: str) -> BinaryIO:
+    """
+    Open the segment file for appending, writing the magic header if the file is new.
+    """
+    f = open(path, 'ab')
+    if f.tell() == 0:
+        f.write(MAGIC)
+        f.flush()
+    return f
+
+
+def encode_entry(entry: Any) -> bytes:
+    data = zlib.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+    return _HEADER.pack(len(data), zlib.crc32(data)) + data
+
+
+def read_magic(f: BinaryIO) -> bool:
+    return f.read(len(MAGIC)) == MAGIC
+
+
+def read_entry(f: BinaryIO) -> Optional[Any]:
+    """
+    Read the next entry of a segment file.
+
+    :returns: The entry, or :code:`None` at the end of the file.
+    :raises CorruptEntryError: If the entry is incomplete or corrupted.
+    """
+    header = f.read(_HEADER.size)
+    if not header:
+        return None
+    if len(header) < _HEADER.size:
+        raise CorruptEntryError('Truncated entry header')
+
+    length, crc = _HEADER.unpack(header)
+    data = f.read(length)
+    if len(data) < length:
+        raise CorruptEntryError('Truncated entry')
+    if zlib.crc32(data) != crc:
+        raise CorruptEntryError('Entry checksum mismatch')
+    return pickle.loads(zlib.decompress(data))
@@ -0,0 +1,51 @@
+"""
+Timeouts applied by Databay to pulls, pushes and transfers.
+"""
+
+import asyncio
+from typing import Any, Awaitable
+
+from databay.errors import TransferTimeoutError
+
+
+class _AwaitedTimeout(Exception):
+    """Carries a timeout raised by the awaited call itself past :func:`asyncio.wait_for`."""
+
+    def __init__(self, exception: BaseException):
+        super().__init__(exception)
+        self.exception = exception
+
+
+async def _carry_timeouts(awaitable: Awaitable) -> Any:
+    try:
+        return await awaitable
+    except asyncio.TimeoutError as e:
+        raise _AwaitedTimeout(e) from None
+
+
+async def wait_for_timeout(awaitable: Awaitable, timeout: float, error: TransferTimeoutError) -> Any:
+    """
+    Await the awaitable, cancelling it and raising the error provided if it doesn't complete within the timeout.
+
+    Timeouts raised by the awaitable itself - such as read timeouts of an HTTP client, which since Python 3.11 are of the same type as :any:`asyncio.TimeoutError` - are raised unchanged, and never mistaken for exceeding this timeout.
+
+    :type awaitable: Awaitable
+    :param awaitable: Call to await.
+
+    :type timeout: float
+    :param timeout: Number of seconds after which the call is cancelled.
+
+    :type error: :any:`TransferTimeoutError`
+    :param error: Exception raised when the timeout expires.
+
+    :returns: Result of the awaitable.
+    """
+    try:
+        return await asyncio.wait_for(_carry_timeouts(awaitable), timeout)
+    except _AwaitedTimeout as carrier:
+        exception = carrier.exception
+    except asyncio.TimeoutError as e:
+        raise error from e
+
+    # raised outside of the except clause, leaving the context of the exception unchanged
+    raise exception
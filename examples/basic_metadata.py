@@ -30,5 +30,5 @@ link = Link([random_int_inlet_on, random_int_inlet_off],
             interval=timedelta(seconds=0.5),
             tags='should_print_metadata')
 
-planner = SchedulePlanner(link, refresh_interval=0.5)
+planner = SchedulePlanner(link)
 planner.start()
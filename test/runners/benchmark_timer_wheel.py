@@ -0,0 +1,72 @@
+"""
+Benchmark of the TimerWheelPlanner's scheduling overhead.
+
+Schedules 1k, 10k and 100k links with random intervals between 1 second and 10 minutes, then measures the time it takes to schedule a link, unschedule a link and process one tick of the wheel. Transfers are not executed, only the wheel operations are measured.
+
+Scheduling and unscheduling take constant time. The time of a tick depends only on the number of links due at that tick and the number of links moved down from higher levels of the wheel, so its mean grows with the number of due links rather than the total number of links.
+
+Run from the repository root with: PYTHONPATH=. python test/runners/benchmark_timer_wheel.py
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from databay import Link
+from databay.inlets import NullInlet
+from databay.outlets import NullOutlet
+from databay.planners import TimerWheelPlanner
+
+TICK = 0.01
+TICKS_MEASURED = 5000
+
+
+def measure(link_count):
+    random.seed(link_count)
+    planner = TimerWheelPlanner(tick=TICK)
+    links = [Link(NullInlet(), NullOutlet(), timedelta(seconds=random.uniform(1, 600))) for _ in range(link_count)]
+
+    start = time.perf_counter()
+    for link in links:
+        planner._schedule(link)
+    schedule_time = (time.perf_counter() - start) / link_count
+
+    tick_times = []
+    due_count = 0
+    for _ in range(TICKS_MEASURED):
+        start = time.perf_counter()
+        due_count += len(planner._advance())
+        tick_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for link in links:
+        planner._unschedule(link)
+    unschedule_time = (time.perf_counter() - start) / link_count
+
+    tick_times.sort()
+    return {
+        'links': link_count,
+        'schedule': schedule_time,
+        'unschedule': unschedule_time,
+        'tick_mean': statistics.mean(tick_times),
+        'tick_p99': tick_times[int(len(tick_times) * 0.99)],
+        'tick_max': tick_times[-1],
+        'due_per_tick': due_count / TICKS_MEASURED,
+    }
+
+
+def main():
+    print(f'{"links":>8} {"schedule":>10} {"unschedule":>11} {"tick mean":>10} {"tick p99":>10} {"tick max":>10} {"due/tick":>9}')
+    for link_count in [1000, 10000, 100000]:
+        result = measure(link_count)
+        print(f'{result["links"]:>8} '
+              f'{result["schedule"] * 1e6:>8.2f}us '
+              f'{result["unschedule"] * 1e6:>9.2f}us '
+              f'{result["tick_mean"] * 1e6:>8.2f}us '
+              f'{result["tick_p99"] * 1e6:>8.2f}us '
+              f'{result["tick_max"] * 1e6:>8.2f}us '
+              f'{result["due_per_tick"]:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 import logging
 import time
+from datetime import datetime, timezone
 from threading import Thread
 from unittest import TestCase
 from unittest.mock import MagicMock
@@ -41,6 +42,27 @@ class TestApsPlanner(TestCase):
         self.assertEqual(self.link.job, asp_job,
                          'Link\'s job should be same as scheduler\'s')
 
+    def test__schedule_phase_spread_jitter(self):
+        self.planner = ApsPlanner(phase_spread=True, jitter=0.5)
+        self.link.interval.total_seconds.return_value = 10
+        links = [self.link, MagicMock(spec=Link, interval=self.link.interval)]
+        for link in links:
+            self.planner._schedule(link)
+
+        now = datetime.now(timezone.utc)
+        triggers = [job.trigger for job in self.planner._scheduler.get_jobs()]
+        self.assertEqual(triggers[0].jitter, 0.5)
+        delays = [(trigger.start_date - now).total_seconds() for trigger in triggers]
+        self.assertAlmostEqual(delays[0], 10, delta=0.1, msg='First link should start after the interval')
+        self.assertAlmostEqual(delays[1], 10 * (1 - 0.618), delta=0.1, msg='Second link should be offset')
+
+    def test__reschedule(self):
+        self.planner._schedule(self.link)
+        self.link.interval.total_seconds.return_value = 5
+        self.planner._reschedule(self.link)
+        trigger = self.planner._scheduler.get_jobs()[0].trigger
+        self.assertEqual(trigger.interval.total_seconds(), 5, 'Job should use the new interval')
+
     def test__unschedule(self):
         self.planner._schedule(self.link)
         self.planner._unschedule(self.link)
@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import time
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from databay import Link, Inlet, Outlet, OverrunPolicy
+from databay.errors import MissingLinkError
+from databay.planners import AsyncioPlanner
+from databay.planners.asyncio_planner import AsyncioJob
+from test_utils import DummyException, DummyUnusualException
+
+
+class TestAsyncioPlanner(TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        logging.getLogger('databay').setLevel(logging.WARNING)
+
+    def setUp(self):
+        self.planner = AsyncioPlanner()
+
+        link = MagicMock(spec=Link)
+
+        def set_job(job):
+            link.job = job
+
+        link.interval.total_seconds.return_value = 0.02
+        link.set_job.side_effect = set_job
+        link.job = None
+        link.immediate_transfer = True
+        self.link = link
+
+    def _start(self):
+        th = Thread(target=self.planner.start, daemon=True)
+        th.start()
+        for _ in range(100):
+            if self.planner.running:
+                break
+            time.sleep(0.005)
+        return th
+
+    def _wait_for_transfer(self):
+        for _ in range(100):
+            if self.link.transfer_async.await_count > 0:
+                break
+            time.sleep(0.005)
+
+    def _shutdown(self, th, wait=True):
+        self.planner.shutdown(wait)
+        th.join(timeout=2)
+        self.assertFalse(th.is_alive(), 'Thread should be stopped.')
+
+    def test__schedule(self):
+        self.planner._schedule(self.link)
+        self.assertIsInstance(self.link.job, AsyncioJob, 'Link should contain a job')
+        self.assertIsNone(self.link.job.task, 'Job should not run before the planner starts')
+
+    def test__unschedule(self):
+        self.planner._schedule(self.link)
+        self.planner._unschedule(self.link)
+        self.assertIsNone(self.link.job, 'Link should not contain a job')
+
+    def test__unschedule_invalid(self):
+        self.planner._unschedule(self.link)
+        self.assertIsNone(self.link.job, 'Link should not contain a job')
+
+    def test_add_links(self):
+        self.planner.add_links(self.link)
+        self.assertIsNotNone(self.link.job, 'Link should contain a job')
+        self.assertTrue(self.link in self.planner.links,
+                        'Planner should contain the link')
+
+    def test_remove_links(self):
+        self.planner.add_links(self.link)
+        self.planner.remove_links(self.link)
+        self.assertIsNone(self.link.job, 'Link should not contain a job')
+        self.assertTrue(self.link not in self.planner.links,
+                        'Planner should not contain the link')
+
+    def test_remove_invalid_link(self):
+        self.assertRaises(MissingLinkError,
+                          self.planner.remove_links, self.link)
+
+    def test_start(self):
+        th = self._start()
+        self.assertTrue(self.planner.running, 'Planner should be running')
+        self._shutdown(th)
+        self.assertFalse(self.planner.running, 'Planner should not be running')
+
+    def test_add_and_run(self):
+        self.planner.add_links(self.link)
+        th = self._start()
+        time.sleep(0.07)
+        self.assertGreaterEqual(self.link.transfer_async.await_count, 3, 'Immediate and scheduled transfers should run')
+        self.assertIsNotNone(self.link.job.task, 'Job should be running as a task')
+        self._shutdown(th)
+
+    def test_add_while_running(self):
+        th = self._start()
+        self.planner.add_links(self.link)
+        time.sleep(0.05)
+        self.link.transfer_async.assert_awaited()
+        self._shutdown(th)
+
+    def test_remove_while_running(self):
+        self.planner.add_links(self.link)
+        th = self._start()
+        self.planner.remove_links(self.link)
+        time.sleep(0.01)
+        calls = self.link.transfer_async.await_count
+        time.sleep(0.05)
+        self.assertEqual(self.link.transfer_async.await_count, calls, 'Removed link should not transfer')
+        self._shutdown(th)
+
+    def test_concurrency(self):
+        self.planner = AsyncioPlanner(concurrency=2, immediate_transfer=False)
+        counter = {'value': 0, 'max': 0}
+
+        async def slow_run(slot):
+            async with slot():
+                counter['value'] += 1
+                counter['max'] = max(counter['max'], counter['value'])
+                await asyncio.sleep(0.05)
+                counter['value'] -= 1
+
+        self.link.transfer_async.side_effect = slow_run
+        self.link.interval.total_seconds.return_value = 0.01
+        self.planner.add_links(self.link)
+        th = self._start()
+        time.sleep(0.1)
+        self._shutdown(th)
+        self.assertEqual(counter['max'], 2, 'Only 2 transfers should run at a time')
+
+    def test_shutdown_wait(self):
+        self.planner.immediate_transfer = False
+        finished = []
+
+        async def slow_run(slot):
+            async with slot():
+                await asyncio.sleep(0.05)
+                finished.append(True)
+
+        self.link.transfer_async.side_effect = slow_run
+        self.planner.add_links(self.link)
+        th = self._start()
+        self._wait_for_transfer()
+        self._shutdown(th, wait=True)
+        self.assertTrue(finished, 'Running transfers should finish')
+
+    def test_shutdown_no_wait(self):
+        self.planner.immediate_transfer = False
+        finished = []
+
+        async def slow_run(slot):
+            async with slot():
+                await asyncio.sleep(0.2)
+                finished.append(True)
+
+        self.link.transfer_async.side_effect = slow_run
+        self.planner.add_links(self.link)
+        th = self._start()
+        self._wait_for_transfer()
+        self._shutdown(th, wait=False)
+        self.assertFalse(finished, 'Running transfers should be cancelled')
+
+    def test_start_async(self):
+        self.planner.add_links(self.link)
+
+        async def task():
+            start_task = asyncio.create_task(self.planner.start_async())
+            await asyncio.sleep(0.03)
+            self.assertTrue(self.planner.running, 'Planner should be running')
+            await self.planner.shutdown_async()
+            self.assertFalse(self.planner.running, 'Planner should not be running')
+            await start_task
+
+        asyncio.run(task())
+        self.link.transfer_async.assert_awaited()
+        self.link.on_start.assert_called()
+        self.link.on_shutdown.assert_called()
+
+    def _with_exception(self, link, ignore_exceptions):
+        self.planner = AsyncioPlanner(ignore_exceptions=ignore_exceptions, immediate_transfer=False)
+        link.transfer_async.side_effect = DummyException()
+        self.planner.add_links(link)
+
+        with self.assertLogs(logging.getLogger('databay.BasePlanner'), level='WARNING') as cm:
+            th = self._start()
+            time.sleep(0.04)
+            link.transfer_async.assert_awaited()
+
+            if ignore_exceptions:
+                self.assertTrue(self.planner.running, 'Planner should be running')
+                self._shutdown(th, wait=False)
+            else:
+                th.join(timeout=2)
+                self.assertFalse(th.is_alive(), 'Thread should be stopped.')
+
+            self.assertFalse(self.planner.running, 'Planner should be stopped')
+            self.assertTrue('I\'m a dummy exception' in ';'.join(cm.output))
+
+    def test_ignore_exception(self):
+        self._with_exception(self.link, True)
+
+    def test_raise_exception(self):
+        self._with_exception(self.link, False)
+
+    def test_uncommon_exception(self):
+        self.link.transfer_async.side_effect = DummyUnusualException(argA=123, argB=True)
+        self.planner.immediate_transfer = False
+        self.planner.add_links(self.link)
+
+        with self.assertLogs(logging.getLogger('databay.BasePlanner'), level='WARNING') as cm:
+            th = self._start()
+            th.join(timeout=2)
+            self.assertFalse(self.planner.running, 'Planner should be stopped')
+            self.assertTrue(
+                '123, True, I\'m an unusual dummy exception' in ';'.join(cm.output))
+
+    def test_immediate_transfer(self):
+        self.link.interval.total_seconds.return_value = 10
+        self.planner.add_links(self.link)
+        th = self._start()
+        self.link.transfer_async.assert_awaited_once()
+        self._shutdown(th)
+
+    def test_immediate_transfer_exception(self):
+        self.link.interval.total_seconds.return_value = 10
+        self.link.transfer_async.side_effect = DummyException('First transfer exception!')
+        self.planner.add_links(self.link)
+        with self.assertLogs(logging.getLogger('databay.BasePlanner'), level='WARNING') as cm:
+            th = self._start()
+            th.join(timeout=2)
+            self.assertFalse(th.is_alive(), 'Thread should be stopped.')
+            self.assertFalse(self.planner.running, 'Planner should not have started')
+            self.assertTrue('First transfer exception!' in ';'.join(cm.output))
+
+    def test_immediate_transfer_off(self):
+        self.link.interval.total_seconds.return_value = 10
+        self.planner.immediate_transfer = False
+        self.planner.add_links(self.link)
+        th = self._start()
+        self.link.transfer_async.assert_not_awaited()
+        self._shutdown(th)
+
+    def test_force_transfer_while_running(self):
+        self.link.interval.total_seconds.return_value = 10
+        self.planner.immediate_transfer = False
+        self.planner.add_links(self.link)
+        th = self._start()
+        self.planner.force_transfer()
+        self.link.transfer_async.assert_awaited_once()
+        self._shutdown(th)
+
+    def test_purge_while_running(self):
+        self.planner.add_links(self.link)
+        th = self._start()
+        self.planner.purge()
+
+        self.link.set_job.assert_called_with(None)
+        self.assertEqual(self.planner.links, [])
+        self._shutdown(th)
+
+    def test_overrun_policy(self):
+        class SlowInlet(Inlet):
+            async def pull(self, update):
+                await asyncio.sleep(0.05)
+                return []
+
+        link = Link(SlowInlet(), MagicMock(spec=Outlet), 0.01, overrun_policy=OverrunPolicy.SKIP)
+        self.planner = AsyncioPlanner(link, immediate_transfer=False)
+        th = self._start()
+        time.sleep(0.08)
+        self._shutdown(th)
+        self.assertGreater(link.skipped_transfers, 0, 'Overrunning transfers should be skipped')
+        self.assertEqual(link._running_transfers, 0, 'Transfers should be finished')
+
+    def test_max_transfers(self):
+        order = []
+
+        class NamedInlet(Inlet):
+            def __init__(self, name):
+                super().__init__()
+                self.name = name
+
+            async def pull(self, update):
+                order.append(self.name)
+                await asyncio.sleep(0.02)
+                return []
+
+        links = [Link(NamedInlet(name), MagicMock(spec=Outlet), 10, priority=priority)
+                 for name, priority in [('low', 0), ('mid', 5), ('high', 10)]]
+        self.planner = AsyncioPlanner(links, max_transfers=1)
+        th = self._start()
+        self._shutdown(th)
+        self.assertEqual(order, ['low', 'high', 'mid'], 'Waiting transfers should run in order of priority')
+        self.assertEqual(self.planner.admission.deferred, 2)
+        self.assertGreater(self.planner.admission.max_delay, 0)
+
+    def test_max_transfers_overrun(self):
+        class SlowInlet(Inlet):
+            pulls = 0
+
+            async def pull(self, update):
+                self.pulls += 1
+                await asyncio.sleep(0.05)
+                return []
+
+        inlet = SlowInlet()
+        link = Link(inlet, MagicMock(spec=Outlet), 0.01, overrun_policy=OverrunPolicy.SKIP)
+        self.planner = AsyncioPlanner(link, max_transfers=1)
+        th = self._start()
+        time.sleep(0.12)
+        self._shutdown(th)
+        self.assertGreater(link.skipped_transfers, 0)
+        self.assertEqual(self.planner.admission.admitted, inlet.pulls, 'Skipped transfers should not be admitted')
+        self.assertEqual(self.planner.admission.deferred, 0, 'Skipped transfers should not wait for a slot')
@@ -93,7 +93,7 @@ class TestBuffers(TestCase):
         counter_dict = {'counter': 0, 'records': []}
 
         link = Link(inlet, outlet, interval=0.01, processors=buffer, copy_records=False)
-        planner = SchedulePlanner(link, refresh_interval=0.01)
+        planner = SchedulePlanner(link)
 
         async def pull_coro(_):
             counter_dict['counter'] += 1
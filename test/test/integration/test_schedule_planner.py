@@ -2,7 +2,7 @@ import logging
 import time
 from threading import Thread
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import schedule
 
@@ -10,7 +10,6 @@ import databay
 from databay import Link
 from databay.errors import MissingLinkError
 from databay.planners import SchedulePlanner
-from databay.planners.schedule_planner import ScheduleIntervalError
 from test_utils import fqname, DummyException, DummyUnusualException
 
 
@@ -21,7 +20,7 @@ class TestSchedulePlanner(TestCase):
         logging.getLogger('databay').setLevel(logging.WARNING)
 
     def setUp(self):
-        self.planner = SchedulePlanner(refresh_interval=0.02)
+        self.planner = SchedulePlanner()
 
         link = MagicMock(spec=Link)
 
@@ -72,7 +71,7 @@ class TestSchedulePlanner(TestCase):
                         'Planner should contain the link')
 
     def test_add_links_on_init(self):
-        self.planner = SchedulePlanner(self.link, refresh_interval=0.02)
+        self.planner = SchedulePlanner(self.link)
         self.assertIsNotNone(self.link.job, 'Link should contain a job')
         self.assertTrue(self.link in self.planner.links,
                         'Planner should contain the link')
@@ -123,7 +122,6 @@ class TestSchedulePlanner(TestCase):
 
     def test_add_and_run(self):
         self.link.interval.total_seconds.return_value = 0.02
-        self.planner._refresh_interval = 0.02
         self.planner.add_links(self.link)
 
         th = Thread(target=self.planner.start, daemon=True)
@@ -135,19 +133,65 @@ class TestSchedulePlanner(TestCase):
         th.join(timeout=2)
         self.assertFalse(th.is_alive(), 'Thread should be stopped.')
 
-    def test_invalid_interval(self):
-        self.link.interval.total_seconds.return_value = 0.1
-        self.planner._refresh_interval = 0.2
+    def test_short_interval(self):
+        self.link.interval.total_seconds.return_value = 0.005
+        self.planner.immediate_transfer = False
+        self.planner.add_links(self.link)
+
+        th = Thread(target=self.planner.start, daemon=True)
+        th.start()
+        time.sleep(0.1)
+        self.planner.shutdown()
+        th.join(timeout=2)
+        self.assertGreaterEqual(self.link.transfer.call_count, 10, 'Intervals shorter than a second should be supported')
+
+    @patch('databay.planners.schedule_planner.time.monotonic')
+    def test_no_drift(self, monotonic):
+        self.link.interval.total_seconds.return_value = 10
+        monotonic.return_value = 100
+        self.planner._schedule(self.link)
+        self.assertEqual(self.planner._queue[0][0], 110)
+
+        monotonic.return_value = 113
+        due_links, timeout = self.planner._pop_due()
+        self.assertEqual(due_links, [self.link])
+        self.assertEqual(self.planner._queue[0][0], 120, 'Next run should be based on the previous run time')
+        self.assertEqual(timeout, 7, 'Planner should sleep until the next run')
+
+        monotonic.return_value = 145
+        self.planner._pop_due()
+        self.assertEqual(self.planner._queue[0][0], 150, 'Missed runs should be skipped')
 
-        self.assertRaises(ScheduleIntervalError,
-                          self.planner.add_links, self.link)
+    @patch('databay.planners.schedule_planner.time.monotonic')
+    def test_jitter(self, monotonic):
+        self.planner.jitter = 2
+        self.link.interval.total_seconds.return_value = 10
+        monotonic.return_value = 100
+        self.planner._schedule(self.link)
+        fire_at, _, _, _, due = self.planner._queue[0]
+        self.assertEqual(due, 110)
+        self.assertTrue(110 <= fire_at <= 112, 'Jitter should delay the run')
+
+        monotonic.return_value = 112
+        self.planner._pop_due()
+        fire_at, _, _, _, due = self.planner._queue[0]
+        self.assertEqual(due, 120, 'Jitter should not accumulate')
+        self.assertTrue(120 <= fire_at <= 122)
+
+    def test_unscheduled_not_due(self):
+        self.link.interval.total_seconds.return_value = 0.01
+        self.planner._schedule(self.link)
+        self.planner._unschedule(self.link)
+        time.sleep(0.015)
+        due_links, timeout = self.planner._pop_due()
+        self.assertEqual(due_links, [], 'Unscheduled link should not be due')
+        self.assertIsNone(timeout)
 
     def _with_exception(self, link, ignore_exceptions):
         self.planner = SchedulePlanner(ignore_exceptions=ignore_exceptions)
         self.planner.immediate_transfer = False # otherwise planner will never start
         link.transfer.side_effect = DummyException()
         link.interval.total_seconds.return_value = 0.02
-        self.planner._refresh_interval = 0.02
 
         link.transfer.side_effect = DummyException()
         link.interval.total_seconds.return_value = 0.02
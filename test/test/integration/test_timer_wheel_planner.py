@@ -0,0 +1,182 @@
+import logging
+import time
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from databay import Link
+from databay.errors import MissingLinkError
+from databay.planners import TimerWheelPlanner
+from databay.planners.timer_wheel_planner import TimerWheelJob
+from test_utils import DummyException
+
+
+class TestTimerWheelPlanner(TestCase):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        logging.getLogger('databay').setLevel(logging.WARNING)
+
+    def setUp(self):
+        self.planner = TimerWheelPlanner(tick=0.005)
+        self.link = self._link(0.02)
+
+    def _link(self, interval):
+        link = MagicMock(spec=Link)
+
+        def set_job(job):
+            link.job = job
+
+        link.interval.total_seconds.return_value = interval
+        link.set_job.side_effect = set_job
+        link.job = None
+        link.immediate_transfer = True
+        return link
+
+    def _start(self):
+        th = Thread(target=self.planner.start, daemon=True)
+        th.start()
+        for _ in range(100):
+            if self.planner.running:
+                break
+            time.sleep(0.005)
+        return th
+
+    def _shutdown(self, th, wait=True):
+        self.planner.shutdown(wait)
+        th.join(timeout=2)
+        self.assertFalse(th.is_alive(), 'Thread should be stopped.')
+
+    def _advance(self, ticks):
+        due = []
+        for _ in range(ticks):
+            due.append([job.link for job in self.planner._advance()])
+        return due
+
+    def test__schedule(self):
+        self.planner._schedule(self.link)
+        self.assertIsInstance(self.link.job, TimerWheelJob, 'Link should contain a job')
+        self.assertEqual(self.link.job.expires, 4, 'Interval should be converted to ticks')
+
+    def test__unschedule(self):
+        self.planner._schedule(self.link)
+        job = self.link.job
+        self.planner._unschedule(self.link)
+        self.assertIsNone(self.link.job, 'Link should not contain a job')
+        self.assertIsNone(job.slot, 'Job should be removed from the wheel')
+        self.assertEqual(self._advance(10), [[]] * 10, 'Unscheduled link should not be due')
+
+    def test__unschedule_invalid(self):
+        self.planner._unschedule(self.link)
+        self.assertIsNone(self.link.job, 'Link should not contain a job')
+
+    def test_advance(self):
+        self.planner._schedule(self.link)
+        due = self._advance(12)
+        self.assertEqual([i for i, links in enumerate(due, 1) if links], [4, 8, 12], 'Link should be due every 4 ticks')
+
+    def test_advance_levels(self):
+        self.planner = TimerWheelPlanner(tick=1, wheel_size=4, levels=2)
+        links = [self._link(interval) for interval in [1, 3, 5, 16, 21]]
+        for link in links:
+            self.planner._schedule(link)
+
+        due = self._advance(63)
+        for link, interval in zip(links, [1, 3, 5, 16, 21]):
+            ticks = [i for i, due_links in enumerate(due, 1) if link in due_links]
+            self.assertEqual(ticks, list(range(interval, 64, interval)),
+                             f'Link with interval {interval} should be due on each multiple, including ones beyond the wheel\'s range')
+
+    def test_phase_spread_jitter(self):
+        self.planner = TimerWheelPlanner(tick=1, phase_spread=True, jitter=2)
+        links = [self._link(10) for _ in range(2)]
+        for link in links:
+            self.planner._schedule(link)
+
+        self.assertEqual([link.job.due for link in links], [10, 4], 'Links with the same interval should be offset')
+        for link in links:
+            self.assertTrue(link.job.due <= link.job.expires <= link.job.due + 2, 'Jitter should delay the run')
+
+        self._advance(12)
+        self.assertEqual(links[0].job.due, 20, 'Jitter should not accumulate')
+
+    def test_add_links(self):
+        self.planner.add_links(self.link)
+        self.assertIsNotNone(self.link.job, 'Link should contain a job')
+        self.assertTrue(self.link in self.planner.links, 'Planner should contain the link')
+
+    def test_remove_links(self):
+        self.planner.add_links(self.link)
+        self.planner.remove_links(self.link)
+        self.assertIsNone(self.link.job, 'Link should not contain a job')
+        self.assertTrue(self.link not in self.planner.links, 'Planner should not contain the link')
+
+    def test_remove_invalid_link(self):
+        self.assertRaises(MissingLinkError, self.planner.remove_links, self.link)
+
+    def test_start(self):
+        th = self._start()
+        self.assertTrue(self.planner.running, 'Planner should be running')
+        self._shutdown(th)
+        self.assertFalse(self.planner.running, 'Planner should not be running')
+        self.assertIsNone(self.planner._thread_pool, 'Planner should not have a thread pool')
+
+    def test_add_and_run(self):
+        self.planner.add_links(self.link)
+        th = self._start()
+        time.sleep(0.1)
+        self.assertGreaterEqual(self.link.transfer.call_count, 3, 'Link should be transferred repeatedly')
+        self._shutdown(th)
+
+    def test_add_and_remove_while_running(self):
+        th = self._start()
+        self.planner.add_links(self.link)
+        time.sleep(0.05)
+        self.link.transfer.assert_called()
+
+        self.planner.remove_links(self.link)
+        time.sleep(0.01)
+        calls = self.link.transfer.call_count
+        time.sleep(0.05)
+        self.assertEqual(self.link.transfer.call_count, calls, 'Removed link should not transfer')
+        self._shutdown(th)
+
+    def test_ignore_exception(self):
+        self.planner = TimerWheelPlanner(tick=0.005, ignore_exceptions=True, immediate_transfer=False)
+        self.link.transfer.side_effect = DummyException()
+        self.planner.add_links(self.link)
+
+        with self.assertLogs(logging.getLogger('databay.BasePlanner'), level='WARNING') as cm:
+            th = self._start()
+            time.sleep(0.05)
+            self.assertTrue(self.planner.running, 'Planner should be running')
+            self._shutdown(th, wait=False)
+            self.assertTrue('I\'m a dummy exception' in ';'.join(cm.output))
+
+    def test_raise_exception(self):
+        self.planner = TimerWheelPlanner(tick=0.005, immediate_transfer=False)
+        self.link.transfer.side_effect = DummyException()
+        self.planner.add_links(self.link)
+
+        with self.assertLogs(logging.getLogger('databay.BasePlanner'), level='WARNING') as cm:
+            th = self._start()
+            th.join(timeout=2)
+            self.assertFalse(th.is_alive(), 'Thread should be stopped.')
+            self.assertFalse(self.planner.running, 'Planner should be stopped')
+            self.assertTrue('I\'m a dummy exception' in ';'.join(cm.output))
+
+    def test_immediate_transfer(self):
+        self.link.interval.total_seconds.return_value = 10
+        self.planner.add_links(self.link)
+        th = self._start()
+        self.link.transfer.assert_called_once()
+        self._shutdown(th)
+
+    def test_purge_while_running(self):
+        self.planner.add_links(self.link)
+        th = self._start()
+        self.planner.purge()
+
+        self.link.set_job.assert_called_with(None)
+        self.assertEqual(self.planner.links, [])
+        self._shutdown(th)
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+
+from databay.support.admission import AdmissionController
+
+
+class TestAdmissionController(TestCase):
+
+    def _wait_for(self, condition):
+        for _ in range(200):
+            if condition():
+                break
+            time.sleep(0.005)
+
+    def _acquire_in_thread(self, controller, order, name, priority=0, weight=1):
+        def worker():
+            controller.acquire(priority, weight)
+            order.append(name)
+
+        th = threading.Thread(target=worker, daemon=True)
+        th.start()
+        return th
+
+    def test_invalid_limit(self):
+        self.assertRaises(ValueError, AdmissionController, 0)
+
+    def test_acquire_release(self):
+        controller = AdmissionController(2)
+        self.assertEqual(controller.acquire(), 0.0, 'Transfer should be admitted straight away')
+        controller.acquire()
+        self.assertEqual(controller.in_use, 2)
+        controller.release()
+        controller.release()
+        self.assertEqual(controller.in_use, 0)
+        self.assertEqual(controller.admitted, 2)
+        self.assertEqual(controller.deferred, 0)
+
+    def test_priority(self):
+        controller = AdmissionController(1)
+        controller.acquire()
+        order = []
+        threads = []
+        for name, priority in [('low', 0), ('high', 10), ('mid', 5)]:
+            threads.append(self._acquire_in_thread(controller, order, name, priority))
+            self._wait_for(lambda: controller.waiting == len(threads))
+
+        for i in range(len(threads)):
+            controller.release()
+            self._wait_for(lambda: len(order) == i + 1)
+        for th in threads:
+            th.join(timeout=2)
+
+        self.assertEqual(order, ['high', 'mid', 'low'], 'Higher priority transfers should be admitted first')
+        self.assertEqual(controller.deferred, 3)
+        self.assertGreater(controller.max_delay, 0)
+        self.assertGreater(controller.mean_delay, 0)
+
+    def test_weight(self):
+        controller = AdmissionController(3)
+        controller.acquire(weight=2)
+        order = []
+        heavy = self._acquire_in_thread(controller, order, 'heavy', priority=1, weight=2)
+        self._wait_for(lambda: controller.waiting == 1)
+        light = self._acquire_in_thread(controller, order, 'light')
+        self._wait_for(lambda: controller.waiting == 2)
+        self.assertEqual(order, [], 'Lighter transfer should not overtake the waiting heavier one')
+
+        controller.release(2)
+        heavy.join(timeout=2)
+        light.join(timeout=2)
+        self.assertCountEqual(order, ['heavy', 'light'], 'Both transfers should be admitted once there is room')
+        self.assertEqual(controller.in_use, 3)
+
+    def test_weight_above_limit(self):
+        controller = AdmissionController(2)
+        controller.acquire(weight=5)
+        self.assertEqual(controller.in_use, 2, 'Weight should be capped at the limit')
+        controller.release(5)
+        self.assertEqual(controller.in_use, 0)
+
+    def test_acquire_async(self):
+        controller = AdmissionController(1)
+        order = []
+
+        async def transfer(name, priority):
+            await controller.acquire_async(priority)
+            order.append(name)
+            await asyncio.sleep(0.01)
+            controller.release()
+
+        async def task():
+            await controller.acquire_async()
+            tasks = [asyncio.create_task(transfer(name, priority)) for name, priority in [('low', 0), ('high', 1)]]
+            await asyncio.sleep(0.01)
+            controller.release()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(task())
+        self.assertEqual(order, ['high', 'low'])
+        self.assertEqual(controller.in_use, 0)
+
+    def test_acquire_async_cancelled(self):
+        controller = AdmissionController(1)
+
+        async def task():
+            await controller.acquire_async()
+            waiting = asyncio.create_task(controller.acquire_async())
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            controller.release()
+
+        asyncio.run(task())
+        self.assertEqual(controller.in_use, 0, 'Cancelled transfer should not take up a slot')
+        self.assertEqual(controller.waiting, 0)
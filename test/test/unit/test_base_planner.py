@@ -1,5 +1,6 @@
 import atexit
 import logging
+from threading import Thread
 from datetime import timedelta
 from unittest import TestCase, mock
 from unittest.mock import patch, MagicMock
@@ -233,3 +234,105 @@ class TestBasePlanner(TestCase):
                 'First transfer exception!' in ';'.join(cm.output))
 
         link.transfer.assert_called()
+
+    @patch(fqname(Link), spec=Link, immediate_transfer=False)
+    def test_persistent_event_loops(self, link):
+        self.planner.persistent_event_loops = True
+        self.planner.add_links(link)
+        self.planner.force_transfer()
+        self.planner.force_transfer()
+
+        loops = [c.kwargs['event_loop'] for c in link.transfer.call_args_list]
+        self.assertEqual(len(loops), 2)
+        self.assertIs(loops[0], loops[1], 'Transfers on one thread should reuse the same event loop')
+        self.assertFalse(loops[0].is_closed())
+
+        self.planner.shutdown()
+        self.assertTrue(loops[0].is_closed(), 'Event loops should be closed on shutdown')
+
+    @patch(fqname(Link), spec=Link, immediate_transfer=False)
+    def test_persistent_event_loops_per_thread(self, link):
+        self.planner.persistent_event_loops = True
+        self.planner.add_links(link)
+        self.planner.force_transfer()
+        th = Thread(target=self.planner.force_transfer)
+        th.start()
+        th.join()
+
+        loops = [c.kwargs['event_loop'] for c in link.transfer.call_args_list]
+        self.assertIsNot(loops[0], loops[1], 'Each thread should own its event loop')
+        self.planner.shutdown()
+
+    @patch(fqname(Link), spec=Link, immediate_transfer=False)
+    def test_persistent_event_loops_off(self, link):
+        self.planner.add_links(link)
+        self.planner.force_transfer()
+        link.transfer.assert_called_with()
+
+    def _interval_link(self, seconds):
+        link = MagicMock(spec=Link)
+        link.interval = timedelta(seconds=seconds)
+        return link
+
+    def test_start_offset(self):
+        link = self._interval_link(10)
+        self.assertEqual(self.planner._start_offset(link), 10, 'First run should be delayed by the interval')
+        self.assertEqual(self.planner._start_offset(link), 10)
+
+    def test_start_offset_phase_spread(self):
+        self.planner.phase_spread = True
+        offsets = sorted(self.planner._start_offset(self._interval_link(10)) for _ in range(10))
+        self.assertEqual(offsets[-1], 10, 'First link should be delayed by the full interval')
+        gaps = [b - a for a, b in zip(offsets, offsets[1:])]
+        self.assertTrue(all(0 < gap <= 2 for gap in gaps), f'Offsets should be spread across the interval: {offsets}')
+        self.assertEqual(self.planner._start_offset(self._interval_link(5)), 5, 'Links with other intervals should be spread separately')
+
+    def test_transfer_reschedule(self):
+        self.planner._reschedule = MagicMock()
+        link = self._interval_link(10)
+        link.job = object()
+        self.planner._transfer(link)
+        self.planner._reschedule.assert_not_called()
+
+        def adapt(**kwargs):
+            link.interval = timedelta(seconds=20)
+
+        link.transfer.side_effect = adapt
+        self.planner._transfer(link)
+        self.planner._reschedule.assert_called_once_with(link)
+
+    def test_transfer_max_transfers(self):
+        self.setUp(max_transfers=2)
+        link = self._interval_link(10)
+        link.priority = 0
+        link.weight = 2
+        def transfer(slot, **kwargs):
+            self.assertEqual(self.planner.admission.in_use, 0, 'Slots should be taken only once the link starts the transfer')
+            with slot():
+                self.assertEqual(self.planner.admission.in_use, 2, 'Transfer should take up its weight')
+
+        link.transfer.side_effect = transfer
+        self.planner._transfer(link)
+        link.transfer.assert_called_once()
+        self.assertEqual(self.planner.admission.in_use, 0, 'Slots should be freed after the transfer')
+        self.assertEqual(self.planner.admission.admitted, 1)
+
+    def test_transfer_max_transfers_exception(self):
+        self.setUp(max_transfers=1)
+        link = self._interval_link(10)
+        link.priority = 0
+        link.weight = 1
+        def transfer(slot, **kwargs):
+            with slot():
+                raise DummyException()
+
+        link.transfer.side_effect = transfer
+        self.assertRaises(DummyException, self.planner._transfer, link)
+        self.assertEqual(self.planner.admission.in_use, 0, 'Slots should be freed after a failed transfer')
+
+    def test_jitter(self):
+        self.assertEqual(self.planner._get_jitter(), 0)
+        self.planner.jitter = 2
+        jitters = [self.planner._get_jitter() for _ in range(100)]
+        self.assertTrue(all(0 <= jitter <= 2 for jitter in jitters), 'Jitter should be bounded')
+        self.assertGreater(len(set(jitters)), 1, 'Jitter should be random')
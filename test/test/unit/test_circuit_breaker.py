@@ -0,0 +1,85 @@
+import pickle
+import time
+from unittest import TestCase
+
+from databay.support.circuit_breaker import CircuitBreaker, CircuitState
+from test_utils import DummyException
+
+
+class TestCircuitBreaker(TestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, probe_interval=10)
+        self.assertFalse(breaker.record_failure(DummyException()))
+        self.assertFalse(breaker.record_failure(DummyException()))
+        self.assertTrue(breaker.record_failure(DummyException()), 'Circuit should open on the threshold failure')
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        self.assertEqual(breaker.rejected, 2)
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure(DummyException())
+        breaker.record_success()
+        self.assertFalse(breaker.record_failure(DummyException()), 'Only consecutive failures should be counted')
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_probe_closes(self):
+        breaker = CircuitBreaker(failure_threshold=1, probe_interval=0.02, success_threshold=2)
+        breaker.record_failure(DummyException())
+        time.sleep(0.03)
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+
+        self.assertTrue(breaker.allow_request(), 'Probe should be allowed once the probe interval elapses')
+        self.assertFalse(breaker.allow_request(), 'Only one probe should be allowed at a time')
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, probe_interval=0.02)
+        breaker.record_failure(DummyException())
+        time.sleep(0.03)
+        self.assertTrue(breaker.allow_request())
+        self.assertTrue(breaker.record_failure(DummyException()), 'Failed probe should open the circuit again')
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.allow_request())
+
+    def test_abandoned_probe_expires(self):
+        breaker = CircuitBreaker(failure_threshold=1, probe_interval=0.02)
+        breaker.record_failure(DummyException())
+        time.sleep(0.03)
+        self.assertTrue(breaker.allow_request())
+        time.sleep(0.03)
+        self.assertTrue(breaker.allow_request(), 'Probe that never reported back should expire')
+
+    def test_failure_on(self):
+        breaker = CircuitBreaker(failure_threshold=1, failure_on=DummyException)
+        self.assertFalse(breaker.record_failure(ValueError()))
+        self.assertEqual(breaker.state, CircuitState.CLOSED, 'Other exceptions should be ignored')
+        self.assertTrue(breaker.record_failure(DummyException()))
+
+    def test_reset(self):
+        breaker = CircuitBreaker(failure_threshold=1, probe_interval=10)
+        breaker.record_failure(DummyException())
+        breaker.reset()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertTrue(breaker.allow_request())
+
+    def test_copy(self):
+        breaker = CircuitBreaker(failure_threshold=1, probe_interval=7, failure_on=DummyException)
+        breaker.record_failure(DummyException())
+        copy = breaker.copy()
+        self.assertEqual(copy.state, CircuitState.CLOSED, 'Copy should start closed')
+        self.assertEqual((copy.probe_interval, copy.failure_on), (7, DummyException))
+
+    def test_pickle(self):
+        breaker = CircuitBreaker(failure_threshold=1, probe_interval=10)
+        breaker.record_failure(DummyException())
+        unpickled = pickle.loads(pickle.dumps(breaker))
+        self.assertEqual(unpickled.state, CircuitState.OPEN)
+        self.assertFalse(unpickled.allow_request())
@@ -0,0 +1,145 @@
+import asyncio
+import io
+import logging
+import os
+import tempfile
+import time
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from databay import Outlet, Record, Update
+from databay.outlets import AsyncWriterOutlet
+from databay.support.dead_letter import DeadLetterQueue, main
+from test_utils import DummyException
+
+
+class CollectingOutlet(Outlet):
+    def __init__(self, fail=False, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail = fail
+        self.pushed = []
+
+    def push(self, records, update):
+        if self.fail:
+            raise DummyException('Still failing')
+        self.pushed.append((records, update))
+
+
+replay_outlets = []
+
+
+def create_outlets():
+    return replay_outlets
+
+
+class TestDeadLetterQueue(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+        self.queue = DeadLetterQueue(self.directory)
+        self.update = Update(tags=['link'], transfer_number=3)
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmpdir.cleanup()
+
+    def _put(self, queue, count, outlet=None):
+        outlet = outlet if outlet is not None else CollectingOutlet()
+        for i in range(count):
+            queue.put(self.update, outlet, [Record(payload=i)], DummyException('Push failed'))
+
+    def test_put(self):
+        self._put(self.queue, 3)
+        dead_letters = list(self.queue)
+        self.assertEqual(len(dead_letters), 3)
+        self.assertEqual([dl.records[0].payload for dl in dead_letters], [0, 1, 2], 'Dead letters should be ordered')
+        self.assertEqual(dead_letters[0].outlet_key, 'CollectingOutlet')
+        self.assertEqual(str(dead_letters[0].update), 'link.3')
+        self.assertIn('Push failed', dead_letters[0].error)
+
+    def test_reopen(self):
+        self._put(self.queue, 2)
+        self.queue.close()
+        queue = DeadLetterQueue(self.directory)
+        self._put(queue, 1)
+        queue.close()
+        self.assertEqual(len(queue), 3, 'Dead letters should persist across instances')
+
+    def test_segments(self):
+        queue = DeadLetterQueue(self.directory, segment_size=1)
+        self._put(queue, 3)
+        queue.close()
+        self.assertEqual(len(os.listdir(self.directory)), 3, 'Each entry should start a new segment')
+        self.assertEqual(len(queue), 3)
+
+    def test_corrupted_entry(self):
+        self._put(self.queue, 2)
+        self.queue.close()
+        path = os.path.join(self.directory, os.listdir(self.directory)[0])
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        with self.assertLogs(logging.getLogger('databay.DeadLetterQueue'), level='WARNING'):
+            self.assertEqual(len(self.queue), 1, 'Incomplete entry should be skipped')
+
+    def test_replay(self):
+        self._put(self.queue, 3)
+        outlet = CollectingOutlet()
+        self.assertEqual(self.queue.replay([outlet]), (3, 0))
+        self.assertEqual([records[0].payload for records, _ in outlet.pushed], [0, 1, 2])
+        self.assertEqual(len(self.queue), 0, 'Replayed dead letters should be removed')
+
+    def test_replay_failed(self):
+        self._put(self.queue, 2)
+        with self.assertLogs(logging.getLogger('databay.DeadLetterQueue'), level='WARNING'):
+            self.assertEqual(self.queue.replay([CollectingOutlet(fail=True)]), (0, 2))
+        dead_letters = list(self.queue)
+        self.assertEqual(len(dead_letters), 2, 'Failed dead letters should be stored again')
+        self.assertIn('Still failing', dead_letters[0].error)
+
+    def test_replay_missing_outlet(self):
+        self._put(self.queue, 1)
+        with self.assertLogs(logging.getLogger('databay.DeadLetterQueue'), level='WARNING'):
+            self.assertEqual(self.queue.replay([]), (0, 1))
+        self.assertEqual(len(self.queue), 1)
+
+    def test_replay_rate(self):
+        self._put(self.queue, 5)
+        start = time.monotonic()
+        self.queue.replay([CollectingOutlet()], rate=100)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04, 'Replay should be paced')
+
+    def test_replay_starts_outlets(self):
+        collecting = CollectingOutlet()
+        outlet = AsyncWriterOutlet(collecting)
+        self._put(self.queue, 3, outlet)
+        self.assertEqual(self.queue.replay([outlet]), (3, 0))
+        self.assertFalse(outlet.active, 'Outlets started for the replay should be shut down')
+        self.assertEqual(sum(len(records) for records, _ in collecting.pushed), 3, 'Records should be written before the replay completes')
+
+    def test_replay_active_outlet(self):
+        self._put(self.queue, 1)
+        outlet = CollectingOutlet()
+        outlet.try_start()
+        self.queue.replay([outlet])
+        self.assertTrue(outlet.active, 'Outlets already started should be left running')
+
+    def test_replay_async(self):
+        self._put(self.queue, 2)
+        outlet = CollectingOutlet()
+        self.assertEqual(asyncio.run(self.queue.replay_async([outlet])), (2, 0))
+
+    def test_cli(self):
+        self._put(self.queue, 2)
+        self.queue.close()
+        replay_outlets[:] = [CollectingOutlet()]
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                self.assertIsNone(main(['info', self.directory]))
+                self.assertEqual(main(['replay', self.directory, '--outlets', f'{__name__}:create_outlets']), 0)
+            self.assertIn('CollectingOutlet: 2 records', output.getvalue())
+            self.assertEqual(len(replay_outlets[0].pushed), 2)
+        finally:
+            replay_outlets.clear()
@@ -1,10 +1,13 @@
 import asyncio
+import pickle
 import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from unittest import TestCase
 
 from unittest.mock import MagicMock
 
 from databay import Inlet, Record
+from databay.errors import TransferTimeoutError
 
 
 class DummyInlet(Inlet):
@@ -38,6 +41,26 @@ class DummyMultiInlet(DummyInlet):
         return [a, b, c]
 
 
+class DummyThreadInlet(DummyInlet):
+    def pull(self, update):
+        self.thread = threading.current_thread()
+        return super().pull(update)
+
+
+class DummyGeneratorInlet(DummyInlet):
+    def pull(self, update):
+        self.threads = []
+        for i in range(3):
+            self.threads.append(threading.current_thread())
+            yield [i, i]
+
+
+class DummyAsyncGeneratorInlet(DummyInlet):
+    async def pull(self, update):
+        for i in range(3):
+            yield self.new_record(i)
+
+
 class DummyStartShutdownInlet(DummyInlet):
     start_called = False
     shutdown_called = False
@@ -109,6 +132,85 @@ class TestInlet(TestCase):
         self.assertIsInstance(rv[0], Record, 'Should return a record')
         self.assertEqual(len(rv), 3, 'Should return 3 records')
 
+    def test_pull_executor(self):
+        inlet = DummyThreadInlet()
+        with ThreadPoolExecutor(1) as executor:
+            rv = asyncio.run(inlet._pull(None, executor=executor))
+        self.assertIsInstance(rv[0], Record, 'Should wrap data in records')
+        self.assertIsNot(inlet.thread, threading.current_thread(), 'Should pull in the executor')
+
+    def test_pull_executor_override(self):
+        executor = ThreadPoolExecutor(1, thread_name_prefix='inlet_executor')
+        inlet = DummyThreadInlet(executor=executor)
+        with ThreadPoolExecutor(1, thread_name_prefix='link_executor') as link_executor:
+            asyncio.run(inlet._pull(None, executor=link_executor))
+        executor.shutdown()
+        self.assertTrue(inlet.thread.name.startswith('inlet_executor'), 'Inlet\'s executor should take precedence')
+
+    def test_pull_no_executor(self):
+        inlet = DummyThreadInlet()
+        asyncio.run(inlet._pull(None))
+        self.assertIs(inlet.thread, threading.current_thread(), 'Should pull on the current thread')
+
+    def test_pull_generator(self):
+        inlet = DummyGeneratorInlet()
+        rv = asyncio.run(inlet._pull(None))
+        self.assertEqual([record.payload for record in rv], [0, 0, 1, 1, 2, 2], 'Chunks should be joined')
+        self.assertIsInstance(rv[0], Record, 'Should wrap data in records')
+
+    def test_pull_async_generator(self):
+        inlet = DummyAsyncGeneratorInlet()
+        rv = asyncio.run(inlet._pull(None))
+        self.assertEqual([record.payload for record in rv], [0, 1, 2], 'Chunks should be joined')
+
+    def test_pull_chunks(self):
+        async def task(inlet):
+            return [chunk async for chunk in inlet._pull_chunks(None)]
+
+        chunks = asyncio.run(task(DummyGeneratorInlet()))
+        self.assertEqual([[record.payload for record in chunk] for chunk in chunks], [[0, 0], [1, 1], [2, 2]])
+        chunks = asyncio.run(task(DummyAsyncGeneratorInlet()))
+        self.assertEqual(len(chunks), 3, 'Each yielded record should be a chunk')
+        chunks = asyncio.run(task(DummyInlet()))
+        self.assertEqual(len(chunks), 1, 'Regular inlets should produce one chunk')
+
+    def test_pull_generator_executor(self):
+        inlet = DummyGeneratorInlet()
+        with ThreadPoolExecutor(1) as executor:
+            asyncio.run(inlet._pull(None, executor=executor))
+        self.assertNotIn(threading.current_thread(), inlet.threads, 'Should iterate the generator in the executor')
+
+    def test_pull_timeout(self):
+        class HangingInlet(DummyInlet):
+            async def pull(self, update):
+                await asyncio.sleep(10)
+
+        self.assertRaises(TransferTimeoutError, asyncio.run, HangingInlet()._pull(None, timeout=0.01))
+        self.assertRaises(TransferTimeoutError, asyncio.run, HangingInlet(timeout=0.01)._pull(None, timeout=10))
+
+    def test_pull_timeout_offload(self):
+        inlet = DummyThreadInlet()
+        rv = asyncio.run(inlet._pull(None, timeout=1))
+        self.assertIsInstance(rv[0], Record)
+        self.assertIsNot(inlet.thread, threading.current_thread(), 'Should pull in the executor, so that the pull can be abandoned')
+
+    def test_generator_process_pool(self):
+        inlet = DummyGeneratorInlet()
+
+        async def task(executor):
+            return [[record.payload for record in chunk] async for chunk in inlet._pull_chunks(None, executor=executor)]
+
+        with ProcessPoolExecutor(1) as executor:
+            self.assertEqual(asyncio.run(task(executor)), [[0, 0], [1, 1], [2, 2]], 'Generator should be drained within the worker process')
+
+    def test_pickle(self):
+        with ThreadPoolExecutor(1) as executor:
+            inlet = DummyInlet(executor=executor, metadata={'foo': 'bar'})
+            unpickled = pickle.loads(pickle.dumps(inlet))
+        self.assertEqual(unpickled.metadata, inlet.metadata)
+        self.assertIsNone(unpickled.executor)
+        self.assertIsNotNone(unpickled._thread_lock)
+
     def test_try_start(self):
         inlet = DummyStartShutdownInlet()
         inlet.try_start()
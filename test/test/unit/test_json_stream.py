@@ -0,0 +1,82 @@
+import json
+from unittest import TestCase, mock
+
+from databay.support.json_stream import JsonArrayDecoder, NdjsonDecoder, StreamFormat, create_decoder
+
+
+def decode(decoder, document: bytes, chunk_size: int):
+    chunks = []
+    for i in range(0, len(document), chunk_size):
+        chunks.append(decoder.feed(document[i:i + chunk_size]))
+    chunks.append(decoder.close())
+    return chunks
+
+
+class TestNdjsonDecoder(TestCase):
+
+    def test_decode(self):
+        document = b'{"a": 1}\n{"a": 2}\n\n{"a": 3}'
+        for chunk_size in [1, 3, 7, len(document)]:
+            chunks = decode(NdjsonDecoder(), document, chunk_size)
+            self.assertEqual([value for chunk in chunks for value in chunk], [{'a': 1}, {'a': 2}, {'a': 3}])
+
+    def test_incremental(self):
+        decoder = NdjsonDecoder()
+        self.assertEqual(decoder.feed(b'{"a": 1}\n{"a"'), [{'a': 1}], 'Complete lines should be decoded straight away')
+        self.assertEqual(decoder.feed(b': 2}\n'), [{'a': 2}])
+        self.assertEqual(decoder.close(), [])
+
+    def test_invalid(self):
+        decoder = NdjsonDecoder()
+        self.assertRaises(json.JSONDecodeError, decoder.feed, b'{"a": \n')
+
+
+class TestJsonArrayDecoder(TestCase):
+
+    def test_decode(self):
+        values = [{'a': [1, 2, {'b': 'x, ]y'}]}, 12345, -1.5e3, 'ąę', None, True, [], 'q"}\\', {'c': '\\"['}]
+        document = json.dumps(values, ensure_ascii=False).encode()
+        for chunk_size in [1, 2, 5, 16, len(document)]:
+            chunks = decode(JsonArrayDecoder(), document, chunk_size)
+            self.assertEqual([value for chunk in chunks for value in chunk], values, f'Chunk size: {chunk_size}')
+
+    def test_incremental(self):
+        decoder = JsonArrayDecoder()
+        self.assertEqual(decoder.feed(b'[{"a": 1}, {"a"'), [{'a': 1}], 'Complete elements should be decoded straight away')
+        self.assertEqual(decoder.feed(b': 2}, 12'), [{'a': 2}], 'Number at the end of a chunk could be incomplete')
+        self.assertEqual(decoder.feed(b'3]'), [123])
+        self.assertEqual(decoder.close(), [])
+
+    def test_large_element(self):
+        values = [{'items': [{'id': i, 'name': f'"item" {i}'} for i in range(2000)]}, 1]
+        document = json.dumps(values).encode()
+        decoder = JsonArrayDecoder()
+        with mock.patch.object(decoder._decoder, 'raw_decode', wraps=decoder._decoder.raw_decode) as raw_decode:
+            chunks = decode(decoder, document, 64)
+        self.assertEqual([value for chunk in chunks for value in chunk], values)
+        self.assertEqual(raw_decode.call_count, 2, 'Each element should be decoded once it is complete rather than on every chunk')
+
+    def test_invalid_element(self):
+        self.assertRaisesRegex(ValueError, 'delimiter', JsonArrayDecoder().feed, b'[12x, 3]')
+        self.assertRaises(json.JSONDecodeError, JsonArrayDecoder().feed, b'[{"a": ]}]')
+
+        decoder = JsonArrayDecoder()
+        decoder.feed(b'[{"a": [1')
+        self.assertRaises(json.JSONDecodeError, decoder.close)
+
+    def test_empty(self):
+        self.assertEqual(decode(JsonArrayDecoder(), b'', 4), [[]])
+        self.assertEqual(decode(JsonArrayDecoder(), b' [ ] ', 2), [[], [], [], []])
+
+    def test_invalid(self):
+        self.assertRaisesRegex(ValueError, 'not a JSON array', JsonArrayDecoder().feed, b'{"a": 1}')
+        self.assertRaisesRegex(ValueError, 'delimiter', JsonArrayDecoder().feed, b'[1 2]')
+        self.assertRaisesRegex(ValueError, 'Extra data', JsonArrayDecoder().feed, b'[1] 2')
+
+        decoder = JsonArrayDecoder()
+        decoder.feed(b'[1, 2')
+        self.assertRaisesRegex(ValueError, 'incomplete', decoder.close)
+
+    def test_create_decoder(self):
+        self.assertIsInstance(create_decoder(StreamFormat.NDJSON), NdjsonDecoder)
+        self.assertIsInstance(create_decoder(StreamFormat.JSON_ARRAY), JsonArrayDecoder)
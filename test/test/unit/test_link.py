@@ -1,14 +1,24 @@
 import asyncio
+import contextlib
+import functools
 import logging
+import tempfile
+import threading
+import time
 from asyncio import Future
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from unittest import TestCase, mock
 from unittest.mock import MagicMock, patch, call
 
 import databay
-from databay import Inlet, Outlet
-from databay.errors import InvalidNodeError
-from databay.link import Link
+from databay import Inlet, Outlet, Record
+from databay.errors import InvalidNodeError, TransferTimeoutError
+from databay.link import Link, OverrunPolicy
+from databay.support.circuit_breaker import CircuitBreaker, CircuitState
+from databay.support.dead_letter import DeadLetterQueue
+from databay.support.executors import TimeoutExecutor
+from databay.support.retry import RetryPolicy
 from test_utils import DummyException, fqname
 
 
@@ -46,6 +56,21 @@ class TestLink(TestCase):
         inlet._pull.assert_called()
         outlet._push.assert_called()
 
+    @patch(fqname(Outlet), spec=Outlet)
+    @patch(fqname(Inlet), spec=Inlet, _pull=pull_mock())
+    def test_transfer_event_loop(self, inlet, outlet):
+        link = Link([inlet], [outlet], timedelta(
+            seconds=1), tags='test_transfer_event_loop')
+        loop = asyncio.new_event_loop()
+
+        link.transfer(event_loop=loop)
+        link.transfer(event_loop=loop)
+
+        self.assertFalse(loop.is_closed(), 'Provided event loop should be left open')
+        self.assertEqual(inlet._pull.call_count, 2)
+        self.assertEqual(outlet._push.call_count, 2)
+        loop.close()
+
     @patch(fqname(Outlet), spec=Outlet)
     @patch(fqname(Inlet), spec=Inlet, _pull=pull_mock())
     def test_run(self, inlet, outlet):
@@ -61,6 +86,73 @@ class TestLink(TestCase):
 
         asyncio.run(task())
 
+    @patch(fqname(Outlet), spec=Outlet)
+    @patch(fqname(Outlet), spec=Outlet)
+    @patch(fqname(Inlet), spec=Inlet)
+    def test_copy_on_write(self, inlet, outlet1, outlet2):
+        record = Record(payload={'value': 1, 'nested': {'items': [1, 2]}})
+        inlet._pull = pull_mock([record])
+        received = []
+
+        async def push(records, update):
+            received.append(records)
+            records[0].payload['nested']['items'].append(3)
+
+        outlet1._push.side_effect = push
+        outlet2._push.side_effect = push
+        link = Link([inlet], [outlet1, outlet2], timedelta(seconds=1), copy_on_write=True)
+        link.transfer()
+
+        self.assertEqual(record.payload, {'value': 1, 'nested': {'items': [1, 2]}}, 'Original record should not be modified')
+        self.assertEqual(received[0][0].payload['nested']['items'], [1, 2, 3])
+        self.assertEqual(received[1][0].payload['nested']['items'], [1, 2, 3], 'Outlets should not share modifications')
+        self.assertIsNot(received[0][0], record)
+
+    @patch(fqname(Outlet), spec=Outlet)
+    @patch(fqname(Outlet), spec=Outlet)
+    @patch(fqname(Outlet), spec=Outlet)
+    @patch(fqname(Inlet), spec=Inlet)
+    def test_copy_mutating_outlets_only(self, inlet, outlet1, outlet2, outlet3):
+        record = Record(payload={'value': 1})
+        inlet._pull = pull_mock([record])
+        outlet1.mutates_records = False
+        outlet2.mutates_records = False
+        outlet3.mutates_records = True
+        link = Link([inlet], [outlet1, outlet2, outlet3], timedelta(seconds=1))
+        link.transfer()
+
+        shared = outlet1._push.call_args[0][0]
+        self.assertIs(shared[0], record, 'Non-mutating outlets should receive the original records')
+        self.assertIs(outlet2._push.call_args[0][0], shared, 'Non-mutating outlets should share the batch')
+        copied = outlet3._push.call_args[0][0]
+        self.assertIsNot(copied[0], record, 'Mutating outlets should receive a copy')
+        self.assertEqual(copied[0].payload, record.payload)
+
+    def test_copy_outlets_with_processors(self):
+        class ReadingOutlet(Outlet):
+            mutates_records = False
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.received = []
+
+            def push(self, records, update):
+                self.received.append([record.payload for record in records])
+
+        def redact(records):
+            for record in records:
+                record.payload['value'] = 'REDACTED'
+            return records
+
+        inlet = MagicMock(spec=Inlet)
+        inlet._pull = pull_mock([Record(payload={'value': 1})])
+        redacting, reading = ReadingOutlet(processors=redact), ReadingOutlet()
+        link = Link([inlet], [redacting, reading], timedelta(seconds=1))
+        link.transfer()
+
+        self.assertEqual(redacting.received, [[{'value': 'REDACTED'}]])
+        self.assertEqual(reading.received, [[{'value': 1}]], 'Processors of one outlet should not modify the records of another')
+
     @patch(fqname(Outlet), spec=Outlet)
     @patch(fqname(Inlet), spec=Inlet, _pull=pull_mock())
     def test_exception_inlet(self, inlet, outlet):
@@ -498,6 +590,632 @@ class TestLink(TestCase):
 
         asyncio.run(task())
 
+    @patch(fqname(Outlet), spec=Outlet)
+    def test_streaming(self, outlet):
+        events = []
+
+        class SlowInlet(Inlet):
+            async def pull(self, update):
+                await asyncio.sleep(0.05)
+                events.append('slow pulled')
+                return 'slow'
+
+        class FastInlet(Inlet):
+            async def pull(self, update):
+                events.append('fast pulled')
+                return 'fast'
+
+        async def push(records, update):
+            events.append(f'pushed {[record.payload for record in records]}')
+
+        outlet._push.side_effect = push
+        processor = MagicMock(side_effect=lambda records: records)
+
+        link = Link([SlowInlet(), FastInlet()], [outlet], timedelta(seconds=1), processors=processor, streaming=True)
+        link.transfer()
+
+        self.assertEqual(events, ['fast pulled', "pushed ['fast']", 'slow pulled', "pushed ['slow']"],
+                         'Records of the fast inlet should be pushed before the slow inlet completes')
+        self.assertEqual(processor.call_count, 2, 'Processors should be called for each inlet')
+
+    @patch(fqname(Outlet), spec=Outlet)
+    def test_streaming_chunks(self, outlet):
+        events = []
+
+        class ChunkInlet(Inlet):
+            async def pull(self, update):
+                for i in range(5):
+                    events.append(f'pulled {i}')
+                    yield [i, i]
+
+        async def push(records, update):
+            events.append(f'pushed {[record.payload for record in records]}')
+
+        outlet._push.side_effect = push
+        link = Link([ChunkInlet()], [outlet], timedelta(seconds=1), streaming=True)
+        link.transfer()
+
+        self.assertEqual(outlet._push.call_count, 5, 'Each chunk should be pushed separately')
+        self.assertLess(events.index('pushed [0, 0]'), events.index('pulled 4'), 'Chunks should be pushed while the inlet is still pulling')
+
+    @patch(fqname(Outlet), spec=Outlet)
+    def test_streaming_exception(self, outlet):
+        finished = []
+
+        class FailingInlet(Inlet):
+            async def pull(self, update):
+                raise DummyException('Test exception')
+
+        class SlowInlet(Inlet):
+            async def pull(self, update):
+                await asyncio.sleep(0.05)
+                finished.append(True)
+                return 'slow'
+
+        link = Link([FailingInlet(), SlowInlet()], [outlet], timedelta(seconds=1), streaming=True)
+
+        self.assertRaises(DummyException, link.transfer)
+        self.assertEqual(finished, [], 'Remaining inlets should be cancelled')
+        outlet._push.assert_not_called()
+
+    @patch(fqname(Outlet), spec=Outlet)
+    def test_streaming_exception_ignored(self, outlet):
+        class FailingInlet(Inlet):
+            def pull(self, update):
+                yield 1
+                raise DummyException('Test exception')
+
+        link = Link([FailingInlet()], [outlet], timedelta(seconds=1), streaming=True, ignore_exceptions=True)
+
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING') as cm:
+            link.transfer()
+            self.assertTrue('Test exception' in ';'.join(cm.output))
+        self.assertEqual(outlet._push.call_count, 1, 'Chunks yielded before the exception should be pushed')
+
+    def test_batch_concurrency(self):
+        received = {'unordered': [], 'ordered': []}
+
+        class SlowOutlet(Outlet):
+            def __init__(self, name, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.name = name
+
+            async def push(self, records, update):
+                # earlier batches take longer to push
+                await asyncio.sleep(0.03 * (3 - records[0].payload))
+                received[self.name].append(records[0].payload)
+
+        class BatchInlet(Inlet):
+            def pull(self, update):
+                return [0, 1, 2]
+
+        def grouper(batches):
+            return [[record] for record in batches[0]]
+
+        link = Link(BatchInlet(), [SlowOutlet('unordered'), SlowOutlet('ordered', preserve_batch_order=True)],
+                    timedelta(seconds=1), groupers=grouper, batch_concurrency=3)
+        link.transfer()
+
+        self.assertEqual(received['unordered'], [2, 1, 0], 'Batches should be pushed concurrently')
+        self.assertEqual(received['ordered'], [0, 1, 2], 'Ordered outlet should receive batches in order')
+
+    @patch(fqname(Outlet), spec=Outlet)
+    @patch(fqname(Inlet), spec=Inlet, _pull=pull_mock([1, 2, 3, 4]))
+    def test_batch_concurrency_limit(self, inlet, outlet):
+        counter = {'value': 0, 'max': 0}
+
+        async def slow_push(records, update):
+            counter['value'] += 1
+            counter['max'] = max(counter['max'], counter['value'])
+            await asyncio.sleep(0.01)
+            counter['value'] -= 1
+
+        outlet._push.side_effect = slow_push
+        outlet.preserve_batch_order = False
+
+        link = Link([inlet], [outlet], timedelta(seconds=1), groupers=lambda batches: [[r] for r in batches[0]], batch_concurrency=2)
+        link.transfer()
+
+        self.assertEqual(outlet._push.call_count, 4)
+        self.assertEqual(counter['max'], 2, 'Only 2 batches should be pushed at a time')
+
+    def test_adaptive_interval(self):
+        data = {'records': []}
+
+        class VariableInlet(Inlet):
+            def pull(self, update):
+                return data['records']
+
+        link = Link(VariableInlet(), MagicMock(spec=Outlet), 10, max_interval=60)
+        self.assertEqual(link.min_interval, timedelta(seconds=10), 'Minimum interval should default to the interval')
+
+        link.transfer()
+        self.assertEqual(link.interval, timedelta(seconds=20), 'Interval should back off without records')
+        link.transfer()
+        link.transfer()
+        self.assertEqual(link.interval, timedelta(seconds=60), 'Interval should not exceed the maximum')
+
+        data['records'] = [1]
+        link.transfer()
+        self.assertEqual(link.interval, timedelta(seconds=30), 'Interval should speed up with records')
+        link.transfer()
+        link.transfer()
+        self.assertEqual(link.interval, timedelta(seconds=10), 'Interval should not drop below the minimum')
+
+    def test_adaptive_interval_streaming(self):
+        class EmptyInlet(Inlet):
+            def pull(self, update):
+                yield []
+
+        link = Link(EmptyInlet(), MagicMock(spec=Outlet), 10, min_interval=5, max_interval=100, backoff_factor=3, streaming=True)
+        link.transfer()
+        self.assertEqual(link.interval, timedelta(seconds=30))
+
+    @patch(fqname(Outlet), spec=Outlet)
+    @patch(fqname(Inlet), spec=Inlet, _pull=pull_mock([]))
+    def test_fixed_interval(self, inlet, outlet):
+        link = Link([inlet], [outlet], timedelta(seconds=10))
+        link.transfer()
+        self.assertEqual(link.interval, timedelta(seconds=10), 'Interval should not change without max_interval')
+
+    def test_pull_timeout(self):
+        class HangingInlet(Inlet):
+            async def pull(self, update):
+                await asyncio.sleep(10)
+
+        outlet = MagicMock(spec=Outlet)
+        link = Link(HangingInlet(), outlet, timedelta(seconds=1), pull_timeout=0.02)
+        start = time.monotonic()
+        self.assertRaises(TransferTimeoutError, link.transfer)
+        self.assertLess(time.monotonic() - start, 1, 'Pull should be cancelled')
+        self.assertEqual(link.timeouts, 1)
+        outlet._push.assert_not_called()
+
+    def test_pull_timeout_sync(self):
+        release = threading.Event()
+
+        class HangingInlet(Inlet):
+            def pull(self, update):
+                release.wait(2)
+                return 1
+
+        link = Link(HangingInlet(), MagicMock(spec=Outlet), timedelta(seconds=1), pull_timeout=0.02, ignore_exceptions=True)
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING') as cm:
+            link.transfer()
+            self.assertTrue('exceeded the timeout' in ';'.join(cm.output))
+        release.set()
+        self.assertEqual(link.timeouts, 1, 'Synchronous pull should be abandoned')
+
+    def test_pull_timeout_hung_inlet_isolated(self):
+        release = threading.Event()
+
+        class HangingInlet(Inlet):
+            def pull(self, update):
+                release.wait(2)
+                return 1
+
+        class ValueInlet(Inlet):
+            def pull(self, update):
+                return 1
+
+        hung, healthy = HangingInlet(), ValueInlet()
+        hung._timeout_executor = TimeoutExecutor(hung, max_workers=1)
+        hung_link = Link(hung, MagicMock(spec=Outlet), timedelta(seconds=1), pull_timeout=0.02, ignore_exceptions=True)
+        healthy_link = Link(healthy, MagicMock(spec=Outlet), timedelta(seconds=1), pull_timeout=0.5, ignore_exceptions=True)
+        try:
+            with self.assertLogs(logging.getLogger('databay'), level='WARNING') as cm:
+                for _ in range(3):
+                    hung_link.transfer()
+            self.assertIn('workers running synchronous calls of', ';'.join(cm.output), 'Saturated executor should be logged')
+            healthy_link.transfer()
+        finally:
+            release.set()
+
+        self.assertEqual(hung_link.timeouts, 3)
+        self.assertEqual(healthy_link.timeouts, 0, 'Calls abandoned by one inlet should not hold up other inlets')
+
+    def test_pull_timeout_inlet_override(self):
+        class SlowInlet(Inlet):
+            async def pull(self, update):
+                await asyncio.sleep(0.05)
+                return 1
+
+        link = Link(SlowInlet(timeout=1), MagicMock(spec=Outlet), timedelta(seconds=1), pull_timeout=0.01)
+        link.transfer()
+        self.assertEqual(link.timeouts, 0, 'Inlet\'s timeout should take precedence')
+
+    def test_push_timeout(self):
+        class HangingOutlet(Outlet):
+            async def push(self, records, update):
+                await asyncio.sleep(10)
+
+        class FastOutlet(Outlet):
+            def push(self, records, update):
+                self.records = records
+
+        class ValueInlet(Inlet):
+            def pull(self, update):
+                return 1
+
+        fast_outlet = FastOutlet()
+        link = Link(ValueInlet(), [HangingOutlet(timeout=0.02), fast_outlet], timedelta(seconds=1), ignore_exceptions=True)
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING'):
+            link.transfer()
+        self.assertEqual(link.timeouts, 1)
+        self.assertEqual(len(fast_outlet.records), 1, 'Other outlets should receive the records')
+
+    def test_transfer_timeout(self):
+        class SlowInlet(Inlet):
+            async def pull(self, update):
+                await asyncio.sleep(0.02)
+                return 1
+
+        class SlowOutlet(Outlet):
+            async def push(self, records, update):
+                await asyncio.sleep(0.02)
+
+        link = Link(SlowInlet(), SlowOutlet(), timedelta(seconds=1), pull_timeout=1, push_timeout=1, transfer_timeout=0.03)
+        self.assertRaises(TransferTimeoutError, link.transfer)
+        self.assertEqual(link.timeouts, 1)
+
+        link._ignore_exceptions = True
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING'):
+            link.transfer()
+        self.assertEqual(link.timeouts, 2)
+
+    def test_node_own_timeout(self):
+        error = TimeoutError('upstream read timed out')
+
+        class TimingOutInlet(Inlet):
+            async def pull(self, update):
+                raise error
+
+        class ValueInlet(Inlet):
+            def pull(self, update):
+                return 1
+
+        class TimingOutOutlet(Outlet):
+            async def push(self, records, update):
+                raise error
+
+        for streaming in [False, True]:
+            link = Link(TimingOutInlet(), MagicMock(spec=Outlet), timedelta(seconds=1), pull_timeout=10, transfer_timeout=10, streaming=streaming)
+            with self.assertRaises(TimeoutError) as cm:
+                link.transfer()
+            self.assertIs(cm.exception, error, 'Timeout raised by the inlet should not be reported as exceeding the timeout')
+            self.assertEqual(link.timeouts, 0)
+
+        link = Link(ValueInlet(), TimingOutOutlet(), timedelta(seconds=1), push_timeout=10, transfer_timeout=10)
+        with self.assertRaises(TimeoutError) as cm:
+            link.transfer()
+        self.assertIs(cm.exception, error, 'Timeout raised by the outlet should not be reported as exceeding the timeout')
+        self.assertEqual(link.timeouts, 0)
+
+    def test_pull_timeout_streaming(self):
+        class ChunkInlet(Inlet):
+            async def pull(self, update):
+                for delay in [0.01, 0.01, 10]:
+                    await asyncio.sleep(delay)
+                    yield delay
+
+        outlet = MagicMock(spec=Outlet)
+        link = Link(ChunkInlet(), outlet, timedelta(seconds=1), pull_timeout=0.05, streaming=True, ignore_exceptions=True)
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING'):
+            link.transfer()
+        self.assertEqual(outlet._push.call_count, 2, 'Chunks produced in time should be pushed')
+        self.assertEqual(link.timeouts, 1)
+
+    def test_retry_policy(self):
+        events = []
+
+        class FlakyOutlet(Outlet):
+            attempts = 0
+
+            async def push(self, records, update):
+                self.attempts += 1
+                if self.attempts == 1:
+                    raise DummyException('Flaky push')
+                events.append('flaky pushed')
+
+        class FastOutlet(Outlet):
+            async def push(self, records, update):
+                events.append('fast pushed')
+
+        class ValueInlet(Inlet):
+            def pull(self, update):
+                return 1
+
+        link = Link(ValueInlet(), [FlakyOutlet(), FastOutlet()], timedelta(seconds=1), retry_policy=RetryPolicy(base=0.02))
+        with self.assertLogs(logging.getLogger('databay.Outlet'), level='WARNING'):
+            link.transfer()
+        self.assertEqual(events, ['fast pushed', 'flaky pushed'], 'Retries should not hold up other outlets')
+
+    def test_dead_letter_queue(self):
+        class FailingOutlet(Outlet):
+            def push(self, records, update):
+                raise DummyException('Push failed')
+
+        class ValueInlet(Inlet):
+            def pull(self, update):
+                return [1, 2]
+
+        with tempfile.TemporaryDirectory() as directory:
+            queue = DeadLetterQueue(directory)
+            link = Link(ValueInlet(), FailingOutlet(), timedelta(seconds=1), tags='dlq', dead_letter_queue=queue, ignore_exceptions=True)
+            with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING'):
+                link.transfer()
+            dead_letters = list(queue)
+            queue.close()
+
+        self.assertEqual(len(dead_letters), 1)
+        self.assertEqual([record.payload for record in dead_letters[0].records], [1, 2])
+        self.assertEqual(str(dead_letters[0].update), 'dlq.0')
+
+    def _circuit_link(self, **kwargs):
+        class FailingInlet(Inlet):
+            pulls = 0
+
+            def pull(self, update):
+                self.pulls += 1
+                raise DummyException('Pull failed')
+
+        class ValueInlet(Inlet):
+            def pull(self, update):
+                return 1
+
+        failing, healthy = FailingInlet(), ValueInlet()
+        outlet = MagicMock(spec=Outlet)
+        return Link([failing, healthy], outlet, timedelta(seconds=1), ignore_exceptions=True, **kwargs), failing, outlet
+
+    def test_circuit_breaker_inlet(self):
+        link, failing, outlet = self._circuit_link(circuit_breaker=CircuitBreaker(failure_threshold=2, probe_interval=0.05))
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING') as cm:
+            for _ in range(4):
+                link.transfer()
+        self.assertIn('Circuit opened for', ';'.join(cm.output))
+        self.assertEqual(failing.pulls, 2, 'Inlet should be skipped while its circuit is open')
+        self.assertEqual(outlet._push.call_count, 4, 'Healthy inlets should not be affected')
+        self.assertEqual(link._get_circuit_breaker(failing).state, CircuitState.OPEN)
+
+        time.sleep(0.06)
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING'):
+            link.transfer()
+        self.assertEqual(failing.pulls, 3, 'Inlet should be probed once the probe interval elapses')
+
+    def test_circuit_breaker_streaming(self):
+        link, failing, outlet = self._circuit_link(circuit_breaker=CircuitBreaker(failure_threshold=1, probe_interval=10), streaming=True)
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING'):
+            for _ in range(3):
+                link.transfer()
+        self.assertEqual(failing.pulls, 1)
+        self.assertEqual(outlet._push.call_count, 3)
+
+    def test_circuit_breaker_per_node(self):
+        link, failing, _ = self._circuit_link(circuit_breaker=CircuitBreaker(failure_threshold=1))
+        healthy = link.inlets[1]
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING'):
+            link.transfer()
+        self.assertEqual(link._get_circuit_breaker(failing).state, CircuitState.OPEN)
+        self.assertEqual(link._get_circuit_breaker(healthy).state, CircuitState.CLOSED, 'Each node should have its own circuit')
+
+        own = CircuitBreaker(failure_threshold=3)
+        healthy.circuit_breaker = own
+        self.assertIs(link._get_circuit_breaker(healthy), own, 'Node circuit breaker should override the link one')
+
+    def test_circuit_breaker_outlet(self):
+        class FailingOutlet(Outlet):
+            pushes = 0
+
+            def push(self, records, update):
+                self.pushes += 1
+                raise DummyException('Push failed')
+
+        class ValueInlet(Inlet):
+            def pull(self, update):
+                return 1
+
+        outlet = FailingOutlet(circuit_breaker=CircuitBreaker(failure_threshold=1, probe_interval=10))
+        with tempfile.TemporaryDirectory() as directory:
+            queue = DeadLetterQueue(directory)
+            link = Link(ValueInlet(), outlet, timedelta(seconds=1), dead_letter_queue=queue, ignore_exceptions=True)
+            with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING'):
+                link.transfer()
+            link.transfer()
+            dead_letters = list(queue)
+            queue.close()
+
+        self.assertEqual(outlet.pushes, 1, 'Outlet should be skipped while its circuit is open')
+        self.assertEqual(len(dead_letters), 2, 'Skipped pushes should be stored as dead letters')
+        self.assertIn('CircuitOpenError', dead_letters[1].error)
+
+    def test_circuit_breaker_outlet_dropped(self):
+        class FailingOutlet(Outlet):
+            def push(self, records, update):
+                raise DummyException('Push failed')
+
+        class ValueInlet(Inlet):
+            def pull(self, update):
+                return 1
+
+        outlet = FailingOutlet(circuit_breaker=CircuitBreaker(failure_threshold=1, probe_interval=10))
+        link = Link(ValueInlet(), outlet, timedelta(seconds=1), ignore_exceptions=True)
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING'):
+            link.transfer()
+        self.assertEqual(link.dropped_batches, 0, 'Failed pushes should not count as dropped')
+
+        with self.assertLogs(logging.getLogger('databay.Link'), level='WARNING') as cm:
+            link.transfer()
+            link.transfer()
+        self.assertIn('Dropping 1 record(s)', ';'.join(cm.output))
+        self.assertEqual(link.dropped_batches, 2, 'Batches skipped with no dead letter queue should be counted')
+
+    def _overrun_link(self, overrun_policy):
+        class SlowInlet(Inlet):
+            pulls = 0
+            started = threading.Event()
+            release = None  # pulls wait for this event if set, otherwise they take 0.05s
+
+            async def pull(self, update):
+                SlowInlet.pulls += 1
+                SlowInlet.started.set()
+                if SlowInlet.release is None:
+                    await asyncio.sleep(0.05)
+                else:
+                    await asyncio.get_running_loop().run_in_executor(None, SlowInlet.release.wait, 2)
+                return []
+
+        return Link(SlowInlet(), MagicMock(spec=Outlet), timedelta(seconds=1), overrun_policy=overrun_policy), SlowInlet
+
+    def _overrun(self, link, count):
+        """ Run the count transfers while the first transfer is still pulling, only letting it finish once the overrun policy handled all of them. """
+        inlet_kls = type(link.inlets[0])
+        inlet_kls.release = threading.Event()
+        handled = threading.Semaphore(0)
+        admit_transfer = link._admit_transfer
+
+        def counting_admit_transfer(start_queued):
+            try:
+                return admit_transfer(start_queued)
+            finally:
+                handled.release()
+
+        link._admit_transfer = counting_admit_transfer
+        first = threading.Thread(target=link.transfer)
+        first.start()
+        self.assertTrue(inlet_kls.started.wait(2), 'First transfer should start pulling')
+
+        threads = [threading.Thread(target=link.transfer) for _ in range(count)]
+        for th in threads:
+            th.start()
+        for _ in range(count + 1):
+            self.assertTrue(handled.acquire(timeout=2), 'Overrunning transfers should be handled by the overrun policy')
+
+        inlet_kls.release.set()
+        for th in [first] + threads:
+            th.join(timeout=2)
+
+    def test_overrun_allow(self):
+        link, inlet_kls = self._overrun_link(OverrunPolicy.ALLOW)
+        self._overrun(link, 2)
+        self.assertEqual(inlet_kls.pulls, 3, 'All transfers should run')
+
+    def test_overrun_skip(self):
+        link, inlet_kls = self._overrun_link(OverrunPolicy.SKIP)
+        self._overrun(link, 2)
+        self.assertEqual(inlet_kls.pulls, 1, 'Overrunning transfers should be skipped')
+        self.assertEqual(link.skipped_transfers, 2)
+
+    def test_overrun_queue_one(self):
+        link, inlet_kls = self._overrun_link(OverrunPolicy.QUEUE_ONE)
+        self._overrun(link, 3)
+        self.assertEqual(inlet_kls.pulls, 2, 'One transfer should be queued')
+        self.assertEqual(link.skipped_transfers, 2)
+
+    def test_overrun_coalesce(self):
+        link, inlet_kls = self._overrun_link(OverrunPolicy.COALESCE)
+        self._overrun(link, 3)
+        self.assertEqual(inlet_kls.pulls, 2, 'Overrunning transfers should be coalesced into one')
+        self.assertEqual(link.coalesced_transfers, 3)
+        self.assertEqual(link.skipped_transfers, 0)
+
+    def test_overrun_exception(self):
+        link, inlet_kls = self._overrun_link(OverrunPolicy.SKIP)
+        link.inlets[0].pull = MagicMock(side_effect=DummyException())
+        link.inlets[0]._uses_coroutine = False
+        self.assertRaises(DummyException, link.transfer)
+        self.assertRaises(DummyException, link.transfer)
+        self.assertEqual(link.skipped_transfers, 0, 'Failed transfers should release the link')
+
+    def _slot(self):
+        slots = {'entered': 0, 'held': 0, 'max_held': 0}
+
+        @contextlib.contextmanager
+        def slot():
+            slots['entered'] += 1
+            slots['held'] += 1
+            slots['max_held'] = max(slots['max_held'], slots['held'])
+            try:
+                yield
+            finally:
+                slots['held'] -= 1
+
+        return slot, slots
+
+    def test_overrun_slot(self):
+        for overrun_policy, entered in [(OverrunPolicy.SKIP, 1), (OverrunPolicy.QUEUE_ONE, 2), (OverrunPolicy.COALESCE, 2)]:
+            with self.subTest(overrun_policy=overrun_policy):
+                link, inlet_kls = self._overrun_link(overrun_policy)
+                slot, slots = self._slot()
+                link.transfer = functools.partial(link.transfer, slot=slot)
+                self._overrun(link, 3)
+                self.assertEqual(slots['entered'], entered, 'Only transfers let through by the overrun policy should take a slot')
+                self.assertEqual(slots['max_held'], 1, 'Queued transfers should not hold a slot while waiting')
+                self.assertEqual(slots['held'], 0)
+
+    def test_overrun_slot_async(self):
+        link, inlet_kls = self._overrun_link(OverrunPolicy.QUEUE_ONE)
+        entered = []
+
+        @contextlib.asynccontextmanager
+        async def slot():
+            entered.append(inlet_kls.pulls)
+            yield
+
+        async def task():
+            await asyncio.gather(*[link.transfer_async(slot=slot) for _ in range(3)])
+
+        asyncio.run(task())
+        self.assertEqual(entered, [0, 1], 'Queued transfer should take its slot once the running one finished')
+
+    def test_overrun_async(self):
+        link, inlet_kls = self._overrun_link(OverrunPolicy.QUEUE_ONE)
+
+        async def task():
+            await asyncio.gather(*[link.transfer_async() for _ in range(3)])
+
+        asyncio.run(task())
+        self.assertEqual(inlet_kls.pulls, 2, 'One transfer should be queued')
+        self.assertEqual(link.skipped_transfers, 1)
+
+    def test_overrun_async_cancelled(self):
+        link, inlet_kls = self._overrun_link(OverrunPolicy.QUEUE_ONE)
+
+        async def task():
+            running = asyncio.ensure_future(link.transfer_async())
+            await asyncio.sleep(0.01)
+            queued = asyncio.ensure_future(link.transfer_async())
+            await asyncio.sleep(0.01)
+            queued.cancel()
+            await asyncio.gather(running, queued, return_exceptions=True)
+            await link.transfer_async()
+
+        asyncio.run(task())
+        self.assertEqual(inlet_kls.pulls, 2, 'Cancelled transfer should not block the link')
+        self.assertEqual(link.skipped_transfers, 0)
+
+    def test_executor(self):
+        class SlowInlet(Inlet):
+            def pull(self, update):
+                time.sleep(0.05)
+                return 1
+
+        class SlowOutlet(Outlet):
+            def push(self, records, update):
+                time.sleep(0.05)
+                self.records = records
+
+        inlets = [SlowInlet() for _ in range(4)]
+        outlets = [SlowOutlet() for _ in range(4)]
+        with ThreadPoolExecutor(8) as executor:
+            link = Link(inlets, outlets, timedelta(seconds=1), tags='test_executor', executor=executor)
+            start = time.time()
+            link.transfer()
+            elapsed = time.time() - start
+
+        self.assertLess(elapsed, 0.3, 'Synchronous inlets and outlets should run concurrently')
+        for outlet in outlets:
+            self.assertEqual([r.payload for r in outlet.records], [1, 1, 1, 1])
+
     @patch(fqname(Outlet), spec=Outlet)
     @patch(fqname(Inlet), spec=Inlet)
     def test_processors_one(self, inlet, outlet):
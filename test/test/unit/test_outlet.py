@@ -1,10 +1,15 @@
 import asyncio
+import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, mock
 from unittest.mock import MagicMock
 
 
 from databay import Outlet, Record, Update
+from databay.errors import TransferTimeoutError
+from databay.support.retry import RetryPolicy
+from test_utils import DummyException
 
 
 class DummyOutlet(Outlet):
@@ -12,6 +17,12 @@ class DummyOutlet(Outlet):
         self.records = records
 
 
+class DummyThreadOutlet(DummyOutlet):
+    def push(self, records, update):
+        self.thread = threading.current_thread()
+        super().push(records, update)
+
+
 class DummyAsyncOutlet(DummyOutlet):
     async def push(self, records, update):
         self.records = records
@@ -45,6 +56,94 @@ class TestOutlet(TestCase):
 
         self.assertEqual(outlet.records, records)
 
+    def test_push_executor(self):
+        outlet = DummyThreadOutlet()
+        records = [Record(None), Record(None)]
+        with ThreadPoolExecutor(1) as executor:
+            asyncio.run(outlet._push(records, update_mock, executor=executor))
+
+        self.assertEqual(outlet.records, records)
+        self.assertIsNot(outlet.thread, threading.current_thread(), 'Should push in the executor')
+
+    def test_push_executor_override(self):
+        executor = ThreadPoolExecutor(1, thread_name_prefix='outlet_executor')
+        outlet = DummyThreadOutlet(executor=executor)
+        with ThreadPoolExecutor(1, thread_name_prefix='link_executor') as link_executor:
+            asyncio.run(outlet._push([Record(None)], update_mock, executor=link_executor))
+        executor.shutdown()
+        self.assertTrue(outlet.thread.name.startswith('outlet_executor'), 'Outlet\'s executor should take precedence')
+
+    def test_push_timeout(self):
+        class HangingOutlet(DummyOutlet):
+            async def push(self, records, update):
+                await asyncio.sleep(10)
+
+        self.assertRaises(TransferTimeoutError, asyncio.run, HangingOutlet()._push([Record(None)], update_mock, timeout=0.01))
+        self.assertRaises(TransferTimeoutError, asyncio.run, HangingOutlet(timeout=0.01)._push([Record(None)], update_mock, timeout=10))
+
+    def test_push_timeout_offload(self):
+        outlet = DummyThreadOutlet()
+        asyncio.run(outlet._push([Record(None)], update_mock, timeout=1))
+        self.assertIsNot(outlet.thread, threading.current_thread(), 'Should push in the executor, so that the push can be abandoned')
+
+    def test_push_retry(self):
+        class FlakyOutlet(DummyOutlet):
+            attempts = 0
+
+            def push(self, records, update):
+                self.attempts += 1
+                if self.attempts < 3:
+                    raise DummyException('Flaky push')
+                super().push(records, update)
+
+        processor = MagicMock(side_effect=lambda r: r)
+        outlet = FlakyOutlet(processors=processor)
+        records = [Record(None)]
+        with self.assertLogs(logging.getLogger('databay.Outlet'), level='WARNING') as cm:
+            asyncio.run(outlet._push(records, update_mock, retry_policy=RetryPolicy(max_attempts=3, base=0.001)))
+            self.assertTrue('Flaky push' in ';'.join(cm.output))
+        self.assertEqual(outlet.attempts, 3)
+        self.assertEqual(outlet.records, records)
+        processor.assert_called_once()
+
+    def test_push_retry_exhausted(self):
+        class FailingOutlet(DummyOutlet):
+            attempts = 0
+
+            def push(self, records, update):
+                self.attempts += 1
+                raise DummyException()
+
+        outlet = FailingOutlet(retry_policy=RetryPolicy(max_attempts=2, base=0.001))
+        with self.assertLogs(logging.getLogger('databay.Outlet'), level='WARNING'):
+            self.assertRaises(DummyException, asyncio.run, outlet._push([Record(None)], update_mock, retry_policy=RetryPolicy(max_attempts=5)))
+        self.assertEqual(outlet.attempts, 2, 'Outlet\'s retry policy should take precedence')
+
+    def test_push_retry_not_retryable(self):
+        class FailingOutlet(DummyOutlet):
+            attempts = 0
+
+            def push(self, records, update):
+                self.attempts += 1
+                raise ValueError()
+
+        outlet = FailingOutlet()
+        self.assertRaises(ValueError, asyncio.run, outlet._push([Record(None)], update_mock, retry_policy=RetryPolicy(retry_on=DummyException)))
+        self.assertEqual(outlet.attempts, 1)
+
+    def test_mutates_records(self):
+        self.assertTrue(DummyOutlet().mutates_records, 'Outlets should be assumed to modify records by default')
+        self.assertFalse(DummyOutlet(mutates_records=False).mutates_records)
+        self.assertTrue(DummyOutlet().mutates_records, 'Override should not change the class attribute')
+
+    def test_mutates_records_processors(self):
+        class ReadingOutlet(DummyOutlet):
+            mutates_records = False
+
+        self.assertFalse(ReadingOutlet().mutates_records)
+        self.assertTrue(ReadingOutlet(processors=lambda r: r).mutates_records, 'Processors should be assumed to modify records')
+        self.assertFalse(ReadingOutlet(processors=lambda r: r, mutates_records=False).mutates_records)
+
     def test_try_start(self):
         outlet = DummyStartShutdownOutlet()
         outlet.try_start()
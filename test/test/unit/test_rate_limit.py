@@ -0,0 +1,35 @@
+import asyncio
+import time
+from unittest import TestCase
+
+from databay.support.rate_limit import TokenBucket
+
+
+class TestTokenBucket(TestCase):
+
+    def test_burst(self):
+        bucket = TokenBucket(rate=10, capacity=3)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0], 'Tokens up to capacity should be available at once')
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.01)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.01, msg='Waiting acquisitions should be queued')
+
+    def test_refill(self):
+        bucket = TokenBucket(rate=100)
+        bucket.acquire()
+        time.sleep(0.02)
+        self.assertEqual(bucket.reserve(), 0, 'Tokens should be added over time')
+
+    def test_acquire_async(self):
+        bucket = TokenBucket(rate=100)
+
+        async def task():
+            start = time.monotonic()
+            for _ in range(5):
+                await bucket.acquire_async()
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(task()), 0.035)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, TokenBucket, 0)
+        self.assertRaises(ValueError, TokenBucket, 1, 0.5)
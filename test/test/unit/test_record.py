@@ -0,0 +1,109 @@
+import copy
+import pickle
+from unittest import TestCase
+
+from databay import Record
+from databay.record import copy_on_write
+
+
+class TestRecord(TestCase):
+
+    def setUp(self):
+        self.payload = {'a': 1, 'nested': {'b': [1, 2, {'c': 3}]}, 'items': [[1], [2]]}
+        self.original = copy.deepcopy(self.payload)
+
+    def test_copy_on_write_equal(self):
+        cow = copy_on_write(self.payload)
+        self.assertEqual(cow, self.payload)
+        self.assertIsInstance(cow, dict)
+
+    def test_copy_on_write_shares_until_accessed(self):
+        cow = copy_on_write(self.payload)
+        self.assertIs(dict.__getitem__(cow, 'nested'), self.payload['nested'], 'Nested values should be shared until accessed')
+
+    def test_copy_on_write_nested_modification(self):
+        cow = copy_on_write(self.payload)
+        cow['nested']['b'][2]['c'] = 4
+        cow['nested']['b'].append(5)
+        cow['items'][0].append(2)
+        cow['a'] = 2
+        del cow['items']
+        self.assertEqual(self.payload, self.original, 'Original should not be modified')
+        self.assertEqual(cow, {'a': 2, 'nested': {'b': [1, 2, {'c': 4}, 5]}})
+
+    def test_copy_on_write_access_methods(self):
+        cow = copy_on_write(self.payload)
+        cow.get('nested')['b'].append(3)
+        for value in cow.values():
+            if isinstance(value, list):
+                value.clear()
+        for item in cow['nested']['b']:
+            if isinstance(item, dict):
+                item['c'] = 0
+        cow.pop('nested')['x'] = 1
+        self.assertEqual(self.payload, self.original, 'Original should not be modified')
+
+    def test_copy_on_write_unpacking(self):
+        cow = copy_on_write(self.payload)
+        unpacked = {**cow}
+        unpacked['nested']['b'].append(3)
+        dict(cow)['items'][0].append(2)
+        self.assertEqual(self.payload, self.original, 'Original should not be modified')
+
+    def test_copy_on_write_builtins(self):
+        cow = copy_on_write(self.payload)
+        ([[0]] + cow['items'])[1].append(3)
+        (cow['items'] + [])[0].append(3)
+        list(cow['items'])[0].append(3)
+        sorted(cow['items'])[0].append(3)
+        first, _ = cow['items']
+        first.append(3)
+        (cow | {})['nested']['x'] = 1
+        self.assertEqual(self.payload, self.original, 'Original should not be modified')
+
+        prefix = [[0]]
+        self.assertIs((prefix + cow['items'])[0], prefix[0], 'Items of the other list should not be copied')
+
+    def test_copy_on_write_assigned_identity(self):
+        cow = copy_on_write(self.payload)
+        value = {'d': 1}
+        cow['new'] = value
+        cow['items'].append(value)
+        self.assertIs(cow['new'], value)
+        self.assertIs(cow['items'][-1], value)
+
+    def test_copy_on_write_other_types(self):
+        class Custom():
+            def __init__(self):
+                self.values = [1]
+
+        obj = Custom()
+        cow = copy_on_write({'obj': obj, 't': (1, 2)})
+        cow['obj'].values.append(2)
+        self.assertEqual(obj.values, [1], 'Other mutable values should be deep copied')
+        self.assertEqual(cow['t'], (1, 2))
+
+    def test_copy_on_write_record(self):
+        record = Record(payload=self.payload, metadata={'tags': ['a']})
+        cow = record.copy_on_write()
+        cow.payload['nested']['b'].append(3)
+        cow.metadata['tags'].append('b')
+        self.assertIsNot(cow, record)
+        self.assertEqual(record.payload, self.original)
+        self.assertEqual(record.metadata, {'tags': ['a']})
+
+    def test_copy_on_write_deepcopy_and_pickle(self):
+        cow = copy_on_write(self.payload)
+        self.assertIs(type(copy.deepcopy(cow)), dict)
+        self.assertIs(type(copy.deepcopy(cow['items'])), list)
+        self.assertEqual(pickle.loads(pickle.dumps(cow)), self.original)
+
+    def test_copy_on_write_shallow_copy(self):
+        cow = copy_on_write(self.payload)
+        shallow = copy.copy(cow)
+        shallow['nested']['b'].append(4)
+        copy.copy(cow['items'])[0].append(5)
+        cow.copy()['nested']['x'] = 1
+        self.assertEqual(self.payload, self.original, 'Modifying a shallow copy should not modify the original')
+        self.assertEqual(cow, self.original)
+        self.assertEqual(shallow['nested']['b'], [1, 2, {'c': 3}, 4])
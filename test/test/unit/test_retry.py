@@ -0,0 +1,24 @@
+from unittest import TestCase
+
+from databay.support.retry import RetryPolicy
+from test_utils import DummyException
+
+
+class TestRetryPolicy(TestCase):
+
+    def test_invalid_max_attempts(self):
+        self.assertRaises(ValueError, RetryPolicy, max_attempts=0)
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_attempts=3, retry_on=DummyException)
+        self.assertTrue(policy.should_retry(DummyException(), 1))
+        self.assertTrue(policy.should_retry(DummyException(), 2))
+        self.assertFalse(policy.should_retry(DummyException(), 3), 'Should not exceed max attempts')
+        self.assertFalse(policy.should_retry(ValueError(), 1), 'Should not retry other exception types')
+
+    def test_delay(self):
+        policy = RetryPolicy(base=1, cap=5)
+        for attempt, bound in [(1, 1), (2, 2), (3, 4), (4, 5), (10, 5)]:
+            delays = [policy.delay(attempt) for _ in range(50)]
+            self.assertTrue(all(0 <= delay <= bound for delay in delays), f'Delays of attempt {attempt} should be below {bound}')
+        self.assertGreater(len(set(policy.delay(3) for _ in range(10))), 1, 'Delays should be randomised')
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import logging
 import ssl
 import sys
@@ -14,13 +15,13 @@ else:
     from asynctest import CoroutineMock, MagicMock
 
 from databay import Update
-from databay.inlets import HttpInlet
+from databay.inlets import HttpInlet, HttpSessionPool, OffsetPagination, CursorPagination, LinkHeaderPagination, StreamFormat
 from databay.misc import inlet_tester
 from test_utils import fqname
 
 logging.getLogger('databay.HttpInlet').setLevel(logging.WARNING)
 
-client = MagicMock()  # for ClientSession() as session
+client = MagicMock()  # for ClientSession()
 client_mock = CoroutineMock()  # for session.get() as response
 
 create_default_context_mock = MagicMock(spec=ssl.SSLContext)
@@ -28,12 +29,57 @@ create_default_context_mock = MagicMock(spec=ssl.SSLContext)
 _TEST_URL = 'https://jsonplaceholder.typicode.com/todos/1'
 
 
-def set_response(payload):
-    response = CoroutineMock(read=CoroutineMock(return_value=payload))
+def set_response(payload, status=200, headers=None):
+    response = CoroutineMock(read=CoroutineMock(return_value=payload), status=status, headers=headers if headers is not None else {})
     get_mock = MagicMock()
     get_mock.return_value.__aenter__.return_value = response
     client_mock.get = get_mock
-    client.return_value.__aenter__.return_value = client_mock
+    client_mock.close = CoroutineMock()
+    client_mock.detach = MagicMock()
+    client.return_value = client_mock
+
+
+def set_pages(handler):
+    """ Respond to each request with the payload and Link header returned by the handler for its URL and params. """
+    def get(url, params=None, **kwargs):
+        payload, links = handler(url, params)
+        response = CoroutineMock(read=CoroutineMock(return_value=json.dumps(payload).encode()), status=200, headers={}, links=links)
+        context = MagicMock()
+        context.__aenter__.return_value = response
+        return context
+
+    client_mock.get = MagicMock(side_effect=get)
+
+
+def set_versioned_pages(pages, links=None):
+    """ Respond to each request with the page stored for its URL and params, or with 304 if the page's version matches the If-None-Match header. """
+    def get(url, params=None, headers=None, **kwargs):
+        key = (url, json.dumps(params, sort_keys=True))
+        version, payload = pages[key]
+        page_links = (links or {}).get(key, {})
+        if headers is not None and headers.get('If-None-Match') == version:
+            response = CoroutineMock(read=CoroutineMock(return_value=b''), status=304, headers={'ETag': version}, links={})
+        else:
+            response = CoroutineMock(read=CoroutineMock(return_value=json.dumps(payload).encode()), status=200, headers={'ETag': version}, links=page_links)
+        context = MagicMock()
+        context.__aenter__.return_value = response
+        return context
+
+    client_mock.get = MagicMock(side_effect=get)
+
+
+def set_stream(body, chunk_sizes, headers=None, fail_after=None):
+    """ Respond with a body read in chunks, recording the chunk sizes requested. If fail_after is set, reading fails once that many chunks were read. """
+    async def iter_chunked(n):
+        chunk_sizes.append(n)
+        for count, i in enumerate(range(0, len(body), n)):
+            if count == fail_after:
+                raise aiohttp.ClientPayloadError('Connection lost')
+            yield body[i:i + n]
+
+    response = CoroutineMock(status=200, headers=headers if headers is not None else {}, content=MagicMock(iter_chunked=iter_chunked))
+    client_mock.get = MagicMock()
+    client_mock.get.return_value.__aenter__.return_value = response
 
 
 @patch('aiohttp.ClientSession', new=client)
@@ -88,11 +134,11 @@ class TestHttpInlet(inlet_tester.InletTester):
 
     def test_cacert_false(self):
         inlet = HttpInlet(_TEST_URL, cacert=False)
-        self.assertIsNone(inlet.tcp_connector)
+        self.assertIsNone(inlet.context)
 
     def test_cacert_none(self):
         inlet = HttpInlet(_TEST_URL, cacert=None)
-        self.assertIsNone(inlet.tcp_connector)
+        self.assertIsNone(inlet.context)
 
     @patch(fqname(Update))
     @patch('ssl.create_default_context', return_value=create_default_context_mock)
@@ -100,29 +146,299 @@ class TestHttpInlet(inlet_tester.InletTester):
         cacert = '/some/path/to/cacert.pem'
         inlet = HttpInlet(_TEST_URL, cacert=cacert)
         asyncio.run(inlet._pull(update))
-        self.assertIsNotNone(inlet.tcp_connector)
-        self.assertIsInstance(inlet.tcp_connector, aiohttp.TCPConnector)
+        self.assertIs(inlet.context, create_default_context_mock)
+        self.assertIs(client_mock.get.call_args[1]['ssl'], create_default_context_mock)
         create_default_context_mock.load_verify_locations.assert_called_with(cacert)
 
     @patch(fqname(Update))
     def test_params_none(self, update):
         inlet = HttpInlet(_TEST_URL, params=None)
         asyncio.run(inlet._pull(update))
-        client_mock.get.assert_called_with(_TEST_URL, params=None)
+        client_mock.get.assert_called_with(_TEST_URL, params=None, headers=None, ssl=True)
 
     @patch(fqname(Update))
     def test_params(self, update):
         params = {'foo': 'bar'}
         inlet = HttpInlet(_TEST_URL, params=params)
         asyncio.run(inlet._pull(update))
-        client_mock.get.assert_called_with(_TEST_URL, params=params)
+        client_mock.get.assert_called_with(_TEST_URL, params=params, headers=None, ssl=True)
 
     @patch(fqname(Update))
     def test_headers(self, update):
         headers = {'foo': 'bar'}
         inlet = HttpInlet(_TEST_URL, headers=headers)
         asyncio.run(inlet._pull(update))
-        client.assert_called_with(connector=None, headers=headers)
+        client_mock.get.assert_called_with(_TEST_URL, params=None, headers=headers, ssl=True)
 
+    @patch(fqname(Update))
+    def test_session_reused(self, update):
+        client.reset_mock()
+        client_mock.close.reset_mock()
+        pool = HttpSessionPool(limit_per_host=5, keepalive_timeout=30, ttl_dns_cache=60)
+
+        async def task():
+            inlets = [HttpInlet(_TEST_URL, session_pool=pool), HttpInlet(_TEST_URL, session_pool=pool)]
+            for inlet in inlets:
+                await inlet._pull(update)
+                await inlet._pull(update)
+            self.assertEqual(pool.sessions, 1)
+
+        def run_on_new_loop():
+            # shut down the way persistent event loops are
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(task())
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
+        run_on_new_loop()
+        self.assertEqual(client.call_count, 1, 'Session should be shared across pulls and inlets')
+        connector = client.call_args[1]['connector']
+        self.assertEqual(connector.limit_per_host, 5)
+        client_mock.close.assert_awaited_once()  # closed when the event loop shuts down
+        self.assertEqual(pool.sessions, 0)
+
+        run_on_new_loop()
+        self.assertEqual(client.call_count, 2, 'Each event loop should get its own session')
+
+    @patch(fqname(Update))
+    def test_session_closed_on_shutdown(self, update):
+        client_mock.close.reset_mock()
+        inlet = HttpInlet(_TEST_URL)
+        inlet.try_start()
+        pool = inlet.session_pool
+        self.assertIsInstance(pool, HttpSessionPool)
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(inlet._pull(update))
+            self.assertEqual(pool.sessions, 1)
+            inlet.try_shutdown()
+            self.assertEqual(pool.sessions, 0)
+            client_mock.close.assert_awaited_once()
+            self.assertIsNone(inlet.session_pool)
+        finally:
+            loop.close()
+
+    def test_shared_pool_not_closed(self):
+        pool = HttpSessionPool()
+        inlet = HttpInlet(_TEST_URL, session_pool=pool)
+        inlet.try_start()
+        inlet.try_shutdown()
+        self.assertIs(inlet.session_pool, pool, 'Shared pool should be left to its owner')
+
+
+
+
+    @patch(fqname(Update))
+    def test_conditional_requests(self, update):
+        inlet = HttpInlet(_TEST_URL, conditional_requests=True)
+        set_response(b'{"asdf":"12"}', headers={'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        self.assertEqual(len(asyncio.run(inlet._pull(update))), 1)
+        self.assertIsNone(client_mock.get.call_args[1]['headers'], 'First request should not be conditional')
+
+        set_response(b'', status=304)
+        self.assertEqual(asyncio.run(inlet._pull(update)), [], 'Not modified response should produce no records')
+        headers = client_mock.get.call_args[1]['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Wed, 21 Oct 2015 07:28:00 GMT')
+
+    @patch(fqname(Update))
+    def test_conditional_requests_per_params(self, update):
+        inlet = HttpInlet(_TEST_URL, params={'page': 1}, headers={'foo': 'bar'}, conditional_requests=True)
+        set_response(b'{"asdf":"12"}', headers={'ETag': '"v1"'})
+        asyncio.run(inlet._pull(update))
+
+        inlet.params = {'page': 2}
+        asyncio.run(inlet._pull(update))
+        self.assertEqual(client_mock.get.call_args[1]['headers'], {'foo': 'bar'}, 'Validators should be stored per params')
+
+        inlet.params = {'page': 1}
+        asyncio.run(inlet._pull(update))
+        headers = client_mock.get.call_args[1]['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['foo'], 'bar')
+
+    @patch(fqname(Update))
+    def test_conditional_requests_invalid_payload(self, update):
+        inlet = HttpInlet(_TEST_URL, conditional_requests=True, skip_unchanged=True)
+        set_response(b'{"asdf":', headers={'ETag': '"v1"'})
+        self.assertRaises(ValueError, asyncio.run, inlet._pull(update))
+
+        set_response(b'{"asdf":', headers={'ETag': '"v1"'})
+        self.assertRaises(ValueError, asyncio.run, inlet._pull(update))
+        self.assertIsNone(client_mock.get.call_args[1]['headers'], 'Validators of a payload that failed to decode should not be stored')
+
+    @patch(fqname(Update))
+    def test_conditional_requests_disabled(self, update):
+        set_response(b'{"asdf":"12"}', headers={'ETag': '"v1"'})
+        asyncio.run(self.inlet._pull(update))
+        asyncio.run(self.inlet._pull(update))
+        self.assertIsNone(client_mock.get.call_args[1]['headers'])
+
+    @patch(fqname(Update))
+    def test_skip_unchanged(self, update):
+        inlet = HttpInlet(_TEST_URL, skip_unchanged=True)
+        self.assertEqual(len(asyncio.run(inlet._pull(update))), 1)
+        with self.assertLogs(logging.getLogger('databay.HttpInlet'), level='INFO') as cm:
+            self.assertEqual(asyncio.run(inlet._pull(update)), [], 'Unchanged response should produce no records')
+            self.assertIn(f'unchanged {_TEST_URL}', ';'.join(cm.output))
+
+        set_response(b'{"asdf":"13"}')
+        self.assertEqual(len(asyncio.run(inlet._pull(update))), 1)
+
+    @patch(fqname(Update))
+    def test_offset_pagination(self, update):
+        set_pages(lambda url, params: ({'results': list(range(params['offset'], min(params['offset'] + params['limit'], 25)))}, {}))
+        inlet = HttpInlet(_TEST_URL, params={'foo': 'bar'}, pagination=OffsetPagination(page_size=10, items='results', concurrency=3))
+        records = asyncio.run(inlet._pull(update))
+        self.assertEqual([record.payload for record in records], list(range(25)), 'Pages should be produced in order')
+        self.assertEqual(client_mock.get.call_args_list[0][1]['params'], {'foo': 'bar', 'offset': 0, 'limit': 10})
+
+    @patch(fqname(Update))
+    def test_offset_pagination_concurrent(self, update):
+        in_flight = []
+        max_in_flight = [0]
+
+        def get(url, params=None, **kwargs):
+            async def read():
+                in_flight.append(params['page'])
+                max_in_flight[0] = max(max_in_flight[0], len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.remove(params['page'])
+                return json.dumps([params['page']] * 2 if params['page'] < 7 else []).encode()
+
+            context = MagicMock()
+            context.__aenter__.return_value = CoroutineMock(read=read, status=200, headers={})
+            return context
+
+        client_mock.get = MagicMock(side_effect=get)
+        pagination = OffsetPagination(param='page', page_size=2, size_param=None, start=1, step=1, concurrency=4)
+        records = asyncio.run(HttpInlet(_TEST_URL, pagination=pagination)._pull(update))
+        self.assertEqual([record.payload for record in records], [1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6])
+        self.assertEqual(max_in_flight[0], 4, 'Pages should be fetched concurrently up to the limit')
+
+    @patch(fqname(Update))
+    def test_offset_pagination_max_pages(self, update):
+        set_pages(lambda url, params: ([params['offset']] * params['limit'], {}))
+        inlet = HttpInlet(_TEST_URL, pagination=OffsetPagination(page_size=2, max_pages=3))
+        records = asyncio.run(inlet._pull(update))
+        self.assertEqual([record.payload for record in records], [0, 0, 2, 2, 4, 4])
 
+    @patch(fqname(Update))
+    def test_cursor_pagination(self, update):
+        pages = {None: {'data': [1, 2], 'meta': {'next': 'b'}},
+                 'b': {'data': [3], 'meta': {'next': 'c'}},
+                 'c': {'data': [4], 'meta': {'next': None}}}
+        set_pages(lambda url, params: (pages[(params or {}).get('after')], {}))
+        inlet = HttpInlet(_TEST_URL, pagination=CursorPagination(next_cursor='meta.next', cursor_param='after', items='data'))
+
+        async def task():
+            chunks = [chunk async for chunk in inlet._pull_chunks(update)]
+            return [[record.payload for record in chunk] for chunk in chunks]
+
+        self.assertEqual(asyncio.run(task()), [[1, 2], [3], [4]], 'Each page should be produced as a separate chunk')
+        self.assertIsNone(client_mock.get.call_args_list[0][1]['params'], 'First page should be requested without a cursor')
+
+    @patch(fqname(Update))
+    def test_link_header_pagination(self, update):
+        pages = {_TEST_URL: ([1], {'next': {'url': _TEST_URL + '?page=2'}}),
+                 _TEST_URL + '?page=2': ([2], {'next': {'url': _TEST_URL + '?page=3'}}),
+                 _TEST_URL + '?page=3': ([3], {})}
+        set_pages(lambda url, params: pages[url])
+        inlet = HttpInlet(_TEST_URL, params={'foo': 'bar'}, pagination=LinkHeaderPagination())
+        records = asyncio.run(inlet._pull(update))
+        self.assertEqual([record.payload for record in records], [1, 2, 3])
+        self.assertIsNone(client_mock.get.call_args_list[1][1]['params'], 'Next URL should carry its own params')
+
+    def _payloads(self, inlet, update):
+        return [record.payload for record in asyncio.run(inlet._pull(update))]
+
+    @patch(fqname(Update))
+    def test_cursor_pagination_not_modified(self, update):
+        def key(cursor):
+            return _TEST_URL, json.dumps({'cursor': cursor} if cursor else None)
+
+        pages = {key(None): ('"1"', {'data': [1], 'next': 'b'}),
+                 key('b'): ('"2"', {'data': [2], 'next': 'c'}),
+                 key('c'): ('"3"', {'data': [3], 'next': None})}
+        set_versioned_pages(pages)
+        inlet = HttpInlet(_TEST_URL, conditional_requests=True, pagination=CursorPagination(items='data'))
+        self.assertEqual(self._payloads(inlet, update), [1, 2, 3])
+
+        pages[key('b')] = ('"2b"', {'data': [20], 'next': 'c'})
+        self.assertEqual(self._payloads(inlet, update), [20], 'Pages following a not modified page should be fetched')
+        self.assertEqual(client_mock.get.call_count, 6)
+
+    @patch(fqname(Update))
+    def test_link_header_pagination_not_modified(self, update):
+        def key(page):
+            return _TEST_URL + (f'?page={page}' if page > 1 else ''), json.dumps(None)
+
+        pages = {key(1): ('"1"', [1]), key(2): ('"2"', [2])}
+        set_versioned_pages(pages, links={key(1): {'next': {'url': key(2)[0]}}})
+        inlet = HttpInlet(_TEST_URL, conditional_requests=True, pagination=LinkHeaderPagination())
+        self.assertEqual(self._payloads(inlet, update), [1, 2])
+
+        pages[key(2)] = ('"2b"', [20])
+        self.assertEqual(self._payloads(inlet, update), [20], 'Next link of a not modified page should be remembered')
+
+    @patch(fqname(Update))
+    def test_offset_pagination_unchanged(self, update):
+        def key(offset):
+            return _TEST_URL, json.dumps({'limit': 2, 'offset': offset}, sort_keys=True)
+
+        pages = {key(0): ('"1"', [1, 1]), key(2): ('"2"', [2, 2]), key(4): ('"3"', [3]), key(6): ('"4"', [])}
+        set_versioned_pages(pages)
+        inlet = HttpInlet(_TEST_URL, skip_unchanged=True, pagination=OffsetPagination(page_size=2, concurrency=1))
+        self.assertEqual(self._payloads(inlet, update), [1, 1, 2, 2, 3])
+
+        pages[key(2)] = ('"2b"', [20, 20])
+        self.assertEqual(self._payloads(inlet, update), [20, 20], 'Pages following an unchanged page should be fetched')
+        self.assertEqual(client_mock.get.call_count, 6, 'Unchanged last page should end the pagination')
+
+    @patch(fqname(Update))
+    def test_stream_ndjson(self, update):
+        chunk_sizes = []
+        set_stream(b'{"a": 1}\n{"a": 2}\n{"a": 3}\n', chunk_sizes)
+        inlet = HttpInlet(_TEST_URL, stream_format=StreamFormat.NDJSON, chunk_size=10)
+
+        async def task():
+            return [[record.payload for record in chunk] async for chunk in inlet._pull_chunks(update)]
+
+        self.assertEqual(asyncio.run(task()), [[{'a': 1}], [{'a': 2}], [{'a': 3}]], 'Records should be produced as the body is read')
+        self.assertEqual(chunk_sizes, [10])
+
+    @patch(fqname(Update))
+    def test_stream_json_array(self, update):
+        set_stream(json.dumps([{'a': i} for i in range(100)]).encode(), [])
+        inlet = HttpInlet(_TEST_URL, stream_format=StreamFormat.JSON_ARRAY, chunk_size=64)
+        records = asyncio.run(inlet._pull(update))
+        self.assertEqual([record.payload for record in records], [{'a': i} for i in range(100)])
+
+    @patch(fqname(Update))
+    def test_stream_not_modified(self, update):
+        set_stream(b'', [])
+        client_mock.get.return_value.__aenter__.return_value.status = 304
+        inlet = HttpInlet(_TEST_URL, stream_format=StreamFormat.NDJSON, conditional_requests=True)
+        self.assertEqual(asyncio.run(inlet._pull(update)), [])
+
+    @patch(fqname(Update))
+    def test_stream_failed_retried(self, update):
+        body = b'{"a": 1}\n{"a": 2}\n{"a": 3}\n'
+        inlet = HttpInlet(_TEST_URL, stream_format=StreamFormat.NDJSON, chunk_size=10, conditional_requests=True)
+        set_stream(body, [], headers={'ETag': '"v1"'}, fail_after=1)
+        self.assertRaises(aiohttp.ClientPayloadError, asyncio.run, inlet._pull(update))
+
+        set_stream(body, [], headers={'ETag': '"v1"'})
+        records = asyncio.run(inlet._pull(update))
+        self.assertIsNone(client_mock.get.call_args[1]['headers'], 'Validators of a failed stream should not be stored')
+        self.assertEqual([record.payload for record in records], [{'a': 1}, {'a': 2}, {'a': 3}])
+
+        asyncio.run(inlet._pull(update))
+        self.assertEqual(client_mock.get.call_args[1]['headers']['If-None-Match'], '"v1"', 'Validators of a complete stream should be stored')
 
+    def test_stream_invalid_options(self):
+        self.assertRaises(ValueError, HttpInlet, _TEST_URL, stream_format=StreamFormat.NDJSON, pagination=CursorPagination())
+        self.assertRaises(ValueError, HttpInlet, _TEST_URL, stream_format=StreamFormat.NDJSON, skip_unchanged=True)
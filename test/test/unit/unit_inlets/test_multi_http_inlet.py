@@ -0,0 +1,122 @@
+import asyncio
+import json
+import logging
+import time
+from unittest import TestCase
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from databay import Update
+from databay.inlets import MultiHttpInlet, HttpRequest, HttpSessionPool
+from test_utils import DummyException
+
+client = MagicMock()  # for ClientSession()
+client_mock = AsyncMock()  # for session.get() as response
+
+
+class TestMultiHttpInlet(TestCase):
+
+    def setUp(self):
+        self.update = Update(tags=['multi'], transfer_number=0)
+        self.requested = []
+        self.in_flight = {}
+        self.max_in_flight = {}
+        self.failing = set()
+        client_mock.get = MagicMock(side_effect=self._get)
+        client_mock.close = AsyncMock()
+        client.return_value = client_mock
+
+    def _get(self, url, params=None, headers=None, **kwargs):
+        host = url.split('/')[2]
+
+        async def read():
+            self.requested.append((url, params, headers, time.monotonic()))
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.max_in_flight[host] = max(self.max_in_flight.get(host, 0), self.in_flight[host])
+            await asyncio.sleep(0.01)
+            self.in_flight[host] -= 1
+            if url in self.failing:
+                raise DummyException(f'Failed {url}')
+            return json.dumps([{'url': url}]).encode()
+
+        context = MagicMock()
+        context.__aenter__.return_value = AsyncMock(read=read, status=200, headers={})
+        return context
+
+    def _pull(self, inlet):
+        with patch('aiohttp.ClientSession', new=client):
+            return asyncio.run(inlet._pull(self.update))
+
+    def test_sources(self):
+        inlet = MultiHttpInlet(['https://a.com/1', HttpRequest('https://b.com/1', params={'x': 1}, source='b')])
+        records = self._pull(inlet)
+        self.assertCountEqual([(record.payload['url'], record.metadata['__source__']) for record in records],
+                              [('https://a.com/1', 'https://a.com/1'), ('https://b.com/1', 'b')])
+        self.assertIn(('https://b.com/1', {'x': 1}), [(url, params) for url, params, _, _ in self.requested])
+
+    def test_params_and_headers(self):
+        inlet = MultiHttpInlet([HttpRequest('https://a.com/1', params={'x': 1}, headers={'b': '2'})], params={'y': 2}, headers={'a': '1'})
+        self._pull(inlet)
+        _, params, headers, _ = self.requested[0]
+        self.assertEqual(params, {'y': 2, 'x': 1})
+        self.assertEqual(dict(headers), {'a': '1', 'b': '2'})
+
+    def test_limit_per_host(self):
+        requests = [f'https://a.com/{i}' for i in range(6)] + [f'https://b.com/{i}' for i in range(6)]
+        inlet = MultiHttpInlet(requests, limit_per_host=2)
+        self.assertEqual(len(self._pull(inlet)), 12)
+        self.assertEqual(self.max_in_flight, {'a.com': 2, 'b.com': 2})
+
+    def test_limit_per_host_concurrent_pulls(self):
+        inlet = MultiHttpInlet([f'https://a.com/{i}' for i in range(4)], limit_per_host=2)
+
+        async def task():
+            return await asyncio.gather(inlet._pull(self.update), inlet._pull(self.update))
+
+        with patch('aiohttp.ClientSession', new=client):
+            results = asyncio.run(task())
+        self.assertEqual([len(records) for records in results], [4, 4])
+        self.assertEqual(self.max_in_flight, {'a.com': 2}, 'Concurrent pulls should share the host limits')
+
+    def test_limit_per_host_session_pool(self):
+        inlet = MultiHttpInlet(['https://a.com/1'], limit_per_host=3)
+        self.assertEqual(inlet._get_session_pool().limit_per_host, 3, 'Pool created by the inlet should limit connections per host')
+
+        pool = HttpSessionPool()
+        inlet = MultiHttpInlet(['https://a.com/1'], limit_per_host=3, session_pool=pool)
+        self.assertEqual(inlet._get_session_pool().limit_per_host, 0, 'Provided pool should be left as is')
+
+    def test_concurrency(self):
+        inlet = MultiHttpInlet([f'https://{host}.com/1' for host in 'abcdef'], concurrency=3)
+        self._pull(inlet)
+        starts = sorted(t for _, _, _, t in self.requested)
+        self.assertGreaterEqual(starts[3] - starts[0], 0.009, 'No more than 3 requests should be sent at once')
+
+    def test_rate_per_host(self):
+        inlet = MultiHttpInlet([f'https://a.com/{i}' for i in range(4)] + ['https://b.com/1'], rate_per_host=50)
+        self._pull(inlet)
+        starts = sorted(t for url, _, _, t in self.requested if 'a.com' in url)
+        self.assertGreaterEqual(starts[-1] - starts[0], 0.05, 'Requests to the same host should be rate limited')
+        b_start = [t for url, _, _, t in self.requested if 'b.com' in url][0]
+        self.assertLess(b_start, starts[-1], 'Other hosts should not wait for the rate limit of busy hosts')
+
+    def test_streamed(self):
+        inlet = MultiHttpInlet(['https://a.com/1', 'https://b.com/1'])
+
+        async def task():
+            return [chunk async for chunk in inlet._pull_chunks(self.update)]
+
+        with patch('aiohttp.ClientSession', new=client):
+            chunks = asyncio.run(task())
+        self.assertEqual(len(chunks), 2, 'Each response should be produced as a separate chunk')
+
+    def test_request_error(self):
+        self.failing.add('https://a.com/2')
+        inlet = MultiHttpInlet(['https://a.com/1', 'https://a.com/2'])
+        self.assertRaises(DummyException, self._pull, inlet)
+
+    def test_ignore_request_errors(self):
+        self.failing.add('https://a.com/2')
+        inlet = MultiHttpInlet(['https://a.com/1', 'https://a.com/2'], ignore_request_errors=True)
+        with self.assertLogs(logging.getLogger('databay.MultiHttpInlet'), level='WARNING'):
+            records = self._pull(inlet)
+        self.assertEqual([record.metadata['__source__'] for record in records], ['https://a.com/1'])
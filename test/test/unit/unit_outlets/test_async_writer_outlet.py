@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import threading
+import time
+from unittest import TestCase
+
+from databay import Outlet, Record, Update
+from databay.outlets import AsyncWriterOutlet, OverflowPolicy
+from test_utils import DummyException
+
+
+class CollectingOutlet(Outlet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pushed = []
+        self.fail = False
+        self.block = None
+        self.started = 0
+        self.shutdown = 0
+
+    def push(self, records, update):
+        if self.block is not None:
+            self.block.wait(2)
+        if self.fail:
+            raise DummyException('Push failed')
+        self.pushed.append([record.payload for record in records])
+
+    def on_start(self):
+        self.started += 1
+
+    def on_shutdown(self):
+        self.shutdown += 1
+
+
+class TestAsyncWriterOutlet(TestCase):
+
+    def setUp(self):
+        self.target = CollectingOutlet()
+        self.outlet = AsyncWriterOutlet(self.target)
+
+    def tearDown(self):
+        if self.target.block is not None:
+            self.target.block.set()
+        self.outlet.try_shutdown()
+
+    def _push(self, outlet, *payloads):
+        async def task():
+            for p in payloads:
+                await outlet._push([Record(payload=p)], Update(['writer'], p))
+        asyncio.run(task())
+
+    def _wait_for(self, condition):
+        for _ in range(200):
+            if condition():
+                return
+            time.sleep(0.005)
+
+    def test_push_and_write(self):
+        self.outlet.try_start()
+        self.assertEqual(self.target.started, 1, 'Wrapped outlet should be started')
+        self._push(self.outlet, 1, 2, 3)
+        self.assertTrue(self.outlet.flush(1))
+        self.assertEqual([p for batch in self.target.pushed for p in batch], [1, 2, 3])
+
+        self.outlet.try_shutdown()
+        self.assertEqual(self.target.shutdown, 1, 'Wrapped outlet should be shut down')
+
+    def test_push_does_not_wait(self):
+        self.target.block = threading.Event()
+        self.outlet.try_start()
+        start = time.monotonic()
+        self._push(self.outlet, 1)
+        self.assertLess(time.monotonic() - start, 1, 'Push should not wait for the wrapped outlet')
+        self.assertEqual(self.target.pushed, [])
+        self.target.block.set()
+        self.assertTrue(self.outlet.flush(1))
+        self.assertEqual(self.target.pushed, [[1]])
+
+    def test_batching(self):
+        self.target.block = threading.Event()
+        self.outlet.max_batch_size = 2
+        self.outlet.try_start()
+        self._push(self.outlet, 1)
+        self._wait_for(lambda: self.outlet.queued == 0)
+        self._push(self.outlet, 2, 3, 4)
+        self.target.block.set()
+        self.assertTrue(self.outlet.flush(1))
+        self.assertEqual(self.target.pushed, [[1], [2, 3], [4]], 'Queued batches should be joined up to max_batch_size')
+
+    def test_linger(self):
+        self.outlet.linger = 0.2
+        self.outlet.try_start()
+        self._push(self.outlet, 1, 2)
+        self.assertTrue(self.outlet.flush(1))
+        self.assertEqual(self.target.pushed, [[1, 2]], 'Batches arriving during linger should be joined')
+
+    def test_flush_linger(self):
+        self.outlet.linger = 10
+        self.outlet.try_start()
+        self._push(self.outlet, 1, 2)
+        start = time.monotonic()
+        self.assertTrue(self.outlet.flush(1), 'Flush should not wait for the linger to pass')
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self.target.pushed, [[1, 2]])
+
+    def test_drop_newest(self):
+        self.target.block = threading.Event()
+        self.outlet.max_queue = 1
+        self.outlet.overflow_policy = OverflowPolicy.DROP_NEWEST
+        self.outlet.try_start()
+        self._push(self.outlet, 1)
+        self._wait_for(lambda: self.outlet.queued == 0)
+        with self.assertLogs(logging.getLogger('databay.AsyncWriterOutlet'), level='WARNING'):
+            self._push(self.outlet, 2, 3)
+        self.target.block.set()
+        self.assertTrue(self.outlet.flush(1))
+        self.assertEqual(self.target.pushed, [[1], [2]])
+        self.assertEqual(self.outlet.dropped_batches, 1)
+
+    def test_drop_oldest(self):
+        self.target.block = threading.Event()
+        self.outlet.max_queue = 1
+        self.outlet.overflow_policy = OverflowPolicy.DROP_OLDEST
+        self.outlet.try_start()
+        self._push(self.outlet, 1)
+        self._wait_for(lambda: self.outlet.queued == 0)
+        with self.assertLogs(logging.getLogger('databay.AsyncWriterOutlet'), level='WARNING'):
+            self._push(self.outlet, 2, 3)
+        self.target.block.set()
+        self.assertTrue(self.outlet.flush(1))
+        self.assertEqual(self.target.pushed, [[1], [3]])
+        self.assertEqual(self.outlet.dropped_batches, 1)
+
+    def test_block(self):
+        self.target.block = threading.Event()
+        self.outlet.max_queue = 1
+        self.outlet.try_start()
+        self._push(self.outlet, 1)
+        self._wait_for(lambda: self.outlet.queued == 0)
+        self._push(self.outlet, 2)
+
+        done = threading.Event()
+        thread = threading.Thread(target=lambda: (self._push(self.outlet, 3), done.set()), daemon=True)
+        thread.start()
+        self.assertFalse(done.wait(0.1), 'Push should wait for space in the queue')
+        self.target.block.set()
+        self.assertTrue(done.wait(1))
+        self.assertTrue(self.outlet.flush(1))
+        self.assertEqual([p for batch in self.target.pushed for p in batch], [1, 2, 3])
+        self.assertEqual(self.outlet.dropped_batches, 0)
+
+    def test_failed_push(self):
+        self.target.fail = True
+        self.outlet.try_start()
+        with self.assertLogs(logging.getLogger('databay.AsyncWriterOutlet'), level='ERROR'):
+            self._push(self.outlet, 1)
+            self.assertTrue(self.outlet.flush(1))
+        self.assertEqual(self.outlet.failed_batches, 1)
+        self.assertEqual(self.outlet.written_batches, 0)
+
+    def test_shutdown_drains(self):
+        self.target.block = threading.Event()
+        self.outlet.try_start()
+        self._push(self.outlet, 1, 2)
+        threading.Timer(0.05, self.target.block.set).start()
+        self.outlet.try_shutdown()
+        self.assertEqual([p for batch in self.target.pushed for p in batch], [1, 2], 'Queued batches should be written on shutdown')
+
+    def test_failed_push_joined(self):
+        self.target.fail = True
+        outlet = AsyncWriterOutlet(self.target, linger=0.05)
+        outlet.try_start()
+        with self.assertLogs(logging.getLogger('databay.AsyncWriterOutlet'), level='ERROR') as cm:
+            self._push(outlet, 1, 2)
+            self.assertTrue(outlet.flush(1))
+        outlet.try_shutdown()
+        self.assertEqual(outlet.failed_batches, 2)
+        self.assertIn(f'during: {Update(["writer"], 1)}, {Update(["writer"], 2)}', ';'.join(cm.output), 'All updates of the joined batches should be logged')
+
+    def test_shutdown_hung_push(self):
+        self.target.block = threading.Event()
+        outlet = AsyncWriterOutlet(self.target, shutdown_timeout=0.1)
+        outlet.try_start()
+        self._push(outlet, 1)
+        self._wait_for(lambda: outlet.queued == 0)
+        self._push(outlet, 2)
+
+        start = time.monotonic()
+        with self.assertLogs(logging.getLogger('databay.AsyncWriterOutlet'), level='WARNING') as cm:
+            outlet.try_shutdown()
+        self.assertLess(time.monotonic() - start, 1, 'Hung push should not hold up the shutdown past its timeout')
+        self.assertIn('2 batch(es) left unwritten', ';'.join(cm.output), 'Batch being pushed should be counted as unwritten')
+        self.assertEqual(self.target.shutdown, 1)
+
+        outlet.try_start()
+        self.target.block.set()
+        self._push(outlet, 3)
+        self.assertTrue(outlet.flush(1))
+        outlet.try_shutdown()
+        self._wait_for(lambda: len(self.target.pushed) == 2)
+        self.assertCountEqual(self.target.pushed, [[1], [3]], 'Abandoned writer should finish its push and stop')
@@ -0,0 +1,255 @@
+import asyncio
+import errno
+import logging
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase, mock
+
+from databay import Outlet, Record, Update
+from databay.outlets import WalOutlet
+from databay.support import segments
+from databay.support.dead_letter import DeadLetterQueue
+from databay.support.retry import RetryPolicy
+from test_utils import DummyException
+
+
+class CollectingOutlet(Outlet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pushed = []
+        self.failures = 0
+        self.block = None
+        self.started = 0
+        self.shutdown = 0
+
+    def push(self, records, update):
+        if self.block is not None:
+            self.block.wait(2)
+        if self.failures > 0:
+            self.failures -= 1
+            raise DummyException('Delivery failed')
+        self.pushed.append(([record.payload for record in records], str(update)))
+
+    def on_start(self):
+        self.started += 1
+
+    def on_shutdown(self):
+        self.shutdown += 1
+
+
+class FailingFile():
+    """ Segment file writing half of the first entry before running out of space."""
+
+    def __init__(self, f):
+        self._f = f
+        self._failed = False
+
+    def write(self, data):
+        if not self._failed:
+            self._failed = True
+            self._f.write(data[:len(data) // 2])
+            self._f.flush()
+            raise OSError(errno.ENOSPC, 'No space left on device')
+        return self._f.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+class TestWalOutlet(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+        self.target = CollectingOutlet()
+        self.outlet = WalOutlet(self.target, self.directory, fsync=False, retry_interval=0.01)
+
+    def tearDown(self):
+        self.outlet.try_shutdown()
+        self.tmpdir.cleanup()
+
+    def _push(self, outlet, *payloads, transfer_number=0):
+        async def task():
+            await asyncio.gather(*[outlet._push([Record(payload=p)], Update(['wal'], transfer_number)) for p in payloads])
+        asyncio.run(task())
+
+    def _wait_for(self, condition):
+        for _ in range(200):
+            if condition():
+                return
+            time.sleep(0.005)
+
+    def test_push_and_deliver(self):
+        self.outlet.try_start()
+        self.assertEqual(self.target.started, 1, 'Wrapped outlet should be started')
+        self._push(self.outlet, 1, 2, 3)
+        self._wait_for(lambda: len(self.target.pushed) == 3)
+        self.assertCountEqual(self.target.pushed, [([1], 'wal.0'), ([2], 'wal.0'), ([3], 'wal.0')])
+        self.assertEqual(self.outlet.pending, 0)
+
+        self.outlet.try_shutdown()
+        self.assertEqual(self.target.shutdown, 1, 'Wrapped outlet should be shut down')
+        self.assertEqual(segments.segment_indices(self.directory, 'wal'), [], 'Delivered segments should be removed')
+
+    def test_order(self):
+        self.outlet.try_start()
+        for i in range(5):
+            self._push(self.outlet, i, transfer_number=i)
+        self._wait_for(lambda: len(self.target.pushed) == 5)
+        self.assertEqual([payloads[0] for payloads, _ in self.target.pushed], [0, 1, 2, 3, 4])
+
+    def test_push_acknowledged_before_delivery(self):
+        self.target.block = threading.Event()
+        self.outlet.try_start()
+        start = time.monotonic()
+        self._push(self.outlet, 1)
+        self.assertLess(time.monotonic() - start, 1, 'Push should not wait for the wrapped outlet')
+        self.assertEqual(self.target.pushed, [])
+        self.target.block.set()
+        self._wait_for(lambda: len(self.target.pushed) == 1)
+        self.assertEqual(len(self.target.pushed), 1)
+
+    def test_retry(self):
+        self.target.failures = 2
+        self.outlet.try_start()
+        with self.assertLogs(logging.getLogger('databay.WalOutlet'), level='WARNING'):
+            self._push(self.outlet, 1)
+            self._wait_for(lambda: len(self.target.pushed) == 1)
+        self.assertEqual(self.target.pushed, [([1], 'wal.0')], 'Failed delivery should be retried')
+
+    def test_delivery_retry_policy(self):
+        dead_letter_dir = tempfile.TemporaryDirectory()
+        queue = DeadLetterQueue(dead_letter_dir.name)
+        self.outlet.delivery_retry_policy = RetryPolicy(max_attempts=2, base=0.001, cap=0.001)
+        self.outlet.dead_letter_queue = queue
+        self.target.failures = 2
+        self.outlet.try_start()
+        with self.assertLogs(logging.getLogger('databay.WalOutlet'), level='WARNING') as cm:
+            for i in range(2):
+                self._push(self.outlet, i, transfer_number=i)
+            self._wait_for(lambda: len(self.target.pushed) == 1)
+        try:
+            self.assertIn('gave up delivering batch of wal.0', ';'.join(cm.output))
+            self.assertEqual(self.target.pushed, [([1], 'wal.1')], 'Failed batch should not hold up the following batches')
+            self.assertEqual(self.outlet.failed_batches, 1)
+            self.assertEqual(self.outlet.pending, 0)
+            dead_letters = list(queue)
+            self.assertEqual(len(dead_letters), 1)
+            self.assertEqual(dead_letters[0].outlet_key, 'CollectingOutlet')
+            self.assertEqual([record.payload for record in dead_letters[0].records], [0])
+        finally:
+            queue.close()
+            dead_letter_dir.cleanup()
+
+    def test_delivery_retry_policy_drop(self):
+        self.outlet.delivery_retry_policy = RetryPolicy(max_attempts=1, retry_on=ValueError)
+        self.target.failures = 1
+        self.outlet.try_start()
+        with self.assertLogs(logging.getLogger('databay.WalOutlet'), level='ERROR') as cm:
+            self._push(self.outlet, 0)
+            self._push(self.outlet, 1, transfer_number=1)
+            self._wait_for(lambda: len(self.target.pushed) == 1)
+        self.assertIn('dropping 1 record(s)', ';'.join(cm.output))
+        self.assertEqual(self.target.pushed, [([1], 'wal.1')])
+        self.assertEqual(self.outlet.failed_batches, 1)
+
+    def test_segment_rollover(self):
+        self.outlet.segment_size = 1
+        self.outlet.try_start()
+        for i in range(3):
+            self._push(self.outlet, i)
+        self._wait_for(lambda: len(self.target.pushed) == 3)
+        self._wait_for(lambda: len(segments.segment_indices(self.directory, 'wal')) == 1)
+        self.assertEqual(len(segments.segment_indices(self.directory, 'wal')), 1, 'Delivered segments should be removed')
+
+    def test_replay_on_start(self):
+        self.target.failures = 1000
+        self.outlet.shutdown_timeout = 0.05
+        self.outlet.try_start()
+        with self.assertLogs(logging.getLogger('databay.WalOutlet'), level='WARNING'):
+            self._push(self.outlet, 1, 2)
+            self.outlet.try_shutdown()
+        self.assertEqual(self.target.pushed, [])
+
+        target = CollectingOutlet()
+        outlet = WalOutlet(target, self.directory, fsync=False)
+        outlet.try_start()
+        self._wait_for(lambda: len(target.pushed) == 2)
+        outlet.try_shutdown()
+        self.assertCountEqual(target.pushed, [([1], 'wal.0'), ([2], 'wal.0')], 'Undelivered batches should be delivered on start')
+
+    def test_replay_after_crash(self):
+        # simulate a crash, leaving a segment with a torn entry at its end
+        os.makedirs(self.directory, exist_ok=True)
+        with segments.open_segment(segments.segment_path(self.directory, 0, 'wal')) as f:
+            for i in range(2):
+                f.write(segments.encode_entry({'tags': ['wal'], 'transfer_number': i, 'records': [Record(payload=i)]}))
+            f.write(segments.encode_entry({'tags': ['wal'], 'transfer_number': 2, 'records': []})[:-2])
+
+        with self.assertLogs(logging.getLogger('databay.WalOutlet'), level='WARNING'):
+            self.outlet.try_start()
+            self._wait_for(lambda: len(self.target.pushed) == 2)
+            self.outlet.try_shutdown()
+        self.assertEqual(self.target.pushed, [([0], 'wal.0'), ([1], 'wal.1')])
+        self.assertEqual(segments.segment_indices(self.directory, 'wal'), [])
+
+    def test_checkpoint(self):
+        self.outlet.shutdown_timeout = 0.05
+        self.outlet.try_start()
+        self._push(self.outlet, 1)
+        self._wait_for(lambda: len(self.target.pushed) == 1)
+        self.target.failures = 1000
+        with self.assertLogs(logging.getLogger('databay.WalOutlet'), level='WARNING'):
+            self._push(self.outlet, 2)
+            self.outlet.try_shutdown()
+
+        target = CollectingOutlet()
+        outlet = WalOutlet(target, self.directory, fsync=False)
+        outlet.try_start()
+        self._wait_for(lambda: len(target.pushed) == 1)
+        outlet.try_shutdown()
+        self.assertEqual(target.pushed, [([2], 'wal.0')], 'Delivered batches should not be delivered again')
+
+    def test_shutdown_hung_delivery(self):
+        self.target.block = threading.Event()
+        self.outlet.shutdown_timeout = 0.1
+        self.outlet.try_start()
+        self._push(self.outlet, 1)
+
+        start = time.monotonic()
+        with self.assertLogs(logging.getLogger('databay.WalOutlet'), level='WARNING') as cm:
+            self.outlet.try_shutdown()
+        self.assertLess(time.monotonic() - start, 1, 'Hung delivery should not hold up the shutdown past its timeout')
+        self.assertIn('abandoning the delivery', ';'.join(cm.output))
+        self.assertIn('1 batch(es) left to deliver', ';'.join(cm.output))
+        self.assertEqual(self.target.shutdown, 1)
+
+        self.target.block.set()
+        self._wait_for(lambda: len(self.target.pushed) == 1)
+        target = CollectingOutlet()
+        outlet = WalOutlet(target, self.directory, fsync=False)
+        outlet.try_start()
+        self._wait_for(lambda: len(target.pushed) == 1)
+        outlet.try_shutdown()
+        self.assertEqual(target.pushed, [([1], 'wal.0')], 'Abandoned batch should be delivered again on the next start')
+
+    def _push_after_write_error(self):
+        self.outlet.try_start()
+        self.outlet._write_file = FailingFile(self.outlet._write_file)
+        with self.assertLogs(logging.getLogger('databay.WalOutlet'), level='ERROR'):
+            self.assertRaises(OSError, self._push, self.outlet, 1)
+        for i in range(2, 4):
+            self._push(self.outlet, i, transfer_number=i)
+        self._wait_for(lambda: len(self.target.pushed) == 2)
+        self.outlet.try_shutdown()
+        self.assertEqual(self.target.pushed, [([2], 'wal.2'), ([3], 'wal.3')], 'Batches acknowledged after a failed write should be delivered')
+        self.assertEqual(segments.segment_indices(self.directory, 'wal'), [])
+
+    def test_write_error(self):
+        self._push_after_write_error()
+
+    def test_write_error_truncate_failed(self):
+        with mock.patch('os.truncate', side_effect=OSError(errno.EIO, 'I/O error')):
+            self._push_after_write_error()